@@ -0,0 +1,72 @@
+"""Benchmark of the import time of the integration and the BLE parser.
+
+Runs python -X importtime in a fresh interpreter for every module and reports
+the total import time and the slowest modules that are imported. With --max
+the benchmark fails when the total import time of a module is higher than the
+given number of milliseconds, so import time regressions are visible.
+
+Usage: python benchmarks/bench_import.py [--max ms] [--top n] [module ...]
+(run from the repository root)
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+PATH = os.path.join(os.path.dirname(__file__), "..", "custom_components")
+# ble_parser is imported on its own, without the integration and Home Assistant
+PYTHONPATH = os.pathsep.join([PATH, os.path.join(PATH, "ble_monitor")])
+MODULES = ["ble_parser", "ble_monitor"]
+ROUNDS = 5
+
+
+def import_times(module):
+    """Return the cumulative import time in microseconds per imported module."""
+    code = f"import {module}" if module else "pass"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": PYTHONPATH},
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max", type=float, help="maximum import time in ms")
+    parser.add_argument("--top", type=int, default=5, help="number of slowest modules to show")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    # modules that are imported at the start of the interpreter
+    startup = import_times(None)
+    failed = False
+    for module in args.modules:
+        # the best of a few rounds, to reduce the noise of a cold start
+        times = min((import_times(module) for _ in range(ROUNDS)), key=lambda t: t[module])
+        total = times[module] / 1000
+        print(f"{module}: {total:.1f} ms")
+        slowest = sorted(
+            (name for name in times if name != module and name not in startup),
+            key=times.get,
+            reverse=True,
+        )
+        for name in slowest[:args.top]:
+            print(f"    {name:50} {times[name] / 1000:8.1f} ms")
+        if args.max is not None and total > args.max:
+            failed = True
+    if failed:
+        sys.exit(f"Import time is higher than {args.max} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark of the cost of the debug statements of the BLE parser.
+
+Parses advertisements that pass through debug statements (devices that are
+not whitelisted, frames that are not supported) and advertisements that are
+parsed without any debug statement. Every set is parsed with the log level at
+WARNING (debug off, like in a normal installation) and with logging disabled
+completely, the difference is the cost of the debug statements when they are
+not emitted.
+
+Usage: python benchmarks/bench_logging.py [number of advertisements]
+(run from the repository root)
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "ble_monitor"))
+
+from ble_parser import BleParser  # noqa: E402
+
+XIAOMI = "043e2502010000219335342d5819020106151695fe5020aa01da219335342d580d1004fe004802c4"
+ATC = "043e1d02010000f4830238c1a41110161a18a4c1380283f400a22f5f0bf819df"
+MESH = "043e2502010000219335342d5819020106151695fed020aa01da219335342d580d1004fe004802c4"
+
+# (name, packet, keyword arguments of the parser)
+CASES = (
+    ("parsed", [XIAOMI, ATC], {"filter_duplicates": False}),
+    ("not whitelisted", [XIAOMI, ATC], {"discovery": False, "filter_duplicates": False}),
+    ("unsupported frame", [MESH], {}),
+)
+
+
+def parse_time(ble_parser, packets, count, repeat=5):
+    """Return the best parse time per advertisement of a number of runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            for data in packets:
+                ble_parser.parse_raw_data(data)
+        elapsed = (time.perf_counter() - start) / (count * len(packets))
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    logging.basicConfig(level=logging.WARNING)
+    for name, packets, kwargs in CASES:
+        packets = [bytes.fromhex(packet) for packet in packets]
+        ble_parser = BleParser(**kwargs)
+        parse_time(ble_parser, packets, 100, repeat=1)
+        debug_off = parse_time(ble_parser, packets, count)
+        logging.disable(logging.CRITICAL)
+        disabled = parse_time(ble_parser, packets, count)
+        logging.disable(logging.NOTSET)
+        print(
+            f"{name:18}: debug off {debug_off * 1e6:.2f} us, logging disabled {disabled * 1e6:.2f} us, "
+            f"overhead {(debug_off - disabled) * 1e6:+.2f} us per advertisement"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark of the parse_data and parse_data_bulk services.
+
+Compares the time spent in the Home Assistant event loop per packet when every
+packet is sent with a parse_data service call, with the time spent when the
+packets are sent in batches with the parse_data_bulk service. The service
+calls are simulated by validating the service data with the service schema,
+followed by the work the service handler does in the event loop.
+
+Usage: python benchmarks/bench_parse_data_bulk.py [number of packets] [batch size]
+(run from the repository root)
+"""
+import logging
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+import janus  # noqa: E402
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from ble_monitor import (  # noqa: E402
+        SERVICE_PARSE_DATA_BULK_SCHEMA,
+        SERVICE_PARSE_DATA_SCHEMA,
+        HCIdump,
+    )
+
+CONFIG = {
+    "hci_interface": [0],
+    "active_scan": False,
+    "report_unknown": False,
+    "discovery": True,
+    "devices": [],
+    "vendors": None,
+}
+
+
+class FakeLoop:
+    """Event loop of the HCIdump thread, that runs the callbacks in a list."""
+    def __init__(self):
+        self.callbacks = []
+
+    def call_soon_threadsafe(self, callback, *args):
+        self.callbacks.append((callback, args))
+
+    def run(self):
+        for callback, args in self.callbacks:
+            callback(*args)
+        self.callbacks.clear()
+
+
+def create_packets(count):
+    """Create ATC advertisements of different MAC addresses, so they are not filtered."""
+    packets = []
+    for index in range(count):
+        mac = index.to_bytes(3, "big").hex() + "38c1a4"
+        packets.append(
+            f"043e1d02010000{mac}1110161a18{mac[::-1]}00e8296d0b7fe9c2"
+        )
+    return packets
+
+
+def main():
+    """Run the benchmark."""
+    logging.disable(logging.CRITICAL)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    packets = create_packets(count)
+
+    queues = {"binary": janus.Queue(), "measuring": janus.Queue(), "tracker": janus.Queue()}
+    hcidump = HCIdump(CONFIG, queues)
+    start = time.perf_counter()
+    for packet in packets:
+        data = SERVICE_PARSE_DATA_SCHEMA({"packet": packet})
+        hcidump.process_hci_events(bytes.fromhex(data["packet"]), "ble_monitor")
+    single = (time.perf_counter() - start) / count
+
+    hcidump = HCIdump(CONFIG, queues)
+    hcidump._event_loop = FakeLoop()  # pylint: disable=protected-access
+    start = time.perf_counter()
+    for index in range(0, count, batch):
+        data = SERVICE_PARSE_DATA_BULK_SCHEMA({"packets": packets[index:index + batch]})
+        hcidump.submit_bulk(data["packets"], data["encoding"], data["gateway_id"])
+    bulk = (time.perf_counter() - start) / count
+    start = time.perf_counter()
+    hcidump._event_loop.run()  # pylint: disable=protected-access
+    thread = (time.perf_counter() - start) / count
+
+    print(f"parse_data:      {single * 1e6:7.2f} us/packet in the HA event loop")
+    print(f"parse_data_bulk: {bulk * 1e6:7.2f} us/packet in the HA event loop (batches of {batch})")
+    print(f"parse_data_bulk: {thread * 1e6:7.2f} us/packet in the HCIdump thread")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Allocation benchmark of the Reading records of the BLE parser.
+
+Reports the memory and the number of memory blocks that are allocated per
+advertisement for the record that is returned by the parser: a Reading, and
+the same data as a plain dict (as returned before). The records are kept in a
+list, like in the queues of the updaters. The parse time and the allocations
+of the whole parser are reported as well.
+
+Usage: python benchmarks/bench_reading.py [number of advertisements]
+(run from the repository root)
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "ble_monitor"))
+
+from ble_parser import BleParser  # noqa: E402
+from ble_parser.reading import Reading  # noqa: E402
+
+PACKETS = {
+    "Xiaomi LYWSDCGQ": "043e2502010000219335342d5819020106151695fe5020aa01da219335342d580d1004fe004802c4",
+    "HA BLE": "043E1902010000A5808FE648540D02010609161C18020009020161CC",
+    "iBeacon": (
+        "043E2A02010001433EA2C96B6A1E02011A1AFF4C000215E2C56DB5DFFB48D2B060D0F5A71096E000640000C5B3"
+    ),
+}
+
+
+def allocations(create, count):
+    """Return the allocated bytes and blocks per object that is created and kept."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [create() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del kept
+    return size / count, blocks / count
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for name, packet in PACKETS.items():
+        data = bytes.fromhex(packet)
+        ble_parser = BleParser()
+        reading, _ = ble_parser.parse_raw_data(data)
+        fields = (reading.rssi, reading.mac, reading.type, reading.packet, reading.firmware, reading.data)
+        measurements = list(reading.measurements.items())
+        as_dict = list(reading.as_dict().items())
+
+        reading_size, reading_blocks = allocations(lambda: Reading(*fields, dict(measurements)), count)
+        dict_size, dict_blocks = allocations(lambda: dict(as_dict), count)
+        parse_size, parse_blocks = allocations(lambda: ble_parser.parse_raw_data(data)[0], count)
+        start = time.perf_counter()
+        for _ in range(count):
+            ble_parser.parse_raw_data(data)
+        parse_time = (time.perf_counter() - start) / count
+        print(
+            f"{name:16}: Reading {reading_size:4.0f} bytes, {reading_blocks:.0f} blocks; "
+            f"dict {dict_size:4.0f} bytes, {dict_blocks:.0f} blocks; "
+            f"parser {parse_size:4.0f} bytes, {parse_blocks:.0f} blocks, {parse_time * 1e6:.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
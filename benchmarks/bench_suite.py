@@ -0,0 +1,272 @@
+"""Throughput and latency benchmark suite over the packet corpus.
+
+Runs the advertisements of the corpus (see corpus.py) through:
+
+- BleParser.parse_raw_data, reported per vendor and per kind of noise
+- HCIdump.process_hci_events, for the whole corpus
+- the flush path of the measuring sensor updater (BLEupdater), with the
+  readings of the corpus. All readings are in the first period, so every
+  reading is flushed to its entities. The entities are added by a fake
+  platform, that drops the state writes.
+
+and reports the throughput (packets per second, from the sum of the measured
+latencies) and the p50, p90 and p99 latency per packet. The results can be
+saved as JSON baseline, and compared with a baseline of the same machine: the
+benchmark fails when the throughput of a measurement drops more than the
+threshold below the baseline. The benchmarks are parse_raw_data,
+process_hci_events and updater (default all).
+
+Usage: python benchmarks/bench_suite.py [benchmark ...] [--rounds N] [--noise FACTOR]
+           [--save FILE] [--check FILE] [--threshold FRACTION]
+(run from the repository root)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+from time import perf_counter_ns
+from types import SimpleNamespace
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+import janus  # noqa: E402
+
+from corpus import build_corpus  # noqa: E402
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from ble_monitor import CONFIG_SCHEMA, HCIdump  # noqa: E402
+    from ble_monitor.ble_parser import BleParser  # noqa: E402
+    from ble_monitor.const import CONF_VENDORS, CONFIG_DEVICE_INDEX, DOMAIN  # noqa: E402
+    from ble_monitor.helper import device_index  # noqa: E402
+
+BENCHMARKS = ("parse_raw_data", "process_hci_events", "updater")
+# readings that the updater takes from its queue at once
+UPDATER_BATCH = 10
+
+
+def summary(latencies):
+    """Return the throughput and the latency percentiles of a list of latencies (ns)."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+
+    def percentile(percent):
+        return latencies[min(count - 1, count * percent // 100)] / 1000
+
+    return {
+        "packets": count,
+        "packets_per_sec": round(count / (sum(latencies) / 1e9)),
+        "p50_us": percentile(50),
+        "p90_us": percentile(90),
+        "p99_us": percentile(99),
+    }
+
+
+def create_config():
+    """Return the default configuration of the integration."""
+    config = CONFIG_SCHEMA({DOMAIN: {}})[DOMAIN]
+    config[CONF_VENDORS] = None
+    config[CONFIG_DEVICE_INDEX] = device_index(config)
+    return config
+
+
+def warm_up(ble_parser, corpus):
+    """Parse the corpus once, so the vendor parsers are loaded, and forget the parsed advertisements."""
+    for _, data, _ in corpus:
+        ble_parser.parse_raw_data(data)
+    ble_parser.lpacket_ids.clear()
+    ble_parser.movements_list.clear()
+    ble_parser.adv_priority.clear()
+
+
+def create_hcidump(config, aeskeys):
+    """Return a HCIdump with the encryption keys of the corpus."""
+    queues = {"binary": janus.Queue(), "measuring": janus.Queue(), "tracker": janus.Queue()}
+    hcidump = HCIdump(config, queues)
+    hcidump.ble_parser.aeskeys.update(aeskeys)
+    return hcidump
+
+
+def bench_parser(corpus, aeskeys, rounds):
+    """Measure BleParser.parse_raw_data per category of the corpus."""
+    latencies = {}
+    for _ in range(rounds):
+        ble_parser = BleParser(aeskeys=aeskeys)
+        warm_up(ble_parser, corpus)
+        for category, data, _ in corpus:
+            start = perf_counter_ns()
+            ble_parser.parse_raw_data(data)
+            latencies.setdefault(category, []).append(perf_counter_ns() - start)
+    results = {category: summary(values) for category, values in sorted(latencies.items())}
+    results["all"] = summary([value for values in latencies.values() for value in values])
+    return results
+
+
+def bench_hcidump(corpus, aeskeys, config, rounds):
+    """Measure HCIdump.process_hci_events for the corpus."""
+    latencies = []
+    for _ in range(rounds):
+        hcidump = create_hcidump(config, aeskeys)
+        warm_up(hcidump.ble_parser, corpus)
+        for _, data, gateway_id in corpus:
+            start = perf_counter_ns()
+            hcidump.process_hci_events(data, gateway_id)
+            latencies.append(perf_counter_ns() - start)
+    return {"all": summary(latencies)}
+
+
+def measuring_readings(corpus, aeskeys, config):
+    """Return the readings of the corpus for the measuring sensor updater."""
+    hcidump = create_hcidump(config, aeskeys)
+    for _, data, gateway_id in corpus:
+        hcidump.process_hci_events(data, gateway_id)
+    queue = hcidump.dataqueue_meas.sync_q
+    return [dict(queue.get_nowait()) for _ in range(queue.qsize())]
+
+
+class CorpusQueue:
+    """Queue of the updater, that records when the processing of a reading starts.
+
+    The updater calls task_done() before it processes a reading, the time
+    between two calls is the latency of a reading.
+    """
+
+    def __init__(self, readings):
+        """Initialize the queue, the updater stops after the readings."""
+        self._readings = iter([*readings, None])
+        self._batch = 0
+        self.started = []
+
+    async def get(self):
+        """Return the first reading of a batch."""
+        self._batch = 1
+        return next(self._readings)
+
+    def get_nowait(self):
+        """Return the next reading of the batch."""
+        if self._batch == UPDATER_BATCH:
+            raise asyncio.QueueEmpty
+        self._batch += 1
+        try:
+            return next(self._readings)
+        except StopIteration:
+            raise asyncio.QueueEmpty from None
+
+    def task_done(self):
+        """Record the start of the processing of a reading."""
+        self.started.append(perf_counter_ns())
+
+
+def add_entities(entities):
+    """Add the entities like a platform that drops the state writes."""
+    for entity in entities:
+        entity.ready_for_update = True
+        entity.async_write_ha_state = lambda: None
+        entity.async_schedule_update_ha_state = lambda force_refresh=False: None
+
+
+async def run_updater(readings, config, rounds):
+    """Measure the measuring sensor updater, including the flush of the entities."""
+    # the sensor platform is only imported for this benchmark
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        from ble_monitor.sensor import BLEupdater  # pylint: disable=import-outside-toplevel
+
+    latencies = []
+    hass = SimpleNamespace(loop=asyncio.get_running_loop())
+    for _ in range(rounds):
+        queue = CorpusQueue([dict(reading) for reading in readings])
+        monitor = SimpleNamespace(
+            config=config,
+            dataqueue={"measuring": SimpleNamespace(async_q=queue)},
+            restart=lambda: None,
+        )
+        await BLEupdater(monitor, add_entities).async_run(hass)
+        started = queue.started
+        latencies.extend(end - start for start, end in zip(started, started[1:]))
+    return {"measuring": summary(latencies)}
+
+
+def run(benchmarks, rounds, noise):
+    """Run the benchmarks and return the results."""
+    corpus, aeskeys = build_corpus(noise=noise)
+    config = create_config()
+    results = {"python": platform.python_version(), "corpus": len(corpus), "rounds": rounds}
+    if "parse_raw_data" in benchmarks:
+        results["parse_raw_data"] = bench_parser(corpus, aeskeys, rounds)
+    if "process_hci_events" in benchmarks:
+        results["process_hci_events"] = bench_hcidump(corpus, aeskeys, config, rounds)
+    if "updater" in benchmarks:
+        readings = measuring_readings(corpus, aeskeys, config)
+        results["updater"] = asyncio.run(run_updater(readings, config, rounds))
+    return results
+
+
+def regressions(results, baseline, threshold):
+    """Return the measurements with a throughput below the baseline minus the threshold."""
+    slower = []
+    for benchmark in BENCHMARKS:
+        for name, expected in baseline.get(benchmark, {}).items():
+            measured = results.get(benchmark, {}).get(name)
+            if measured is None:
+                continue
+            ratio = measured["packets_per_sec"] / expected["packets_per_sec"]
+            if ratio < 1 - threshold:
+                slower.append(f"{benchmark} {name}: {ratio:.0%} of the baseline")
+    return slower
+
+
+def report(results):
+    """Print the results."""
+    for benchmark in BENCHMARKS:
+        if benchmark not in results:
+            continue
+        print(benchmark)
+        for name, result in results[benchmark].items():
+            print(
+                f"  {name:16} {result['packets_per_sec']:9} packets/s  "
+                f"p50 {result['p50_us']:7.2f} us  p90 {result['p90_us']:7.2f} us  "
+                f"p99 {result['p99_us']:7.2f} us"
+            )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmark suite")
+    parser.add_argument(
+        "benchmarks", nargs="*", metavar="benchmark", help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default all)"
+    )
+    parser.add_argument("--rounds", type=int, default=200, help="number of runs over the corpus")
+    parser.add_argument("--noise", type=float, default=1.0, help="amount of synthetic noise")
+    parser.add_argument("--save", metavar="FILE", help="save the results as baseline")
+    parser.add_argument("--check", metavar="FILE", help="compare the results with a baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed drop of the throughput (fraction)"
+    )
+    args = parser.parse_args()
+    # argparse checks an empty list against the choices, so the names are checked here
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s) {', '.join(unknown)}, choose from {', '.join(BENCHMARKS)}")
+
+    logging.disable(logging.CRITICAL)
+    results = run(args.benchmarks or BENCHMARKS, args.rounds, args.noise)
+    report(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+    if args.check:
+        with open(args.check, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        slower = regressions(results, baseline, args.threshold)
+        if slower:
+            sys.exit("Throughput regression:\n" + "\n".join(slower))
+        print(f"No throughput regression beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
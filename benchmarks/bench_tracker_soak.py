@@ -0,0 +1,55 @@
+"""Soak benchmark of the device tracker data updates.
+
+Runs millions of data_update() calls on a device tracker entity and reports
+the cost per update and the traced memory for every chunk of updates. The
+cost per update and the memory should stay flat over the whole run.
+
+Usage: python benchmarks/bench_tracker_soak.py [number of updates]
+(run from the repository root)
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from ble_monitor.const import CONFIG_DEVICE_INDEX  # noqa: E402
+from ble_monitor.device_tracker import BleScannerEntity  # noqa: E402
+
+CHUNKS = 10
+
+
+def main():
+    """Run the benchmark."""
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    chunk = max(updates // CHUNKS, 1)
+    tracker = BleScannerEntity(
+        {"devices": [], "restore_state": False, CONFIG_DEVICE_INDEX: {}}, "A4C1382F866C"
+    )
+    data = {"mac": "A4C1382F866C", "rssi": -60, "gateway_id": "ble_monitor"}
+
+    tracemalloc.start()
+    results = []
+    for index in range(CHUNKS):
+        start = time.perf_counter()
+        for _ in range(chunk):
+            tracker._last_seen = None  # pylint: disable=protected-access
+            tracker.data_update(data)
+        elapsed = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        results.append(elapsed / chunk)
+        print(
+            f"chunk {index + 1:2}: {elapsed / chunk * 1e6:.3f} us/update, "
+            f"traced memory {memory / 1024:.1f} KiB"
+        )
+    tracemalloc.stop()
+
+    growth = results[-1] / results[0]
+    print(f"cost of the last chunk compared to the first chunk: {growth:.2f}x")
+    if growth > 1.5:
+        sys.exit("Update cost grows over time")
+
+
+if __name__ == "__main__":
+    main()
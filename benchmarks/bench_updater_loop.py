@@ -0,0 +1,106 @@
+"""Benchmark of the entity updater loop pattern.
+
+Compares the old updater loop, which takes one message per iteration with
+asyncio.wait_for() and calls dt.now() after every message, with the current
+loop, which drains everything that is queued and uses loop timers for the
+period boundaries.
+
+Usage: python benchmarks/bench_updater_loop.py [number of messages]
+"""
+import asyncio
+from datetime import timedelta
+import sys
+import threading
+import time
+
+import janus
+from homeassistant.util import dt
+
+PERIOD = 60
+
+
+def produce(queue, count):
+    """Fill the queue from a thread, like the HCIdump thread does."""
+    data = {"mac": "A4C138AABBCC", "type": "LYWSD03MMC", "rssi": -60, "temperature": 21.5}
+    for _ in range(count):
+        queue.put(data)
+    queue.put(None)
+
+
+async def wait_for_loop(queue):
+    """Updater loop before the drain-all rework."""
+    processed = 0
+    ts_last = dt.now()
+    data = None
+    while True:
+        try:
+            advevent = await asyncio.wait_for(queue.get(), 1)
+            if advevent is None:
+                return processed
+            data = advevent
+            queue.task_done()
+        except asyncio.TimeoutError:
+            pass
+        if data:
+            processed += 1
+            data = None
+        ts_now = dt.now()
+        if ts_now - ts_last < timedelta(seconds=PERIOD):
+            continue
+        ts_last = ts_now
+
+
+async def drain_loop(queue):
+    """Updater loop that drains all queued messages."""
+    processed = 0
+    loop = asyncio.get_running_loop()
+
+    def period_tick():
+        nonlocal period_timer
+        period_timer = loop.call_later(PERIOD, period_tick)
+
+    period_timer = loop.call_later(PERIOD, period_tick)
+    while True:
+        advevents = [await queue.get()]
+        try:
+            while True:
+                advevents.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        for data in advevents:
+            queue.task_done()
+            if data is None:
+                period_timer.cancel()
+                return processed
+            processed += 1
+        await asyncio.sleep(0)
+
+
+async def run(updater, count):
+    """Run an updater loop against a producer thread and return the elapsed time."""
+    queue = janus.Queue()
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce, args=(queue.sync_q, count))
+    producer.start()
+    processed = await updater(queue.async_q)
+    elapsed = time.perf_counter() - start
+    producer.join()
+    queue.close()
+    await queue.wait_closed()
+    assert processed == count
+    return elapsed
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, updater in (("wait_for", wait_for_loop), ("drain", drain_loop)):
+        elapsed = asyncio.run(run(updater, count))
+        print(
+            f"{name:>9}: {count} messages in {elapsed:.3f} s, "
+            f"{elapsed / count * 1e6:.2f} us/message, {count / elapsed:.0f} messages/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
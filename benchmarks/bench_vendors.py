@@ -0,0 +1,76 @@
+"""Benchmark of the BLE parser with all vendors and with a selection of vendors.
+
+Reports the parse time per advertisement and the memory that is allocated when
+the BLE parser is imported and created. The advertisements are a mix of
+advertisements of enabled vendors and of other vendors.
+
+Usage: python benchmarks/bench_vendors.py [number of rounds] [vendor ...]
+(run from the repository root)
+"""
+import os
+import subprocess
+import sys
+import time
+
+PATH = os.path.join(os.path.dirname(__file__), "..", "custom_components")
+sys.path.insert(0, PATH)
+
+from ble_monitor.ble_parser import BleParser  # noqa: E402
+
+VENDORS = ["xiaomi", "atc", "govee", "ruuvitag"]
+PACKETS = [
+    # ATC
+    "043e1d02010000f4830bb7a3cc1110161a18cca3b70b83f400e8296d0b7fe9c2",
+    # Tilt
+    "043E27020100008B5C6ED1BCC81B1AFF4C000215A495BB10C5B14B44B5121370F02D74DE004403F8C5C7",
+    # Govee H5075
+    "043E2B02010000123456789ABC1F0D09475648353037355F3430323507030088EC00010CFF88EC0003A3EA6400D5",
+    # unknown manufacturer
+    "043E1D0201000011223344556611020106040A000000FF07FF12340102030405A5",
+]
+# the ble_parser package is imported on its own, without the integration
+MEMORY = (
+    "import sys, tracemalloc\n"
+    f"sys.path.insert(0, {os.path.join(PATH, 'ble_monitor')!r})\n"
+    "tracemalloc.start()\n"
+    "from ble_parser import BleParser\n"
+    "BleParser(vendors={vendors!r})\n"
+    "print(tracemalloc.get_traced_memory()[0])\n"
+)
+
+
+def parse_time(ble_parser, packets, rounds):
+    """Return the parse time per advertisement."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for data in packets:
+            ble_parser.parse_raw_data(data)
+    return (time.perf_counter() - start) / (rounds * len(packets))
+
+
+def startup_memory(vendors):
+    """Return the memory allocated by importing and creating the BLE parser."""
+    result = subprocess.run(
+        [sys.executable, "-c", MEMORY.format(vendors=vendors)],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return int(result.stdout)
+
+
+def main():
+    """Run the benchmark."""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    vendors = sys.argv[2:] or VENDORS
+    packets = [bytes.fromhex(packet) for packet in PACKETS]
+    for name, selection in [("all vendors", None), (", ".join(vendors), vendors)]:
+        ble_parser = BleParser(vendors=selection)
+        print(
+            f"{name:30}: {parse_time(ble_parser, packets, rounds) * 1e6:6.2f} us/advertisement, "
+            f"{startup_memory(selection) / 1024:7.1f} KiB at startup"
+        )
+
+
+if __name__ == "__main__":
+    main()
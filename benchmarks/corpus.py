@@ -0,0 +1,154 @@
+"""Packet corpus for the benchmarks.
+
+The corpus is built from the advertisements in the tests of the BLE parser
+(the data_string of every test), with synthetic noise like the traffic of a
+real site:
+
+- phone: advertisements of phones with a random (resolvable private) address
+- ibeacon: iBeacons with a random UUID, that are not tracked
+- duplicate: an advertisement that is received twice
+- encrypted: an encrypted advertisement with a corrupted byte
+- adapter repeat: an advertisement that is received by a second adapter
+
+The encryption keys of the tests are collected as well, so the encrypted
+advertisements of the tests are decrypted.
+"""
+import glob
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "ble_monitor"))
+
+from ble_parser.vendors import VENDORS  # noqa: E402
+
+TEST_PATH = os.path.join(os.path.dirname(__file__), "..", "custom_components", "ble_monitor", "test")
+GATEWAYS = ("ble_monitor", "hci1")
+
+# share of every kind of noise, relative to the number of test advertisements
+NOISE = {
+    "phone": 0.4,
+    "ibeacon": 0.1,
+    "duplicate": 0.1,
+    "encrypted": 0.05,
+    "adapter repeat": 0.2,
+}
+
+DATA_STRING = re.compile(r'data_string = "([0-9a-fA-F]+)"')
+AESKEY = re.compile(r'aeskey = "([0-9a-fA-F]{32}|[0-9a-fA-F]{24})"')
+ENCRYPTED_VENDORS = ("xiaomi", "atc", "ha_ble")
+
+
+def vendor_name(path):
+    """Return the vendor of a test module (test_govee_parser.py -> govee)."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name.removeprefix("test_").removesuffix("_parser")
+
+
+def event_mac(data):
+    """Return the MAC address of a HCI LE advertising report (legacy or extended)."""
+    if data[3] == 0x0D:
+        return data[8:14][::-1]
+    return data[7:13][::-1]
+
+
+def test_vectors(path=TEST_PATH):
+    """Return the (vendor, HCI event) tuples and the encryption keys of the tests."""
+    vectors = []
+    aeskeys = {}
+    for filename in sorted(glob.glob(os.path.join(path, "test_*.py"))):
+        vendor = vendor_name(filename)
+        if vendor not in VENDORS:
+            continue
+        with open(filename, encoding="utf-8") as test_file:
+            source = test_file.read()
+        for test in source.split("    def test_"):
+            packets = [bytes.fromhex(packet) for packet in DATA_STRING.findall(test)]
+            vectors.extend((vendor, data) for data in packets)
+            for aeskey in AESKEY.findall(test):
+                for data in packets:
+                    aeskeys[event_mac(data)] = bytes.fromhex(aeskey)
+    return vectors, aeskeys
+
+
+def hci_event(mac, adv_data, rssi=-70, adv_type=0x00, addr_type=0x01):
+    """Return a HCI LE advertising report event (legacy) with one report."""
+    return (
+        bytes([0x04, 0x3E, 12 + len(adv_data), 0x02, 0x01, adv_type, addr_type])
+        + mac[::-1]
+        + bytes([len(adv_data)])
+        + adv_data
+        + rssi.to_bytes(1, "big", signed=True)
+    )
+
+
+def random_address(rng):
+    """Return a random resolvable private address."""
+    return bytes([0x40 | rng.randrange(0x40)]) + rng.randbytes(5)
+
+
+def phone_adv_data(rng):
+    """Return the advertising data of a phone (Apple Nearby Info with flags and TX power)."""
+    return (
+        b"\x02\x01\x1a"
+        + b"\x02\x0a" + rng.randbytes(1)
+        + b"\x0a\xff\x4c\x00\x10\x05" + rng.randbytes(5)
+    )
+
+
+def phone_event(rng):
+    """Return an advertisement of a phone with a random address."""
+    adv_data = phone_adv_data(rng)
+    return hci_event(random_address(rng), adv_data, rssi=-rng.randrange(40, 100))
+
+
+def ibeacon_event(rng):
+    """Return an advertisement of an iBeacon with a random UUID, major and minor."""
+    adv_data = b"\x02\x01\x06\x1a\xff\x4c\x00\x02\x15" + rng.randbytes(20) + b"\xc5"
+    return hci_event(rng.randbytes(6), adv_data, rssi=-rng.randrange(40, 100), addr_type=0x00)
+
+
+def corrupt(rng, data):
+    """Return an advertisement with one corrupted byte before the RSSI."""
+    index = rng.randrange(len(data) - 8, len(data) - 1)
+    return data[:index] + bytes([data[index] ^ 0xFF]) + data[index + 1:]
+
+
+def build_corpus(seed=0, noise=1.0, path=TEST_PATH):
+    """Return the corpus and the encryption keys of the tests.
+
+    The corpus is a list of (category, HCI event, gateway id) tuples, the
+    category is the vendor or the kind of noise. The noise factor scales the
+    amount of noise, 0 gives the test advertisements only.
+    """
+    rng = random.Random(seed)
+    vectors, aeskeys = test_vectors(path)
+    encrypted = [data for vendor, data in vectors if vendor in ENCRYPTED_VENDORS and event_mac(data) in aeskeys]
+    corpus = [(vendor, data, GATEWAYS[0]) for vendor, data in vectors]
+    counts = {kind: round(share * noise * len(vectors)) for kind, share in NOISE.items()}
+
+    noise_entries = [("phone", phone_event(rng), GATEWAYS[0]) for _ in range(counts["phone"])]
+    noise_entries += [("ibeacon", ibeacon_event(rng), GATEWAYS[0]) for _ in range(counts["ibeacon"])]
+    if encrypted:
+        noise_entries += [
+            ("encrypted", corrupt(rng, rng.choice(encrypted)), GATEWAYS[0]) for _ in range(counts["encrypted"])
+        ]
+    for entry in noise_entries:
+        corpus.insert(rng.randrange(len(corpus) + 1), entry)
+
+    # duplicates and repeats follow the original advertisement
+    repeats = rng.sample(range(len(vectors)), min(counts["duplicate"] + counts["adapter repeat"], len(vectors)))
+    repeated = {
+        vectors[index][1]: "duplicate" if number < counts["duplicate"] else "adapter repeat"
+        for number, index in enumerate(repeats)
+    }
+    result = []
+    for category, data, gateway_id in corpus:
+        result.append((category, data, gateway_id))
+        kind = repeated.pop(data, None) if category not in NOISE else None
+        if kind == "duplicate":
+            result.append((kind, data, gateway_id))
+        elif kind == "adapter repeat":
+            result.append((kind, data, GATEWAYS[1]))
+    return result, aeskeys
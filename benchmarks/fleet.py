@@ -0,0 +1,496 @@
+"""Synthetic fleet load generator.
+
+Simulates a fleet of BLE devices and generates their raw HCI events, in order
+of time:
+
+- xiaomi: LYWSDCGQ, MiBeacon V2 with temperature and humidity
+- xiaomi_encrypted: LYWSD03MMC, MiBeacon V5 encrypted with AES-CCM
+- atc: ATC custom format (pvvx firmware)
+- govee: H5075
+- ruuvitag: Ruuvitag RAWv2 (data format 5)
+- ibeacon: iBeacons that are tracked by the device tracker
+- phone: phones with a random address that changes every 15 minutes
+
+Every device advertises at the advertising interval of its kind, plus the
+random advertising delay of 0-10 ms of the Bluetooth specification. The frame
+counters increase when a device has a new measurement, advertisements with the
+same counter are repeats (like real devices), the encrypted advertisements
+have a valid AES-CCM tag for a generated key.
+
+The events are parsed by HCIdump.process_hci_events and the readings are
+processed by the updater loops of the measuring sensors (BLEupdater), the
+binary sensors (BLEupdaterBinary) and the device trackers (BLEupdaterTracker),
+on an event loop with a virtual clock (the entities are added by a fake
+platform, that drops the state writes). The end-to-end capacity is reported
+as the number of seconds of fleet traffic that are processed per CPU second
+(the fleet size that one core can handle is the fleet size times this factor),
+with the share of process_hci_events. With --parser-only the updaters are not
+run and the parser capacity is reported. With --capture the events are written to a capture
+file for benchmarks/replay.py or python -m ble_parser instead, with --config
+the encryption keys and tracked iBeacons are written to a JSON file for these
+tools.
+
+Usage: python benchmarks/fleet.py [--xiaomi N] [--xiaomi-encrypted N] [--atc N] [--govee N]
+           [--ruuvitag N] [--ibeacon N] [--phone N] [--duration SECONDS] [--seed N]
+           [--parser-only] [--capture FILE] [--config FILE]
+(run from the repository root)
+"""
+from abc import ABC, abstractmethod
+import argparse
+import asyncio
+import heapq
+import json
+import logging
+import os
+import random
+import selectors
+import struct
+import sys
+from time import process_time
+from types import SimpleNamespace
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+import janus  # noqa: E402
+from Cryptodome.Cipher import AES  # noqa: E402
+
+from corpus import hci_event, phone_adv_data, random_address  # noqa: E402
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from ble_monitor import CONFIG_SCHEMA, HCIdump  # noqa: E402
+    from ble_monitor.ble_parser.capture import CaptureWriter  # noqa: E402
+    from ble_monitor.const import CONF_VENDORS, CONFIG_DEVICE_INDEX, DOMAIN  # noqa: E402
+    from ble_monitor.helper import device_index  # noqa: E402
+    from ble_monitor.timer_wheel import TimerWheel  # noqa: E402
+
+FLAGS = b"\x02\x01\x06"
+# random advertising delay that is added to every advertising interval (s)
+ADV_DELAY = 0.01
+# events between two drains of the updater queues
+DRAIN_INTERVAL = 1000
+
+
+class Device(ABC):
+    """Simulated BLE device.
+
+    The device advertises every interval seconds and measures every repeats
+    advertisements, the frame counter increases with every measurement.
+    """
+
+    interval = 1.0
+    repeats = 1
+
+    def __init__(self, rng):
+        """Initialize the device with a random address, signal and measurements."""
+        self.rng = rng
+        self.mac = rng.randbytes(6)
+        self.rssi = -rng.randrange(45, 95)
+        self.counter = rng.randrange(0x10000)
+        self.temperature = rng.uniform(15, 25)
+        self.humidity = rng.uniform(35, 65)
+        self.battery = rng.randrange(50, 101)
+        self.adverts = 0
+        self.adv_data = None
+
+    def measure(self):
+        """Take a new measurement (random walk)."""
+        self.counter += 1
+        self.temperature += self.rng.uniform(-0.1, 0.1)
+        self.humidity = min(100, max(0, self.humidity + self.rng.uniform(-0.5, 0.5)))
+
+    @abstractmethod
+    def frame(self):
+        """Return the advertising data of the current measurement."""
+
+    def advertise(self):
+        """Return the HCI event of the next advertisement."""
+        if self.adverts % self.repeats == 0:
+            self.measure()
+            self.adv_data = self.frame()
+        self.adverts += 1
+        return hci_event(self.mac, self.adv_data, rssi=self.rssi + self.rng.randrange(-3, 4))
+
+
+class XiaomiDevice(Device):
+    """LYWSDCGQ, MiBeacon V2 with the temperature and humidity object."""
+
+    interval = 2.0
+    repeats = 5
+
+    def frame(self):
+        """Return a MiBeacon V2 frame with MAC address and object 0x100D."""
+        mibeacon = (
+            b"\x50\x20\xaa\x01"
+            + bytes([self.counter & 0xFF])
+            + self.mac[::-1]
+            + b"\x0d\x10\x04"
+            + struct.pack("<hH", round(self.temperature * 10), round(self.humidity * 10))
+        )
+        return FLAGS + bytes([len(mibeacon) + 3, 0x16, 0x95, 0xFE]) + mibeacon
+
+
+class XiaomiEncryptedDevice(Device):
+    """LYWSD03MMC, MiBeacon V5 encrypted, with one object per measurement."""
+
+    interval = 2.0
+    repeats = 10
+
+    def __init__(self, rng):
+        """Initialize the device with a random encryption key."""
+        super().__init__(rng)
+        self.key = rng.randbytes(16)
+
+    def frame(self):
+        """Return an encrypted MiBeacon V5 frame with temperature, humidity or battery."""
+        header = b"\x58\x58\x5b\x05" + bytes([self.counter & 0xFF])
+        ext_counter = ((self.counter >> 8) & 0xFFFFFF).to_bytes(3, "little")
+        kind = self.counter % 3
+        if kind == 0:
+            payload = b"\x04\x10\x02" + struct.pack("<h", round(self.temperature * 10))
+        elif kind == 1:
+            payload = b"\x06\x10\x02" + struct.pack("<H", round(self.humidity * 10))
+        else:
+            payload = b"\x0a\x10\x01" + bytes([self.battery])
+        nonce = self.mac[::-1] + header[2:5] + ext_counter
+        cipher = AES.new(self.key, AES.MODE_CCM, nonce=nonce, mac_len=4)
+        cipher.update(b"\x11")
+        ciphertext, tag = cipher.encrypt_and_digest(payload)
+        mibeacon = header + self.mac[::-1] + ciphertext + ext_counter + tag
+        return FLAGS + bytes([len(mibeacon) + 3, 0x16, 0x95, 0xFE]) + mibeacon
+
+
+class AtcDevice(Device):
+    """Thermometer with ATC firmware (pvvx), custom format."""
+
+    interval = 2.5
+    repeats = 4
+
+    def frame(self):
+        """Return a frame in ATC custom format."""
+        return FLAGS + b"\x12\x16\x1a\x18" + self.mac[::-1] + struct.pack(
+            "<hHHBBB",
+            round(self.temperature * 100),
+            round(self.humidity * 100),
+            2200 + self.battery * 9,
+            self.battery,
+            self.counter & 0xFF,
+            0,
+        )
+
+
+class GoveeDevice(Device):
+    """Govee H5075, the advertisements have no frame counter."""
+
+    interval = 1.0
+
+    def frame(self):
+        """Return a H5075 frame with temperature and humidity packed in 3 bytes."""
+        temperature = round(self.temperature * 10)
+        packed = abs(temperature) * 1000 + round(self.humidity * 10)
+        if temperature < 0:
+            packed |= 0x800000
+        return FLAGS + b"\x09\xff\x88\xec\x00" + packed.to_bytes(3, "big") + bytes([self.battery, 0])
+
+
+class RuuvitagDevice(Device):
+    """Ruuvitag with RAWv2 firmware, the measurement sequence increases with every advertisement."""
+
+    interval = 1.285
+
+    def frame(self):
+        """Return a RAWv2 frame."""
+        power = ((2400 + self.battery * 10 - 1600) << 5) | 0x0C
+        rawv2 = struct.pack(
+            ">BhHHhhhHBH",
+            5,
+            round(self.temperature * 200),
+            round(self.humidity * 400),
+            100000 - 50000,
+            self.rng.randrange(-20, 20),
+            self.rng.randrange(-20, 20),
+            1000,
+            power,
+            0,
+            self.counter & 0xFFFF,
+        )
+        return FLAGS + b"\x1b\xff\x99\x04" + rawv2 + self.mac
+
+
+class IbeaconDevice(Device):
+    """iBeacon that is tracked by the device tracker."""
+
+    interval = 1.0
+
+    def __init__(self, rng):
+        """Initialize the iBeacon with a random UUID, major and minor."""
+        super().__init__(rng)
+        self.uuid = rng.randbytes(16)
+        self.major_minor = rng.randbytes(4)
+
+    def frame(self):
+        """Return an iBeacon frame."""
+        return b"\x02\x01\x06\x1a\xff\x4c\x00\x02\x15" + self.uuid + self.major_minor + b"\xc5"
+
+
+class PhoneDevice(Device):
+    """Phone with a random resolvable private address that changes every 15 minutes."""
+
+    interval = 0.5
+    rotation = 900
+
+    def frame(self):
+        """Return an Apple Nearby frame."""
+        return phone_adv_data(self.rng)
+
+    def advertise(self):
+        """Return the HCI event of the next advertisement, with a new address after the rotation."""
+        if self.adverts % round(self.rotation / self.interval) == 0:
+            self.mac = random_address(self.rng)
+        self.adverts += 1
+        return hci_event(self.mac, self.frame(), rssi=self.rssi + self.rng.randrange(-3, 4))
+
+
+DEVICES = {
+    "xiaomi": XiaomiDevice,
+    "xiaomi_encrypted": XiaomiEncryptedDevice,
+    "atc": AtcDevice,
+    "govee": GoveeDevice,
+    "ruuvitag": RuuvitagDevice,
+    "ibeacon": IbeaconDevice,
+    "phone": PhoneDevice,
+}
+
+
+def create_fleet(counts, rng):
+    """Return the devices of the fleet, counts is {kind: number of devices}."""
+    return [DEVICES[kind](rng) for kind, count in counts.items() for _ in range(count)]
+
+
+def fleet_events(devices, duration, rng):
+    """Yield the (timestamp in ns, HCI event) of the fleet for duration seconds, in order of time.
+
+    Every device starts at a random moment of its first advertising interval.
+    """
+    schedule = [(rng.uniform(0, device.interval), index) for index, device in enumerate(devices)]
+    heapq.heapify(schedule)
+    while schedule:
+        timestamp, index = schedule[0]
+        if timestamp >= duration:
+            return
+        device = devices[index]
+        yield round(timestamp * 1e9), device.advertise()
+        heapq.heapreplace(schedule, (timestamp + device.interval + rng.uniform(0, ADV_DELAY), index))
+
+
+def fleet_config(devices):
+    """Return the parser options of the fleet (encryption keys and tracked iBeacons)."""
+    return {
+        "aeskeys": {device.mac.hex(): device.key.hex() for device in devices if hasattr(device, "key")},
+        "tracker_whitelist": [device.uuid.hex() for device in devices if isinstance(device, IbeaconDevice)],
+    }
+
+
+def create_hcidump(devices):
+    """Return a HCIdump with the encryption keys and tracked iBeacons of the fleet."""
+    config = CONFIG_SCHEMA({DOMAIN: {}})[DOMAIN]
+    config[CONF_VENDORS] = None
+    config[CONFIG_DEVICE_INDEX] = device_index(config)
+    queues = {"binary": janus.Queue(), "measuring": janus.Queue(), "tracker": janus.Queue()}
+    hcidump = HCIdump(config, queues)
+    for device in devices:
+        if isinstance(device, XiaomiEncryptedDevice):
+            hcidump.ble_parser.aeskeys[device.mac] = device.key
+        elif isinstance(device, IbeaconDevice):
+            hcidump.ble_parser.tracker_whitelist.append(device.uuid)
+    return hcidump
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    """Selector that advances the virtual clock instead of waiting for the next timer."""
+
+    def __init__(self):
+        """Initialize the selector."""
+        super().__init__()
+        self.loop = None
+
+    def select(self, timeout=None):
+        """Advance the clock by the timeout of the loop and poll the file descriptors."""
+        if timeout is not None and timeout > 0:
+            self.loop.advance(timeout)
+            timeout = 0
+        return super().select(timeout)
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop with a virtual clock, that only advances when all tasks are waiting."""
+
+    def __init__(self):
+        """Initialize the loop at time 0."""
+        selector = VirtualSelector()
+        super().__init__(selector)
+        selector.loop = self
+        self._clock = 0.0
+
+    def time(self):
+        """Return the virtual time."""
+        return self._clock
+
+    def advance(self, seconds):
+        """Advance the virtual time."""
+        self._clock += seconds
+
+
+def add_entities(entities):
+    """Add the entities like a platform that drops the state writes."""
+    for entity in entities:
+        entity.ready_for_update = True
+        entity.async_write_ha_state = lambda: None
+        entity.async_schedule_update_ha_state = lambda force_refresh=False: None
+        entity.schedule_update_ha_state = lambda force_refresh=False: None
+
+
+def start_updaters(hcidump):
+    """Start the updaters of the sensors, binary sensors and device trackers on the running loop.
+
+    The queues of the HCIdump must be created on the same loop. Returns the
+    tasks of the updaters by platform.
+    """
+    # the platforms are only imported when the updaters are run
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        # pylint: disable=import-outside-toplevel
+        from ble_monitor import binary_sensor, device_tracker, sensor
+
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(loop=loop, data={DOMAIN: {"timer_wheel": TimerWheel(loop)}})
+    monitor = SimpleNamespace(
+        config=hcidump.config,
+        dataqueue={
+            "binary": hcidump.dataqueue_bin,
+            "measuring": hcidump.dataqueue_meas,
+            "tracker": hcidump.dataqueue_tracker,
+        },
+        restart=lambda: None,
+    )
+    return {
+        "sensor": loop.create_task(sensor.BLEupdater(monitor, add_entities).async_run(hass)),
+        "binary": loop.create_task(binary_sensor.BLEupdaterBinary(monitor, add_entities).async_run(hass)),
+        "tracker": loop.create_task(device_tracker.BLEupdaterTracker(monitor, add_entities).async_run(hass)),
+    }
+
+
+async def stop_updaters(hcidump, tasks):
+    """Stop the updaters and wait until they processed the queued readings."""
+    for data_queue in (hcidump.dataqueue_bin, hcidump.dataqueue_meas, hcidump.dataqueue_tracker):
+        data_queue.sync_q.put_nowait(None)
+    await asyncio.gather(*tasks.values())
+
+
+async def run_fleet(devices, events):
+    """Parse the events and run the updaters, return the number of events and CPU seconds.
+
+    The CPU seconds are the total of the run and the part of
+    process_hci_events. The updaters take the readings once per simulated
+    second, like in production.
+    """
+    # the queues of the updaters are bound to the loop
+    hcidump = create_hcidump(devices)
+    tasks = start_updaters(hcidump)
+    loop = asyncio.get_running_loop()
+    process_hci_events = hcidump.process_hci_events
+    parser_time = 0.0
+    run_start = start = process_time()
+    for timestamp, data in events:
+        timestamp /= 1e9
+        if timestamp - loop.time() >= 1:
+            parser_time += process_time() - start
+            await asyncio.sleep(timestamp - loop.time())
+            start = process_time()
+        process_hci_events(data)
+    parser_time += process_time() - start
+    await stop_updaters(hcidump, tasks)
+    return len(events), process_time() - run_start, parser_time
+
+
+def run_hcidump(hcidump, events):
+    """Parse the events with HCIdump, return the number of events, readings and CPU seconds."""
+    queues = [hcidump.dataqueue_bin.sync_q, hcidump.dataqueue_meas.sync_q, hcidump.dataqueue_tracker.sync_q]
+    count = readings = 0
+    cpu_time = 0.0
+    process_hci_events = hcidump.process_hci_events
+    for batch_start in range(0, len(events), DRAIN_INTERVAL):
+        batch = events[batch_start:batch_start + DRAIN_INTERVAL]
+        start = process_time()
+        for data in batch:
+            process_hci_events(data)
+        cpu_time += process_time() - start
+        count += len(batch)
+        # empty the queues like the updaters, so they don't grow
+        for sync_q in queues:
+            for _ in range(sync_q.qsize()):
+                sync_q.get_nowait()
+                readings += 1
+    return count, readings, cpu_time
+
+
+def main():
+    """Generate the fleet traffic."""
+    parser = argparse.ArgumentParser(description="Synthetic fleet load generator")
+    defaults = {"xiaomi": 50, "xiaomi_encrypted": 50, "atc": 50, "govee": 50, "ruuvitag": 20, "ibeacon": 20,
+                "phone": 100}
+    for kind, default in defaults.items():
+        parser.add_argument(
+            f"--{kind.replace('_', '-')}", dest=kind, type=int, default=default, help=f"number of {kind} devices"
+        )
+    parser.add_argument("--duration", type=float, default=600, help="simulated seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+    parser.add_argument(
+        "--parser-only", action="store_true", help="only run process_hci_events, not the updaters"
+    )
+    parser.add_argument("--capture", metavar="FILE", help="write the events to a capture file")
+    parser.add_argument("--config", metavar="FILE", help="write the keys and tracked iBeacons to a JSON file")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(args.seed)
+    devices = create_fleet({kind: getattr(args, kind) for kind in DEVICES}, rng)
+    if args.config:
+        with open(args.config, "w", encoding="utf-8") as config_file:
+            json.dump(fleet_config(devices), config_file, indent=2)
+    if args.capture:
+        writer = CaptureWriter(args.capture)
+        for timestamp, data in fleet_events(devices, args.duration, rng):
+            writer.write(data, 0, timestamp)
+        writer.close()
+        print(f"{writer.events} events of {len(devices)} devices written to {args.capture}")
+        return
+
+    if args.parser_only:
+        hcidump = create_hcidump(devices)
+        events = [data for _, data in fleet_events(devices, args.duration, rng)]
+        count, readings, cpu_time = run_hcidump(hcidump, events)
+        print(f"{len(devices)} devices, {count} events in {args.duration:.0f} s ({count / args.duration:.0f} events/s)")
+        print(f"process_hci_events: {count / cpu_time:.0f} events/s per CPU second, {readings} readings")
+        print(f"parser capacity: {args.duration / cpu_time:.1f}x the fleet per core")
+        return
+
+    events = list(fleet_events(devices, args.duration, rng))
+    loop = VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    try:
+        count, cpu_time, parser_time = loop.run_until_complete(run_fleet(devices, events))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    print(f"{len(devices)} devices, {count} events in {args.duration:.0f} s ({count / args.duration:.0f} events/s)")
+    print(
+        f"parser and updaters: {count / cpu_time:.0f} events/s per CPU second, "
+        f"process_hci_events {parser_time / cpu_time:.0%} of the CPU time"
+    )
+    print(f"end-to-end capacity: {args.duration / cpu_time:.1f}x the fleet per core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Replay capture files of HCIdump (option capture_file) through process_hci_events.
+
+The HCI events are replayed in real-time (speed 1), N times faster than they
+were captured (speed N) or as fast as possible (speed 0), without Bluetooth
+hardware. A capture path replays the capture file and its rotated backups,
+oldest first. Encryption keys and tracked devices can be given in a JSON file
+in the format of python -m ble_parser --config (e.g. written by fleet.py), so
+encrypted advertisements are decrypted like in production.
+
+Reports the number of events, the replay time and the time spent in
+process_hci_events per event (p50, p99), which can be profiled with
+python -m cProfile benchmarks/replay.py ...
+
+Usage: python benchmarks/replay.py capture [capture ...] [--speed N] [--config FILE]
+(run from the repository root)
+"""
+import argparse
+import logging
+import os
+import sys
+from time import perf_counter_ns
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+import janus  # noqa: E402
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from ble_monitor import CONFIG_SCHEMA, HCIdump  # noqa: E402
+    from ble_monitor.ble_parser.__main__ import load_config  # noqa: E402
+    from ble_monitor.ble_parser.capture import capture_files, replay  # noqa: E402
+    from ble_monitor.const import CONF_VENDORS, DOMAIN  # noqa: E402
+
+
+def create_hcidump(options):
+    """Return a HCIdump with the default configuration and the encryption keys and tracked devices."""
+    config = CONFIG_SCHEMA({DOMAIN: {}})[DOMAIN]
+    config[CONF_VENDORS] = None
+    queues = {"binary": janus.Queue(), "measuring": janus.Queue(), "tracker": janus.Queue()}
+    hcidump = HCIdump(config, queues)
+    hcidump.ble_parser.aeskeys.update(options.get("aeskeys", {}))
+    hcidump.ble_parser.tracker_whitelist.extend(options.get("tracker_whitelist", []))
+    return hcidump
+
+
+def drain(hcidump):
+    """Empty the queues of the updaters, so the memory use stays flat."""
+    for data_queue in (hcidump.dataqueue_bin, hcidump.dataqueue_meas, hcidump.dataqueue_tracker):
+        sync_q = data_queue.sync_q
+        for _ in range(sync_q.qsize()):
+            sync_q.get_nowait()
+
+
+def main():
+    """Replay the capture files."""
+    parser = argparse.ArgumentParser(description="Replay HCIdump capture files")
+    parser.add_argument("captures", nargs="+", help="capture files (including the rotated files)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 0 is as fast as possible")
+    parser.add_argument("--config", metavar="FILE", help="JSON file with the encryption keys and tracked devices")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    hcidump = create_hcidump(load_config(args.config))
+    paths = [path for capture in args.captures for path in capture_files(capture)]
+    if not paths:
+        sys.exit("No capture files found")
+    latencies = []
+
+    def process(data):
+        start = perf_counter_ns()
+        hcidump.process_hci_events(data)
+        latencies.append(perf_counter_ns() - start)
+        if len(latencies) % 1000 == 0:
+            drain(hcidump)
+
+    start = perf_counter_ns()
+    events = replay(paths, process, args.speed)
+    elapsed = (perf_counter_ns() - start) / 1e9
+    if not events:
+        sys.exit("No HCI events in the capture files")
+    latencies.sort()
+    print(f"{events} events from {len(paths)} file(s) replayed in {elapsed:.2f} s")
+    print(
+        f"process_hci_events: {events / (sum(latencies) / 1e9):.0f} events/s, "
+        f"p50 {latencies[events // 2] / 1000:.2f} us, "
+        f"p99 {latencies[min(events - 1, events * 99 // 100)] / 1000:.2f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
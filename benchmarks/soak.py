@@ -0,0 +1,269 @@
+"""Long-running memory soak of the parser and the entity updaters.
+
+Drives simulated days of fleet traffic (see fleet.py) through
+HCIdump.process_hci_events and the updater loops of the measuring sensors
+(BLEupdater), the binary sensors (BLEupdaterBinary) and the device trackers
+(BLEupdaterTracker). The entities are added by a fake platform, that drops
+the state writes. Besides the sensors and iBeacons of the fleet, the traffic
+has churn of devices that are parsed:
+
+- iBeacon phones: phones with an app that advertises a tracked iBeacon, with
+  a random address that changes every 15 minutes. The iBeacon is tracked by
+  its UUID, so the new addresses must not add state.
+- replaced sensors: every hour --churn sensors are replaced by new sensors
+  (new MAC addresses), like sensors of the neighbours that come and go. A new
+  sensor gets new entities (which Home Assistant keeps), so the structures
+  may grow by one entry per replaced sensor, the device tracker structures
+  not at all.
+
+Phones that only send Apple Nearby advertisements are added as well, they
+are dropped by the parser.
+
+The updaters run on the event loop with a virtual clock of fleet.py: when all
+tasks are waiting, the clock jumps to the next timer, so the period and flush
+timers of the updaters fire like in production, but a simulated day of the
+default fleet takes about 15 minutes.
+
+Every simulated hour the traced memory (tracemalloc, started after the
+warm-up) and the size of the structures that grow with the number of MAC
+addresses are reported:
+
+- lpacket_ids, adv_priority and movements_list of the BleParser
+- sensors_by_key, rssi and batt of the measuring sensor updater
+- sensors_by_key and batt of the binary sensor updater
+- trackers_by_key of the device tracker updater
+- RESTORE_ATTRIBUTES of the sensor, binary sensor and device tracker platforms
+
+The benchmark fails when a structure grows more than its allowed growth per
+replaced sensor (STRUCTURE_GROWTH) after the first hour after the warm-up, or
+when the traced memory grows more than the threshold plus --sensor-memory per
+replaced sensor. The lines that allocated the memory growth are shown.
+
+Usage: python benchmarks/soak.py [--days DAYS] [--warm-up HOURS] [--threshold KIB]
+           [--sensors N] [--ibeacon N] [--ibeacon-phone N] [--phone N] [--churn N]
+           [--sensor-memory KIB] [--seed N]
+(run from the repository root)
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import random
+import sys
+from time import perf_counter
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from corpus import hci_event, random_address  # noqa: E402
+from fleet import (  # noqa: E402
+    AtcDevice,
+    GoveeDevice,
+    IbeaconDevice,
+    RuuvitagDevice,
+    VirtualClockLoop,
+    XiaomiDevice,
+    create_fleet,
+    create_hcidump,
+    fleet_events,
+    start_updaters,
+    stop_updaters,
+)
+
+HOUR = 3600
+# sensor kinds of the fleet, --sensors devices of every kind
+SENSOR_KINDS = ("xiaomi", "xiaomi_encrypted", "atc", "govee", "ruuvitag")
+# sensors that are replaced by the churn (the encrypted sensors would need new keys)
+CHURN_DEVICES = (XiaomiDevice, AtcDevice, GoveeDevice, RuuvitagDevice)
+# structures of the updaters (local variables of async_run) that are reported
+UPDATER_STRUCTURES = {
+    "sensor": ("sensors_by_key", "rssi", "batt"),
+    "binary": ("sensors_by_key", "batt"),
+    "tracker": ("trackers_by_key",),
+}
+# allowed growth of the structures per replaced sensor
+STRUCTURE_GROWTH = {
+    "lpacket_ids": 1,
+    "adv_priority": 1,
+    "movements_list": 1,
+    "sensor.sensors_by_key": 1,
+    "sensor.rssi": 1,
+    "sensor.batt": 1,
+    "binary.sensors_by_key": 1,
+    "binary.batt": 1,
+    "tracker.trackers_by_key": 0,
+    "sensor.RESTORE_ATTRIBUTES": 0,
+    "binary.RESTORE_ATTRIBUTES": 0,
+    "tracker.RESTORE_ATTRIBUTES": 0,
+}
+# lines of the allocations that are shown when the memory grows
+TOP_LINES = 10
+
+
+class IbeaconPhoneDevice(IbeaconDevice):
+    """Phone that advertises a tracked iBeacon, with a random address that changes every 15 minutes."""
+
+    rotation = 900
+
+    def advertise(self):
+        """Return the HCI event of the next advertisement, with a new address after the rotation."""
+        if self.adverts % round(self.rotation / self.interval) == 0:
+            self.mac = random_address(self.rng)
+        self.adverts += 1
+        return hci_event(self.mac, self.frame(), rssi=self.rssi + self.rng.randrange(-3, 4))
+
+
+def create_devices(args, rng):
+    """Return the devices of the soak."""
+    counts = {kind: args.sensors for kind in SENSOR_KINDS}
+    counts.update(ibeacon=args.ibeacon, phone=args.phone)
+    devices = create_fleet(counts, rng)
+    devices.extend(IbeaconPhoneDevice(rng) for _ in range(args.ibeacon_phone))
+    return devices
+
+
+def replace_sensors(devices, count, rng):
+    """Replace sensors by new sensors of the same kind, with a new MAC address."""
+    indexes = [index for index, device in enumerate(devices) if type(device) in CHURN_DEVICES]
+    for index in rng.sample(indexes, min(count, len(indexes))):
+        devices[index] = type(devices[index])(rng)
+
+
+def structure_sizes(hcidump, tasks, platforms):
+    """Return the sizes of the structures that grow with the number of MAC addresses."""
+    ble_parser = hcidump.ble_parser
+    sizes = {
+        "lpacket_ids": len(ble_parser.lpacket_ids),
+        "adv_priority": len(ble_parser.adv_priority),
+        "movements_list": len(ble_parser.movements_list),
+    }
+    for name, task in tasks.items():
+        # the structures are local variables of the (suspended) async_run of the updater
+        frame = task.get_coro().cr_frame
+        variables = frame.f_locals if frame is not None else {}
+        for structure in UPDATER_STRUCTURES[name]:
+            sizes[f"{name}.{structure}"] = len(variables.get(structure, ()))
+    for name, platform in platforms.items():
+        sizes[f"{name}.RESTORE_ATTRIBUTES"] = len(platform.RESTORE_ATTRIBUTES)
+    return sizes
+
+
+async def soak(devices, duration, warm_up, churn, rng):
+    """Run the traffic through the updaters, return the hourly samples and the snapshots.
+
+    A sample is the hour, the traced memory, the sizes of the structures and
+    the number of sensors that were replaced so far.
+    """
+    # the platforms are only imported for this benchmark
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        # pylint: disable=import-outside-toplevel
+        from ble_monitor import binary_sensor, device_tracker, sensor
+
+    loop = asyncio.get_running_loop()
+    # the queues of the updaters are bound to the loop
+    hcidump = create_hcidump(devices)
+    platforms = {"sensor": sensor, "binary": binary_sensor, "tracker": device_tracker}
+    tasks = start_updaters(hcidump)
+    samples = []
+    snapshots = []
+    replaced = 0
+    next_sample = warm_up
+    next_churn = HOUR
+    for timestamp, data in fleet_events(devices, duration, rng):
+        timestamp /= 1e9
+        if timestamp >= next_churn:
+            replace_sensors(devices, churn, rng)
+            replaced += churn
+            next_churn += HOUR
+        if timestamp >= next_sample:
+            # let the updaters process the queued readings and fire their timers
+            await asyncio.sleep(next_sample - loop.time())
+            gc.collect()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            else:
+                samples.append((
+                    next_sample / HOUR,
+                    tracemalloc.get_traced_memory()[0],
+                    structure_sizes(hcidump, tasks, platforms),
+                    replaced,
+                ))
+                if len(samples) == 1:
+                    snapshots.append(tracemalloc.take_snapshot())
+            next_sample += HOUR
+        elif timestamp - loop.time() >= 1:
+            # the updaters take the readings once per (simulated) second
+            await asyncio.sleep(timestamp - loop.time())
+        hcidump.process_hci_events(data)
+    snapshots.append(tracemalloc.take_snapshot())
+    tracemalloc.stop()
+    await stop_updaters(hcidump, tasks)
+    return samples, snapshots
+
+
+def main():
+    """Run the soak."""
+    parser = argparse.ArgumentParser(description="Long-running memory soak")
+    parser.add_argument("--days", type=float, default=1, help="simulated days")
+    parser.add_argument("--warm-up", type=float, default=1, help="simulated hours before the memory is traced")
+    parser.add_argument("--threshold", type=float, default=256, help="allowed memory growth (KiB)")
+    parser.add_argument("--sensors", type=int, default=2, help="number of sensors of every kind")
+    parser.add_argument("--ibeacon", type=int, default=5, help="number of tracked iBeacons")
+    parser.add_argument(
+        "--ibeacon-phone", type=int, default=5, help="number of tracked iBeacon phones with a random address"
+    )
+    parser.add_argument("--phone", type=int, default=10, help="number of phones with a random address")
+    parser.add_argument("--churn", type=int, default=1, help="sensors that are replaced every hour")
+    parser.add_argument(
+        "--sensor-memory", type=float, default=64, help="allowed memory growth per replaced sensor (KiB)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+    args = parser.parse_args()
+    if args.days * 24 <= args.warm_up + 2:
+        sys.exit("The soak needs more than two hours after the warm-up")
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(args.seed)
+    devices = create_devices(args, rng)
+    loop = VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    start = perf_counter()
+    try:
+        samples, snapshots = loop.run_until_complete(
+            soak(devices, args.days * 24 * HOUR, args.warm_up * HOUR, args.churn, rng)
+        )
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    elapsed = perf_counter() - start
+
+    print(f"{len(devices)} devices, {args.days:g} simulated day(s) in {elapsed:.0f} s")
+    for hour, memory, _, replaced in samples:
+        print(f"hour {hour:4.0f}: traced memory {memory / 1024:.1f} KiB, {replaced} sensors replaced")
+    _, first_memory, first, first_replaced = samples[0]
+    _, last_memory, last, last_replaced = samples[-1]
+    replaced = last_replaced - first_replaced
+    print(f"{'structure':28} {'first hour':>10} {'last hour':>10} {'allowed':>10}")
+    grown = []
+    for name, size in first.items():
+        allowed = size + STRUCTURE_GROWTH[name] * replaced
+        print(f"{name:28} {size:10} {last[name]:10} {allowed:10}")
+        if last[name] > allowed:
+            grown.append(name)
+    growth = (last_memory - first_memory) / 1024
+    allowed = args.threshold + args.sensor_memory * replaced
+    print(f"memory growth after the first hour: {growth:.1f} KiB (allowed {allowed:.0f} KiB)")
+    if growth > allowed:
+        print(f"top {TOP_LINES} lines of the memory growth:")
+        for stat in snapshots[-1].compare_to(snapshots[0], "lineno")[:TOP_LINES]:
+            print(f"  {stat}")
+        sys.exit("Memory grows over time")
+    if grown:
+        sys.exit(f"Structures grow over time: {', '.join(grown)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 """Passive BLE monitor integration."""
 import asyncio
+import base64
+import binascii
 import copy
+from functools import partial
 import json
 import logging
-from threading import Thread
+import queue
+from threading import Thread, get_ident
 import voluptuous as vol
 
 import aioblescan as aiobs
@@ -26,7 +30,8 @@ from homeassistant.helpers.entity_registry import (
 )
 from homeassistant.util import dt
 
-from .ble_parser import BleParser
+from .ble_parser import VENDORS, BleParser
+from .ble_parser.capture import CaptureWriter
 from .const import (
     AUTO_BINARY_SENSOR_LIST,
     AUTO_MANUFACTURER_DICT,
@@ -37,18 +42,31 @@ from .const import (
     CONF_BATT_ENTITIES,
     CONF_BT_AUTO_RESTART,
     CONF_BT_INTERFACE,
+    CONF_CAPTURE_FILE,
+    CONF_CAPTURE_MAX_SIZE,
+    CONF_DEADBAND,
     CONF_DECIMALS,
+    CONF_DEVICE_DEADBAND,
     CONF_DEVICE_DECIMALS,
     CONF_DEVICE_ENCRYPTION_KEY,
     CONF_DEVICE_USE_MEDIAN,
     CONF_DEVICE_REPORT_UNKNOWN,
     CONF_DEVICE_RESTORE_STATE,
     CONF_DEVICE_RESET_TIMER,
+    CONF_DEVICE_PERIOD,
+    CONF_DEVICE_MEASUREMENT_PERIODS,
     CONF_DEVICE_TRACK,
     CONF_DEVICE_TRACKER_SCAN_INTERVAL,
     CONF_DEVICE_TRACKER_CONSIDER_HOME,
     CONF_HCI_INTERFACE,
+    CONF_GATEWAY_LISTEN_ADDRESS,
+    CONF_GATEWAY_TCP_PORT,
+    CONF_GATEWAY_UDP_PORT,
+    CONF_HEARTBEAT,
+    CONF_ENCODING,
     CONF_PACKET,
+    CONF_PACKETS,
+    CONF_TIMESTAMP,
     CONF_GATEWAY_ID,
     CONF_PERIOD,
     CONF_LOG_SPIKES,
@@ -56,20 +74,26 @@ from .const import (
     CONF_RESTORE_STATE,
     CONF_USE_MEDIAN,
     CONF_UUID,
+    CONF_VENDORS,
+    CONFIG_DEVICE_INDEX,
     CONFIG_IS_FLOW,
     DEFAULT_ACTIVE_SCAN,
     DEFAULT_BATT_ENTITIES,
+    DEFAULT_CAPTURE_MAX_SIZE,
     DEFAULT_BT_AUTO_RESTART,
     DEFAULT_DECIMALS,
     DEFAULT_DEVICE_DECIMALS,
     DEFAULT_DEVICE_REPORT_UNKNOWN,
     DEFAULT_DEVICE_RESTORE_STATE,
     DEFAULT_DEVICE_RESET_TIMER,
+    DEFAULT_DEVICE_PERIOD,
     DEFAULT_DEVICE_TRACK,
     DEFAULT_DEVICE_TRACKER_SCAN_INTERVAL,
     DEFAULT_DEVICE_TRACKER_CONSIDER_HOME,
     DEFAULT_DEVICE_USE_MEDIAN,
     DEFAULT_DISCOVERY,
+    DEFAULT_GATEWAY_LISTEN_ADDRESS,
+    DEFAULT_HEARTBEAT,
     DEFAULT_LOG_SPIKES,
     DEFAULT_PERIOD,
     DEFAULT_REPORT_UNKNOWN,
@@ -83,6 +107,7 @@ from .const import (
     REPORT_UNKNOWN_LIST,
     SERVICE_CLEANUP_ENTRIES,
     SERVICE_PARSE_DATA,
+    SERVICE_PARSE_DATA_BULK,
 )
 
 from .bt_helpers import (
@@ -92,8 +117,12 @@ from .bt_helpers import (
     reset_bluetooth
 )
 
+from .gateway_listener import GatewayListener
+from .timer_wheel import TimerWheel
 from .helper import (
+    config_validation_deadband,
     config_validation_uuid,
+    device_index,
     identifier_clean,
     dict_get_or,
     dict_get_or_clean,
@@ -103,6 +132,8 @@ _LOGGER = logging.getLogger(__name__)
 
 CONFIG_YAML = {}
 UPDATE_UNLISTENER = None
+# packets (or batches of packets) of other threads that can wait for the HCIdump thread
+INGEST_QUEUE_SIZE = 10000
 
 DEVICE_SCHEMA = vol.Schema(
     {
@@ -125,6 +156,15 @@ DEVICE_SCHEMA = vol.Schema(
         vol.Optional(
             CONF_DEVICE_RESET_TIMER, default=DEFAULT_DEVICE_RESET_TIMER
         ): cv.positive_int,
+        vol.Optional(CONF_DEVICE_PERIOD, default=DEFAULT_DEVICE_PERIOD): vol.Any(
+            vol.In([DEFAULT_DEVICE_PERIOD]), vol.All(cv.positive_int, vol.Range(min=1))
+        ),
+        vol.Optional(CONF_DEVICE_MEASUREMENT_PERIODS): vol.Schema(
+            {cv.string: vol.All(cv.positive_int, vol.Range(min=1))}
+        ),
+        vol.Optional(CONF_DEVICE_DEADBAND): vol.Schema(
+            {cv.string: config_validation_deadband}
+        ),
         vol.Optional(CONF_DEVICE_REPORT_UNKNOWN, default=DEFAULT_DEVICE_REPORT_UNKNOWN): cv.boolean,
         vol.Optional(CONF_DEVICE_TRACK, default=DEFAULT_DEVICE_TRACK): cv.boolean,
         vol.Optional(
@@ -179,6 +219,22 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_REPORT_UNKNOWN, default=DEFAULT_REPORT_UNKNOWN
                     ): vol.In(REPORT_UNKNOWN_LIST),
+                    vol.Optional(CONF_DEADBAND, default={}): vol.Schema(
+                        {cv.string: config_validation_deadband}
+                    ),
+                    vol.Optional(
+                        CONF_HEARTBEAT, default=DEFAULT_HEARTBEAT
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_GATEWAY_LISTEN_ADDRESS, default=DEFAULT_GATEWAY_LISTEN_ADDRESS
+                    ): cv.string,
+                    vol.Optional(CONF_GATEWAY_UDP_PORT): cv.port,
+                    vol.Optional(CONF_GATEWAY_TCP_PORT): cv.port,
+                    vol.Optional(CONF_VENDORS): vol.All(cv.ensure_list, [vol.In(VENDORS)]),
+                    vol.Optional(CONF_CAPTURE_FILE): cv.string,
+                    vol.Optional(
+                        CONF_CAPTURE_MAX_SIZE, default=DEFAULT_CAPTURE_MAX_SIZE
+                    ): cv.positive_int,
                 }
             ),
         )
@@ -193,6 +249,27 @@ SERVICE_PARSE_DATA_SCHEMA = vol.Schema(
         vol.Optional(CONF_GATEWAY_ID): cv.string
     }
 )
+SERVICE_PARSE_DATA_BULK_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PACKETS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Any(
+                    cv.string,
+                    vol.Schema(
+                        {
+                            vol.Required(CONF_PACKET): cv.string,
+                            vol.Optional(CONF_GATEWAY_ID): cv.string,
+                            vol.Optional(CONF_TIMESTAMP): vol.Coerce(float),
+                        }
+                    ),
+                )
+            ],
+        ),
+        vol.Optional(CONF_ENCODING, default="hex"): vol.In(["hex", "base64"]),
+        vol.Optional(CONF_GATEWAY_ID, default=DOMAIN): cv.string,
+    }
+)
 
 
 async def async_setup(hass: HomeAssistant, config):
@@ -208,6 +285,11 @@ async def async_setup(hass: HomeAssistant, config):
 
         await async_parse_data_service(hass, service_data)
 
+    async def service_parse_data_bulk(service_call):
+        service_data = service_call.data
+
+        await async_parse_data_bulk_service(hass, service_data)
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_CLEANUP_ENTRIES,
@@ -220,6 +302,12 @@ async def async_setup(hass: HomeAssistant, config):
         service_parse_data,
         schema=SERVICE_PARSE_DATA_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PARSE_DATA_BULK,
+        service_parse_data_bulk,
+        schema=SERVICE_PARSE_DATA_BULK_SCHEMA,
+    )
 
     if DOMAIN not in config:
         return True
@@ -284,6 +372,24 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     if CONF_DEVICES not in config:
         config[CONF_DEVICES] = []
 
+    # options that can only be set in YAML
+    if CONF_DEADBAND not in config:
+        config[CONF_DEADBAND] = {}
+    if CONF_HEARTBEAT not in config:
+        config[CONF_HEARTBEAT] = DEFAULT_HEARTBEAT
+    if CONF_GATEWAY_LISTEN_ADDRESS not in config:
+        config[CONF_GATEWAY_LISTEN_ADDRESS] = DEFAULT_GATEWAY_LISTEN_ADDRESS
+    if CONF_GATEWAY_UDP_PORT not in config:
+        config[CONF_GATEWAY_UDP_PORT] = None
+    if CONF_GATEWAY_TCP_PORT not in config:
+        config[CONF_GATEWAY_TCP_PORT] = None
+    if CONF_VENDORS not in config:
+        config[CONF_VENDORS] = None
+    if CONF_CAPTURE_FILE not in config:
+        config[CONF_CAPTURE_FILE] = None
+    if CONF_CAPTURE_MAX_SIZE not in config:
+        config[CONF_CAPTURE_MAX_SIZE] = DEFAULT_CAPTURE_MAX_SIZE
+
     if config[CONFIG_IS_FLOW]:
         # Configuration in UI
 
@@ -402,12 +508,16 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
 
     UPDATE_UNLISTENER = config_entry.add_update_listener(_async_update_listener)
 
+    # the device configurations are indexed once for all entities of this config entry,
+    # in a copy of the config, as the config entry keeps a reference to its options
+    config = {**config, CONFIG_DEVICE_INDEX: device_index(config)}
     blemonitor = BLEmonitor(config)
     hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, blemonitor.shutdown_handler)
     blemonitor.start()
 
     hass.data[DOMAIN] = {}
     hass.data[DOMAIN]["blemonitor"] = blemonitor
+    hass.data[DOMAIN]["timer_wheel"] = TimerWheel(hass.loop)
     hass.data[DOMAIN]["config_entry_id"] = config_entry.entry_id
 
     for component in PLATFORMS:
@@ -433,6 +543,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     blemonitor: BLEmonitor = hass.data[DOMAIN]["blemonitor"]
     if blemonitor:
         blemonitor.stop()
+    hass.data[DOMAIN]["timer_wheel"].stop()
 
     return unload_ok
 
@@ -494,16 +605,28 @@ async def async_cleanup_entries_service(hass: HomeAssistant, service_data):
 
 
 async def async_parse_data_service(hass: HomeAssistant, service_data):
-    """Call parse_raw_data with RAW HCI packet data."""
+    """Hand RAW HCI packet data to the HCIdump thread."""
     _LOGGER.debug("async_parse_data_service")
     blemonitor: BLEmonitor = hass.data[DOMAIN]["blemonitor"]
     if blemonitor:
-        blemonitor.dumpthread.process_hci_events(
+        blemonitor.dumpthread.ingest(
             bytes.fromhex(service_data["packet"]),
             service_data[CONF_GATEWAY_ID] if CONF_GATEWAY_ID in service_data else DOMAIN
         )
 
 
+async def async_parse_data_bulk_service(hass: HomeAssistant, service_data):
+    """Hand a batch of RAW HCI packets to the HCIdump thread."""
+    _LOGGER.debug("async_parse_data_bulk_service")
+    blemonitor: BLEmonitor = hass.data[DOMAIN]["blemonitor"]
+    if blemonitor:
+        blemonitor.dumpthread.submit_bulk(
+            service_data[CONF_PACKETS],
+            service_data[CONF_ENCODING],
+            service_data[CONF_GATEWAY_ID],
+        )
+
+
 class BLEmonitor:
     """BLE scanner."""
 
@@ -570,7 +693,12 @@ class HCIdump(Thread):
         self.dataqueue_tracker = dataqueue["tracker"]
         self._event_loop = None
         self._joining = False
+        self.gateway_listener = None
+        self.capture = None
+        self._ingest_queue = queue.Queue(INGEST_QUEUE_SIZE)
+        self._ingest_scheduled = False
         self.evt_cnt = 0
+        self.dropped_cnt = 0
         self.config = config
         self._interfaces = list(set(config[CONF_HCI_INTERFACE]))
         self._active = int(config[CONF_ACTIVE_SCAN] is True)
@@ -652,6 +780,7 @@ class HCIdump(Thread):
             tracker_whitelist=self.tracker_whitelist,
             report_unknown_whitelist=self.report_unknown_whitelist,
             aeskeys=self.aeskeys,
+            vendors=self.config[CONF_VENDORS],
         )
 
     def process_hci_events(self, data, gateway_id=DOMAIN):
@@ -661,7 +790,6 @@ class HCIdump(Thread):
             return
         sensor_msg, tracker_msg = self.ble_parser.parse_raw_data(data)
         if sensor_msg:
-            measurements = list(sensor_msg.keys())
             device_type = sensor_msg["type"]
             if device_type in MANUFACTURER_DICT:
                 sensor_list = (
@@ -674,8 +802,8 @@ class HCIdump(Thread):
             else:
                 return
 
-            measuring = any(x in measurements for x in sensor_list)
-            binary = any(x in measurements for x in binary_list)
+            measuring = any(x in sensor_msg for x in sensor_list)
+            binary = any(x in sensor_msg for x in binary_list)
             if binary == measuring:
                 self.dataqueue_bin.sync_q.put_nowait(sensor_msg)
                 self.dataqueue_meas.sync_q.put_nowait(sensor_msg)
@@ -688,6 +816,131 @@ class HCIdump(Thread):
             tracker_msg[CONF_GATEWAY_ID] = gateway_id
             self.dataqueue_tracker.sync_q.put_nowait(tracker_msg)
 
+    def process_hci_events_bulk(self, packets, encoding="hex", gateway_id=DOMAIN):
+        """Decode a batch of HCI events and parse them in order of their timestamps."""
+        events = []
+        for packet in packets:
+            if isinstance(packet, str):
+                packet = {CONF_PACKET: packet}
+            try:
+                if encoding == "base64":
+                    data = base64.b64decode(packet[CONF_PACKET], validate=True)
+                else:
+                    data = bytes.fromhex(packet[CONF_PACKET])
+            except (ValueError, binascii.Error):
+                _LOGGER.warning("Skipping invalid %s packet %s", encoding, packet[CONF_PACKET])
+                continue
+            events.append(
+                (packet.get(CONF_TIMESTAMP, 0), data, packet.get(CONF_GATEWAY_ID, gateway_id))
+            )
+        # sort is stable, packets with the same timestamp keep their order
+        events.sort(key=lambda event: event[0])
+        for _, data, event_gateway_id in events:
+            self.process_hci_events(data, event_gateway_id)
+        return len(events)
+
+    def ingest(self, data, gateway_id=DOMAIN):
+        """Parse a HCI event in the HCIdump thread.
+
+        This is the entry point for all packet sources. Events of other threads
+        (e.g. the parse_data service in the HA event loop) are put in the ingest
+        queue, as the BleParser state may only be changed by the HCIdump thread.
+        """
+        if get_ident() == self.ident:
+            self.process_hci_events(data, gateway_id)
+        else:
+            self._enqueue(1, self.process_hci_events, data, gateway_id)
+
+    def submit_bulk(self, packets, encoding="hex", gateway_id=DOMAIN):
+        """Hand a batch of HCI events to the HCIdump thread, to keep the parsing off the HA loop."""
+        self._enqueue(len(packets), self.process_hci_events_bulk, packets, encoding, gateway_id)
+
+    def _enqueue(self, packets, callback, *args):
+        """Put a callback in the ingest queue and make sure the queue gets drained.
+
+        When the queue is full (e.g. the HCIdump thread is not running), the
+        callback is dropped and its packets are counted, so the packets don't
+        pile up in memory.
+        """
+        try:
+            self._ingest_queue.put_nowait((callback, args))
+        except queue.Full:
+            self.dropped_cnt += packets
+            return
+        if self._ingest_scheduled:
+            return
+        self._ingest_scheduled = True
+        try:
+            self._event_loop.call_soon_threadsafe(self._drain_ingest_queue)
+        except (AttributeError, RuntimeError) as error:
+            # the HCIdump thread drains the queue when it starts
+            self._ingest_scheduled = False
+            _LOGGER.debug("HCIdump thread is not running: %s", error)
+
+    def _drain_ingest_queue(self):
+        """Process all callbacks in the ingest queue, in the HCIdump thread."""
+        # clear the flag first, callbacks put after this will schedule a new drain
+        self._ingest_scheduled = False
+        ingest_queue = self._ingest_queue
+        while True:
+            try:
+                callback, args = ingest_queue.get_nowait()
+            except queue.Empty:
+                return
+            callback(*args)
+
+    def ingest_adapter(self, hci, data):
+        """Append a HCI event of a local adapter to the capture file and parse it."""
+        if self.capture is not None:
+            try:
+                self.capture.write(data, hci)
+            except OSError as error:
+                # a capture problem should never stop the scanning
+                _LOGGER.error("HCIdump thread: Unable to write the capture file, capture stopped: %s", error)
+                self.stop_capture()
+        self.ingest(data)
+
+    def start_capture(self):
+        """Open the capture file for the HCI events of the local adapters."""
+        if self.config[CONF_CAPTURE_FILE] is None:
+            return
+        try:
+            self.capture = CaptureWriter(
+                self.config[CONF_CAPTURE_FILE],
+                self.config[CONF_CAPTURE_MAX_SIZE] * 1024 * 1024,
+            )
+        except OSError as error:
+            _LOGGER.error("HCIdump thread: Unable to open the capture file: %s", error)
+        else:
+            _LOGGER.info("HCIdump thread: Capturing HCI events to %s", self.config[CONF_CAPTURE_FILE])
+
+    def stop_capture(self):
+        """Close the capture file, the HCI events are no longer captured."""
+        capture = self.capture
+        self.capture = None
+        try:
+            capture.close()
+        except OSError as error:
+            _LOGGER.error("HCIdump thread: Unable to close the capture file: %s", error)
+
+    def start_gateway_listener(self):
+        """Start the UDP and TCP listener for packets of remote gateways."""
+        if self.config[CONF_GATEWAY_UDP_PORT] is None and self.config[CONF_GATEWAY_TCP_PORT] is None:
+            return
+        listener = GatewayListener(
+            self.ingest,
+            self.config[CONF_GATEWAY_LISTEN_ADDRESS],
+            self.config[CONF_GATEWAY_UDP_PORT],
+            self.config[CONF_GATEWAY_TCP_PORT],
+        )
+        try:
+            self._event_loop.run_until_complete(listener.start())
+        except OSError as error:
+            _LOGGER.error("HCIdump thread: Unable to start the gateway listener: %s", error)
+            self._event_loop.run_until_complete(listener.stop())
+        else:
+            self.gateway_listener = listener
+
     def run(self):
         """Run HCIdump thread."""
         while True:
@@ -701,6 +954,8 @@ class HCIdump(Thread):
             initialized_evt = {}
             if self._event_loop is None:
                 self._event_loop = asyncio.new_event_loop()
+                self.start_gateway_listener()
+                self.start_capture()
             asyncio.set_event_loop(self._event_loop)
             if "disable" not in self.config[CONF_BT_INTERFACE]:
                 for hci in self._interfaces:
@@ -736,7 +991,10 @@ class HCIdump(Thread):
                             fac[hci].close()
                             mysocket[hci].close()
                         else:
-                            btctrl[hci].process = self.process_hci_events
+                            if self.capture is None:
+                                btctrl[hci].process = self.ingest
+                            else:
+                                btctrl[hci].process = partial(self.ingest_adapter, hci)
                             _LOGGER.debug("HCIdump thread: connected to hci%i", hci)
                             try:
                                 self._event_loop.run_until_complete(
@@ -774,6 +1032,7 @@ class HCIdump(Thread):
                             reset_bluetooth(iface)
                         self.last_bt_reset = ts_now
             _LOGGER.debug("HCIdump thread: start main event_loop")
+            self._event_loop.call_soon(self._drain_ingest_queue)
             try:
                 self._event_loop.run_forever()
             finally:
@@ -809,8 +1068,27 @@ class HCIdump(Thread):
             if self._joining is True:
                 break
             _LOGGER.debug("HCIdump thread: Scanning will be restarted")
-            _LOGGER.debug("%i HCI events processed for previous period", self.evt_cnt)
+            _LOGGER.debug(
+                "%i HCI events processed, %i packets dropped for previous period",
+                self.evt_cnt,
+                self.dropped_cnt,
+            )
+            if self.gateway_listener is not None:
+                self.gateway_listener.log_counters()
+            if self.capture is not None:
+                try:
+                    self.capture.flush()
+                except OSError as error:
+                    _LOGGER.error("HCIdump thread: Unable to write the capture file, capture stopped: %s", error)
+                    self.stop_capture()
+                else:
+                    _LOGGER.debug("%i HCI events captured", self.capture.events)
             self.evt_cnt = 0
+            self.dropped_cnt = 0
+        if self.gateway_listener is not None:
+            self._event_loop.run_until_complete(self.gateway_listener.stop())
+        if self.capture is not None:
+            self.stop_capture()
         self._event_loop.close()
         _LOGGER.debug("HCIdump thread: Run finished")
 
@@ -16,7 +16,6 @@ from homeassistant.const import (
     STATE_OFF,
     STATE_ON,
 )
-from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt
 
@@ -24,6 +23,7 @@ from .helper import (
     identifier_normalize,
     identifier_clean,
     detect_conf_type,
+    device_config,
     dict_get_or,
     dict_get_or_normalize,
 )
@@ -41,14 +41,15 @@ from .const import (
     MANUFACTURER_DICT,
     MEASUREMENT_DICT,
     RENAMED_MODEL_DICT,
-    BINARY_SENSOR_TYPES,
+    BINARY_SENSOR_KEYS_BY_UNIQUE_ID,
     DOMAIN,
     BLEMonitorBinarySensorEntityDescription,
+    binary_sensor_description,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-RESTORE_ATTRIBUTES = [
+RESTORE_ATTRIBUTES = (
     "rssi",
     "firmware",
     "last_packet_id",
@@ -70,7 +71,10 @@ RESTORE_ATTRIBUTES = [
     "sector_timer",
     "number_of_sectors",
     "weight",
-]
+)
+# besides the common attributes, beacons restore the MAC address and other devices the UUID
+RESTORE_ATTRIBUTES_BEACON = RESTORE_ATTRIBUTES + ("mac_address",)
+RESTORE_ATTRIBUTES_MAC = RESTORE_ATTRIBUTES + ("uuid",)
 
 
 async def async_setup_platform(hass, conf, add_entities, discovery_info=None):
@@ -113,11 +117,11 @@ class BLEupdaterBinary:
                     if key not in sensors_by_key:
                         sensors_by_key[key] = {}
                     if measurement not in sensors_by_key[key]:
-                        description = [item for item in BINARY_SENSOR_TYPES if item.key is measurement][0]
+                        description = binary_sensor_description(measurement)
                         sensors[measurement] = globals()[description.sensor_class](
                             self.config, key, device_model, firmware, description, manufacturer
                         )
-                        self.add_entities([sensors[measurement]])
+                        new_entities.append(sensors[measurement])
                         sensors_by_key[key].update(sensors)
                     else:
                         sensors = sensors_by_key[key]
@@ -127,25 +131,54 @@ class BLEupdaterBinary:
                     sensors = {}
                     sensors_by_key[key] = {}
                     for measurement in device_sensors:
-                        description = [item for item in BINARY_SENSOR_TYPES if item.key is measurement][0]
+                        description = binary_sensor_description(measurement)
                         sensors[measurement] = globals()[description.sensor_class](
                             self.config, key, device_model, firmware, description, manufacturer
                         )
-                        self.add_entities([sensors[measurement]])
+                        new_entities.append(sensors[measurement])
                     sensors_by_key[key] = sensors
                 else:
                     sensors = sensors_by_key[key]
             return sensors
 
+        def retry_hpriority():
+            # update binary sensors that received data before they were ready for an update
+            nonlocal hpriority_timer
+            hpriority_timer = None
+            for entity in hpriority.copy():
+                if entity.pending_update is True:
+                    hpriority.remove(entity)
+                    entity.async_schedule_update_ha_state(True)
+            if hpriority:
+                hpriority_timer = loop.call_later(1, retry_hpriority)
+
+        def period_tick():
+            nonlocal period_timer, ble_adv_cnt
+            period_timer = loop.call_later(self.period, period_tick)
+            _LOGGER.debug(
+                "%i BLE advertisements processed for %i binary sensor device(s)",
+                ble_adv_cnt,
+                len(sensors_by_key),
+            )
+            ble_adv_cnt = 0
+
+        def add_new_entities():
+            # register all entities that were created since the last call at once
+            nonlocal new_entities
+            if new_entities:
+                self.add_entities(new_entities)
+                new_entities = []
+
         _LOGGER.debug("Binary entities updater loop started!")
+        new_entities = []
         sensors_by_key = {}
         sensors = {}
         batt = {}  # batteries
         ble_adv_cnt = 0
         hpriority = []
-        ts_last = dt.now()
-        ts_now = ts_last
-        data = {}
+        loop = hass.loop
+        hpriority_timer = None
+        period_timer = loop.call_later(self.period, period_tick)
         await asyncio.sleep(0)
 
         # Set up binary sensors of configured devices on startup when device model is available in device registry
@@ -172,10 +205,7 @@ class BLEupdaterBinary:
                     # find the measurement key for each entity
                     for entity in entity_list:
                         unique_id_prefix = (entity.unique_id).removesuffix(key)
-                        for binary_sensor_type in BINARY_SENSOR_TYPES:
-                            if binary_sensor_type.unique_id == unique_id_prefix:
-                                binary_sensor_key = binary_sensor_type.key
-                                auto_sensors.add(binary_sensor_key)
+                        auto_sensors.update(BINARY_SENSOR_KEYS_BY_UNIQUE_ID.get(unique_id_prefix, ()))
                     if device_model and firmware and auto_sensors:
                         sensors = await async_add_binary_sensor(
                             key, device_model, firmware, auto_sensors, dev.manufacturer
@@ -187,25 +217,30 @@ class BLEupdaterBinary:
         else:
             sensors = {}
 
+        add_new_entities()
+
         # Set up new binary sensors when first BLE advertisement is received
         sensors = {}
         while True:
+            # wait for the first advertisement and take all others that are already queued
+            advevents = [await self.dataqueue.get()]
             try:
-                advevent = await asyncio.wait_for(self.dataqueue.get(), 1)
-                if advevent is None:
+                while True:
+                    advevents.append(self.dataqueue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+            # the log level is checked once per batch of advertisements
+            debug = _LOGGER.isEnabledFor(logging.DEBUG)
+            for data in advevents:
+                self.dataqueue.task_done()
+                if data is None:
+                    period_timer.cancel()
+                    if hpriority_timer is not None:
+                        hpriority_timer.cancel()
                     _LOGGER.debug("Entities updater loop stopped")
                     return True
-                data = advevent
-                self.dataqueue.task_done()
-            except asyncio.TimeoutError:
-                pass
-            if len(hpriority) > 0:
-                for entity in hpriority:
-                    if entity.pending_update is True:
-                        hpriority.remove(entity)
-                        entity.async_schedule_update_ha_state(True)
-            if data:
-                _LOGGER.debug("Data binary sensor received: %s", data)
+                if debug:
+                    _LOGGER.debug("Data binary sensor received: %s", data)
                 ble_adv_cnt += 1
                 key = identifier_clean(dict_get_or(data))
                 batt_attr = None
@@ -226,7 +261,6 @@ class BLEupdaterBinary:
                 device_sensors = sensors.keys()
 
                 if data["data"] is False:
-                    data = None
                     continue
 
                 # battery attribute
@@ -260,18 +294,13 @@ class BLEupdaterBinary:
                         elif (
                             entity.ready_for_update is False and entity.enabled is True
                         ):
-                            hpriority.append(entity)
-                data = None
-            ts_now = dt.now()
-            if ts_now - ts_last < timedelta(seconds=self.period):
-                continue
-            ts_last = ts_now
-            _LOGGER.debug(
-                "%i BLE advertisements processed for %i binary sensor device(s)",
-                ble_adv_cnt,
-                len(sensors_by_key),
-            )
-            ble_adv_cnt = 0
+                            if entity not in hpriority:
+                                hpriority.append(entity)
+                            if hpriority_timer is None:
+                                hpriority_timer = loop.call_later(1, retry_hpriority)
+            add_new_entities()
+            # give the timers a chance to run when the queue doesn't get empty
+            await asyncio.sleep(0)
 
 
 class BaseBinarySensor(RestoreEntity, BinarySensorEntity):
@@ -349,8 +378,7 @@ class BaseBinarySensor(RestoreEntity, BinarySensorEntity):
         elif old_state.state == STATE_OFF:
             self._state = False
 
-        restore_attr = RESTORE_ATTRIBUTES
-        restore_attr.append('mac_address' if self.is_beacon else 'uuid')
+        restore_attr = RESTORE_ATTRIBUTES_BEACON if self.is_beacon else RESTORE_ATTRIBUTES_MAC
 
         for attr in restore_attr:
             if attr in old_state.attributes:
@@ -401,19 +429,18 @@ class BaseBinarySensor(RestoreEntity, BinarySensorEntity):
             id_selector = CONF_NAME
 
         # overrule settings with device setting if available
-        if self._config[CONF_DEVICES]:
-            for device in self._config[CONF_DEVICES]:
-                if self._fkey.upper() == dict_get_or(device).upper():
-                    if id_selector in device:
-                        # get device name (from YAML config)
-                        dev_name = device[id_selector]
-                    if CONF_DEVICE_RESTORE_STATE in device:
-                        if isinstance(device[CONF_DEVICE_RESTORE_STATE], bool):
-                            dev_restore_state = device[CONF_DEVICE_RESTORE_STATE]
-                        else:
-                            dev_restore_state = self._config[CONF_RESTORE_STATE]
-                    if CONF_DEVICE_RESET_TIMER in device:
-                        dev_reset_timer = device[CONF_DEVICE_RESET_TIMER]
+        device = device_config(self._config, self._key)
+        if device:
+            if id_selector in device:
+                # get device name (from YAML config)
+                dev_name = device[id_selector]
+            if CONF_DEVICE_RESTORE_STATE in device:
+                if isinstance(device[CONF_DEVICE_RESTORE_STATE], bool):
+                    dev_restore_state = device[CONF_DEVICE_RESTORE_STATE]
+                else:
+                    dev_restore_state = self._config[CONF_RESTORE_STATE]
+            if CONF_DEVICE_RESET_TIMER in device:
+                dev_reset_timer = device[CONF_DEVICE_RESET_TIMER]
         device_settings = {
             "name": dev_name,
             "restore_state": dev_restore_state,
@@ -534,7 +561,9 @@ class MotionBinarySensor(BaseBinarySensor):
                     self._state = False
                 else:
                     self._state = True
-                    async_call_later(self.hass, self._reset_timer, self.reset_state)
+                    self.hass.data[DOMAIN]["timer_wheel"].schedule(
+                        self, self._reset_timer, self.reset_state
+                    )
             except (KeyError, ValueError):
                 self._state = self._newstate
         else:
@@ -0,0 +1,291 @@
+"""Command line interface of the BLE parser.
+
+Parses HCI events of files (or stdin) and writes the readings as NDJSON. The
+input format is detected per file:
+
+- capture files of HCIdump (option capture_file)
+- btsnoop captures (e.g. btmon -w)
+- text with one HCI event per line in hex (like the data_string of the tests)
+
+Encryption keys, whitelists and other options of the parser are read from a
+JSON file, e.g. {"aeskeys": {"A4:C1:38:11:22:33": "<key>"}, "vendors": ["atc"]}.
+With --workers N the events are parsed by N processes, every process parses
+the events of its own MAC addresses, so the readings of one device stay in
+order (the readings of different devices are not).
+
+Usage: python -m ble_parser [file ...] [--config FILE] [--output FILE] [--workers N]
+(run from custom_components/ble_monitor)
+"""
+import argparse
+from collections import Counter
+import io
+import json
+import logging
+import multiprocessing
+import queue
+import sys
+import threading
+from time import perf_counter
+import zlib
+
+from . import BleParser
+from .btsnoop import BTSNOOP_MAGIC, read_btsnoop
+from .capture import CAPTURE_MAGIC, read_capture, read_capture_stream
+from .export import write_ndjson
+from .helpers import HexDump
+
+_LOGGER = logging.getLogger(__name__)
+
+# events that are sent to a worker at once
+BATCH_SIZE = 1000
+# batches that can be queued for a worker
+QUEUED_BATCHES = 4
+# seconds between the checks of the worker processes, while waiting for a queue
+WORKER_TIMEOUT = 1
+PARSER_OPTIONS = ("report_unknown", "discovery", "filter_duplicates", "vendors")
+
+
+def identifier(value):
+    """Return a MAC address or UUID as bytes."""
+    return bytes.fromhex(value.replace(":", "").replace("-", ""))
+
+
+def load_config(path):
+    """Return the keyword arguments of BleParser of a JSON file."""
+    if path is None:
+        return {}
+    with open(path, encoding="utf-8") as config_file:
+        config = json.load(config_file)
+    options = {key: config[key] for key in PARSER_OPTIONS if key in config}
+    options["aeskeys"] = {
+        identifier(mac): bytes.fromhex(key) for mac, key in config.get("aeskeys", {}).items()
+    }
+    for whitelist in ("sensor_whitelist", "tracker_whitelist", "report_unknown_whitelist"):
+        if whitelist in config:
+            options[whitelist] = [identifier(value) for value in config[whitelist]]
+    return options
+
+
+def read_hex_lines(stream):
+    """Yield the HCI events of a stream with one HCI event in hex per line."""
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith(b"#"):
+            continue
+        try:
+            data = bytes.fromhex(line.decode("ascii"))
+        except ValueError:
+            _LOGGER.warning("Skipping invalid hex line %s", line[:80])
+            continue
+        yield None, 0, data
+
+
+def read_events(path):
+    """Yield the (timestamp, adapter, HCI event) of a file, - is stdin."""
+    if path == "-":
+        stream = sys.stdin.buffer
+    else:
+        stream = open(path, "rb")  # pylint: disable=consider-using-with
+    try:
+        magic = stream.peek(len(CAPTURE_MAGIC))[:len(CAPTURE_MAGIC)]
+        if magic == CAPTURE_MAGIC:
+            # capture files are memory mapped, stdin is read as stream
+            records = read_capture_stream(stream) if stream is sys.stdin.buffer else read_capture(path)
+            # the timestamps of captures are nanoseconds of the monotonic clock
+            for timestamp, adapter, data in records:
+                yield timestamp / 1e9, adapter, data
+        elif magic == BTSNOOP_MAGIC:
+            yield from read_btsnoop(stream)
+        else:
+            yield from read_hex_lines(stream)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+
+def parse_events(events, ble_parser, stats):
+    """Yield the (timestamp, adapter, sensor data, tracker data) of the events with a reading.
+
+    Events that can't be parsed are logged and counted as skipped in stats.
+    """
+    parse_raw_data = ble_parser.parse_raw_data
+    for timestamp, adapter, data in events:
+        if len(data) < 12:
+            continue
+        try:
+            sensor_data, tracker_data = parse_raw_data(data)
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning("Skipping HCI event %s: %r", HexDump(data), error)
+            stats["skipped"] += 1
+            continue
+        if sensor_data or tracker_data:
+            yield timestamp, adapter, sensor_data, tracker_data
+
+
+def shard(data, workers):
+    """Return the worker of an HCI event, based on the MAC address."""
+    if len(data) < 14:
+        return 0
+    mac = data[8:14] if data[3] == 0x0D else data[7:13]
+    return zlib.crc32(mac) % workers
+
+
+def worker(index, options, inbox, outbox):
+    """Parse the batches of events of a worker, and return the readings as NDJSON."""
+    try:
+        ble_parser = BleParser(**options)
+        while True:
+            batch = inbox.get()
+            if batch is None:
+                break
+            stats = Counter()
+            output = io.StringIO()
+            lines = write_ndjson(parse_events(batch, ble_parser, stats), output)
+            outbox.put((index, (len(batch), lines, stats["skipped"], output.getvalue())))
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.exception("Worker %i stopped", index)
+        # the exit code tells run_workers that the worker failed
+        sys.exit(1)
+    finally:
+        outbox.put((index, None))
+
+
+def send(inbox, batch, process):
+    """Queue a batch for a worker, return False when the worker has stopped."""
+    while True:
+        try:
+            inbox.put(batch, timeout=WORKER_TIMEOUT)
+            return True
+        except queue.Full:
+            if not process.is_alive():
+                return False
+
+
+def run_workers(events, options, output, workers):
+    """Parse the events in worker processes.
+
+    Returns the number of events, readings and skipped events, and the number
+    of workers that failed. The events that were not parsed by a failed worker
+    are counted as skipped.
+    """
+    outbox = multiprocessing.Queue()
+    inboxes = [multiprocessing.Queue(QUEUED_BATCHES) for _ in range(workers)]
+    processes = [
+        multiprocessing.Process(target=worker, args=(index, options, inbox, outbox), daemon=True)
+        for index, inbox in enumerate(inboxes)
+    ]
+    for process in processes:
+        process.start()
+    totals = Counter()
+
+    def write_output():
+        running = set(range(workers))
+        exited = set()
+        while running:
+            try:
+                index, result = outbox.get(timeout=WORKER_TIMEOUT)
+            except queue.Empty:
+                # workers that had exited at the previous timeout without their
+                # last message have crashed (the queue is flushed at the exit)
+                for index in exited & running:
+                    _LOGGER.error("Worker %i exited with code %s", index, processes[index].exitcode)
+                    running.discard(index)
+                exited = {index for index in running if processes[index].exitcode is not None}
+                continue
+            if result is None:
+                running.discard(index)
+                continue
+            count, lines, skipped, text = result
+            totals["events"] += count
+            totals["readings"] += lines
+            totals["skipped"] += skipped
+            output.write(text)
+
+    writer = threading.Thread(target=write_output)
+    writer.start()
+    batches = [[] for _ in range(workers)]
+    stopped = [False] * workers
+    count = 0
+    for event in events:
+        count += 1
+        index = shard(event[2], workers)
+        batch = batches[index]
+        batch.append(event)
+        if len(batch) == BATCH_SIZE:
+            if not stopped[index]:
+                stopped[index] = not send(inboxes[index], batch, processes[index])
+            batches[index] = []
+    for index, batch in enumerate(batches):
+        if batch and not stopped[index]:
+            stopped[index] = not send(inboxes[index], batch, processes[index])
+        if not stopped[index]:
+            send(inboxes[index], None, processes[index])
+    writer.join()
+    for process in processes:
+        process.join()
+    failed = 0
+    for inbox, process in zip(inboxes, processes):
+        if process.exitcode != 0:
+            failed += 1
+            # don't wait at the exit for batches that no worker reads
+            inbox.cancel_join_thread()
+    skipped = totals["skipped"] + count - totals["events"]
+    return count, totals["readings"], skipped, failed
+
+
+class CountingEvents:
+    """Iterator over the events that counts the events."""
+
+    def __init__(self, events):
+        """Initialize the iterator."""
+        self._events = events
+        self.count = 0
+
+    def __iter__(self):
+        """Yield the events."""
+        for event in self._events:
+            self.count += 1
+            yield event
+
+
+def main(argv=None):
+    """Run the command line interface."""
+    parser = argparse.ArgumentParser(prog="python -m ble_parser", description="Parse BLE advertisements")
+    parser.add_argument("files", nargs="*", default=["-"], help="input files (default stdin)")
+    parser.add_argument("--config", metavar="FILE", help="JSON file with encryption keys and options")
+    parser.add_argument("--output", metavar="FILE", help="NDJSON output file (default stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="number of parser processes")
+    parser.add_argument("--verbose", action="store_true", help="log debug messages")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    options = load_config(args.config)
+    events = (event for path in args.files for event in read_events(path))
+    if args.output:
+        output = open(args.output, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+    else:
+        output = sys.stdout
+    start = perf_counter()
+    try:
+        if args.workers > 1:
+            count, lines, skipped, failed = run_workers(events, options, output, args.workers)
+        else:
+            counter = CountingEvents(events)
+            stats = Counter()
+            lines = write_ndjson(parse_events(counter, BleParser(**options), stats), output)
+            count, skipped, failed = counter.count, stats["skipped"], 0
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = perf_counter() - start
+    print(
+        f"{count} events, {lines} readings, {skipped} skipped in {elapsed:.2f} s "
+        f"({count / max(elapsed, 1e-9):.0f} events/s)",
+        file=sys.stderr,
+    )
+    if failed:
+        sys.exit(f"{failed} worker(s) stopped, their remaining events were skipped")
+
+
+if __name__ == "__main__":
+    main()
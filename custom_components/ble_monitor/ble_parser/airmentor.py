@@ -4,6 +4,7 @@ from struct import unpack
 import math
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -63,7 +64,7 @@ def parse_airmentor(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN Air Mentor DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
@@ -2,6 +2,7 @@
 import logging
 from struct import unpack
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -54,7 +55,7 @@ def parse_almendo(self, data, source_mac, rssi):
                 "MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex(),
+                HexDump(data),
             )
         return None
     # check for MAC presence in sensor whitelist, if needed
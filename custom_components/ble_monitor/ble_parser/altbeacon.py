@@ -21,9 +21,11 @@ from .const import (
     DEFAULT_MANUFACTURER,
 )
 from .helpers import (
+    HexDump,
     to_mac,
     to_uuid,
     to_unformatted_mac,
+    to_unformatted_uuid,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,7 +42,7 @@ def parse_altbeacon(self, data: str, comp_id: int, source_mac: str, rssi: float)
         tracker_data = {
             CONF_RSSI: rssi,
             CONF_MAC: to_unformatted_mac(source_mac),
-            CONF_UUID: to_uuid(uuid).replace('-', ''),
+            CONF_UUID: to_unformatted_uuid(uuid),
             CONF_TRACKER_ID: uuid,
             CONF_MAJOR: major,
             CONF_MINOR: minor,
@@ -63,7 +65,7 @@ def parse_altbeacon(self, data: str, comp_id: int, source_mac: str, rssi: float)
                 DEVICE_TYPE,
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None, None
 
@@ -1,9 +1,10 @@
 """Parser for ATC BLE advertisements"""
 import logging
 from struct import unpack
-from Cryptodome.Cipher import AES
 
 from .helpers import (
+    HexDump,
+    aes_ccm,
     to_mac,
     to_unformatted_mac,
 )
@@ -102,7 +103,7 @@ def parse_atc(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN ATC DEVICE: RSSI: %s, MAC: %s, AdStruct: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
@@ -161,16 +162,16 @@ def decrypt_atc(self, data, atc_mac):
     cipherpayload = data[5:-4]
     aad = b"\x11"
     token = data[-4:]
-    cipher = AES.new(key, AES.MODE_CCM, nonce=nonce, mac_len=4)
+    cipher = aes_ccm(key, nonce)
     cipher.update(aad)
     # decrypt the data
     try:
         decrypted_payload = cipher.decrypt_and_verify(cipherpayload, token)
     except ValueError as error:
         _LOGGER.warning("Decryption failed: %s", error)
-        _LOGGER.debug("token: %s", token.hex())
-        _LOGGER.debug("nonce: %s", nonce.hex())
-        _LOGGER.debug("encrypted_payload: %s", cipherpayload.hex())
+        _LOGGER.debug("token: %s", HexDump(token))
+        _LOGGER.debug("nonce: %s", HexDump(nonce))
+        _LOGGER.debug("encrypted_payload: %s", HexDump(cipherpayload))
         return None
     if decrypted_payload is None:
         _LOGGER.warning(
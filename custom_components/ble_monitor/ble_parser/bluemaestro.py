@@ -1,8 +1,9 @@
 """Parser for BlueMaestro BLE advertisements."""
 import logging
-from struct import unpack
 
+from .decoder_spec import DecoderSpec, compile_specs, find_spec
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -10,44 +11,58 @@ from .helpers import (
 _LOGGER = logging.getLogger(__name__)
 
 
+# Decoder specs on (message length, device id), the log count is used as packet id
+BLUEMAESTRO_SPECS = compile_specs((
+    # BlueMaestro Tempo Disc THD
+    DecoderSpec(
+        (18, 0x17),
+        "Tempo Disc THD",
+        "!BhhhHhH",
+        5,
+        (
+            ("battery", None),
+            (None, None),
+            ("packet", None),
+            ("temperature", 10),
+            ("humidity", 10),
+            ("dewpoint", 10),
+            (None, None),
+        ),
+    ),
+    # BlueMaestro Tempo Disc THPD (sends P instead of D, no D is send)
+    DecoderSpec(
+        (18, 0x1b),
+        "Tempo Disc THPD",
+        "!BhhhHhH",
+        5,
+        (
+            ("battery", None),
+            (None, None),
+            ("packet", None),
+            ("temperature", 10),
+            ("humidity", 10),
+            ("pressure", 10),
+            (None, None),
+        ),
+    ),
+))
+
+
 def parse_bluemaestro(self, data, source_mac, rssi):
     """Parse BlueMaestro advertisement."""
-    msg_length = len(data)
     firmware = "BlueMaestro"
-    device_id = data[4]
     bluemaestro_mac = source_mac
-    msg = data[5:]
-    if msg_length == 18 and device_id == 0x17:
-        # BlueMaestro Tempo Disc THD
-        device_type = "Tempo Disc THD"
-        # pylint: disable=unused-variable
-        (batt, time_interval, log_cnt, temp, humi, dew_point, mode) = unpack("!BhhhHhH", msg)
-        result = {
-            "temperature": temp / 10,
-            "humidity": humi / 10,
-            "battery": batt,
-            "dewpoint": dew_point / 10
-        }
-    elif msg_length == 18 and device_id == 0x1b:
-        # BlueMaestro Tempo Disc THPD (sends P instead of D, no D is send)
-        device_type = "Tempo Disc THPD"
-        # pylint: disable=unused-variable
-        (batt, time_interval, log_cnt, temp, humi, press, mode) = unpack("!BhhhHhH", msg)
-        result = {
-            "temperature": temp / 10,
-            "humidity": humi / 10,
-            "battery": batt,
-            "pressure": press / 10
-        }
-    else:
+    spec = find_spec(BLUEMAESTRO_SPECS, len(data), data[4])
+    if spec is None:
         if self.report_unknown == "BlueMaestro":
             _LOGGER.info(
                 "BLE ADV from UNKNOWN BlueMaestro DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
+    device_type, result = spec.decode(data)
 
     # check for MAC presence in whitelist, if needed
     if self.discovery is False and bluemaestro_mac not in self.sensor_whitelist:
@@ -58,7 +73,6 @@ def parse_bluemaestro(self, data, source_mac, rssi):
         "rssi": rssi,
         "mac": to_unformatted_mac(bluemaestro_mac),
         "type": device_type,
-        "packet": log_cnt,
         "firmware": firmware,
         "data": True
     })
@@ -3,6 +3,7 @@ import logging
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -45,7 +46,7 @@ def parse_bparasite(self, data, source_mac, rssi):
                 rssi,
                 to_mac(source_mac),
                 msg_length,
-                data.hex()
+                HexDump(data)
             )
         return None
 
@@ -1,8 +1,9 @@
 """Parser for Brifit BLE advertisements"""
 import logging
-from struct import unpack
 
+from .decoder_spec import DecoderSpec, compile_specs, find_spec
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -10,39 +11,38 @@ from .helpers import (
 _LOGGER = logging.getLogger(__name__)
 
 
+# Decoder specs on message length, the device type is selected by the device id
+BRIFIT_SPECS = compile_specs((
+    DecoderSpec(
+        (21, None),
+        (2, {0x55: "T201"}),
+        ">hHHB",
+        12,
+        (("voltage", 100), ("temperature", 100), ("humidity", 100), ("battery", None)),
+    ),
+))
+
+
 def parse_brifit(self, data, source_mac, rssi):
     """Parser for Brifit sensors"""
-    msg_length = len(data)
-    if msg_length == 21:
-        device_id = data[2]
-        if device_id == 0x55:
-            device_type = "T201"
-        else:
-            device_type = None
-        firmware = "Brifit"
-
-        brifit_mac = data[6:12]
-        xvalue = data[12:19]
-        (volt, temp, humi, batt) = unpack(">hHHB", xvalue)
-        result = {
-            "temperature": temp / 100,
-            "humidity": humi / 100,
-            "voltage": volt / 100,
-            "battery": batt
-        }
-    else:
+    firmware = "Brifit"
+    spec = find_spec(BRIFIT_SPECS, len(data))
+    if spec is None:
         device_type = None
+    else:
+        device_type, result = spec.decode(data)
     if device_type is None:
         if self.report_unknown == "Brifit":
             _LOGGER.info(
                 "BLE ADV from UNKNOWN Brifit DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
     # check for MAC presence in message and in service data
+    brifit_mac = data[6:12]
     if brifit_mac != source_mac:
         _LOGGER.debug("Invalid MAC address for Brifit device")
         return None
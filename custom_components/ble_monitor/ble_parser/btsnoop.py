@@ -0,0 +1,95 @@
+"""Reader for btsnoop capture files (e.g. written by btmon -w or Android).
+
+The capture is read record by record from a (binary) stream, so captures of
+any size are parsed in constant memory. Only LE advertising report events
+(legacy and extended) are returned, in the raw HCI event layout of
+BleParser.parse_raw_data.
+"""
+import struct
+
+BTSNOOP_MAGIC = b"btsnoop\x00"
+FILE_HEADER = struct.Struct(">8sII")
+RECORD_HEADER = struct.Struct(">IIIIq")
+
+# datalink types
+DATALINK_H1 = 1001  # HCI packets without packet type, the flags tell command/event
+DATALINK_H4 = 1002  # HCI UART, the packet type is the first byte of the packet
+DATALINK_MONITOR = 2001  # btmon, the flags hold the adapter index and the opcode
+
+# flags of a received command/event packet (H1)
+H1_EVENT_FLAGS = 0x03
+# opcode of an event packet (btmon)
+MONITOR_EVENT_PACKET = 0x03
+# HCI packet type of an event
+HCI_EVENT = 0x04
+HCI_LE_META_EVENT = 0x3E
+LE_ADVERTISING_REPORTS = (0x02, 0x0D)
+# microseconds between 0000-01-01 and 1970-01-01
+BTSNOOP_EPOCH_DELTA = 0x00DCDDB30F2F8000
+
+
+class BtsnoopFormatError(ValueError):
+    """Invalid btsnoop file."""
+
+
+def read_btsnoop(stream):
+    """Yield the (timestamp, adapter, HCI event) of the LE advertising reports in a btsnoop stream.
+
+    The timestamp is a UNIX timestamp in seconds. The adapter is the adapter
+    index of btmon captures, 0 for other captures. Truncated packets and a
+    truncated last record are skipped.
+    """
+    header = stream.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise BtsnoopFormatError("File is too short for a btsnoop header")
+    magic, _, datalink = FILE_HEADER.unpack(header)
+    if magic != BTSNOOP_MAGIC:
+        raise BtsnoopFormatError("Not a btsnoop file")
+    if datalink not in (DATALINK_H1, DATALINK_H4, DATALINK_MONITOR):
+        raise BtsnoopFormatError(f"Unsupported btsnoop datalink type {datalink}")
+
+    read = stream.read
+    unpack = RECORD_HEADER.unpack
+    header_size = RECORD_HEADER.size
+    h4 = datalink == DATALINK_H4
+    # the LE meta event code and subevent are at these positions of the packet
+    event_code, subevent = (1, 3) if h4 else (0, 2)
+    while True:
+        header = read(header_size)
+        if len(header) < header_size:
+            return
+        original_length, included_length, flags, _, timestamp = unpack(header)
+        packet = read(included_length)
+        if len(packet) < included_length:
+            return
+        if included_length < original_length or included_length <= subevent:
+            continue
+        if datalink == DATALINK_MONITOR:
+            if flags & 0xFFFF != MONITOR_EVENT_PACKET:
+                continue
+            adapter = flags >> 16
+        elif h4:
+            if packet[0] != HCI_EVENT:
+                continue
+            adapter = 0
+        else:
+            if flags & H1_EVENT_FLAGS != H1_EVENT_FLAGS:
+                continue
+            adapter = 0
+        if packet[event_code] != HCI_LE_META_EVENT or packet[subevent] not in LE_ADVERTISING_REPORTS:
+            continue
+        timestamp = (timestamp - BTSNOOP_EPOCH_DELTA) / 1e6
+        yield timestamp, adapter, packet if h4 else b"\x04" + packet
+
+
+def parse_btsnoop(stream, ble_parser):
+    """Yield the (timestamp, adapter, sensor data, tracker data) of the advertisements in a btsnoop stream.
+
+    Only advertisements that are parsed into sensor and/or tracker data are
+    returned.
+    """
+    parse_raw_data = ble_parser.parse_raw_data
+    for timestamp, adapter, data in read_btsnoop(stream):
+        sensor_data, tracker_data = parse_raw_data(data)
+        if sensor_data or tracker_data:
+            yield timestamp, adapter, sensor_data, tracker_data
@@ -0,0 +1,167 @@
+"""Capture files of raw HCI events.
+
+A capture file starts with the 8 byte CAPTURE_MAGIC, followed by records of
+a 2 byte (little endian) length of the HCI event, the index of the adapter
+(1 byte), the monotonic timestamp in nanoseconds (8 bytes) and the raw HCI
+event. Capture files are written by HCIdump (option capture_file) and can be
+replayed without Bluetooth hardware.
+"""
+import logging
+import mmap
+import os
+import struct
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"BLEMCAP\x01"
+RECORD_HEADER = struct.Struct("<HBQ")
+MAX_EVENT_LENGTH = 0xFFFF
+
+
+class CaptureFormatError(ValueError):
+    """Invalid capture file."""
+
+
+class CaptureWriter:
+    """Append HCI events to a capture file, with size based rotation.
+
+    When the file exceeds max_size bytes, it is renamed to <path>.1 (older
+    files to <path>.2 etc., up to backup_count files) and a new file is
+    started. A max_size of 0 disables the rotation.
+    """
+
+    def __init__(self, path, max_size=0, backup_count=5):
+        """Open the capture file, existing captures are appended."""
+        self.path = path
+        self.max_size = max_size
+        self.backup_count = backup_count
+        self.events = 0
+        self._file = None
+        self._size = 0
+        self._open()
+
+    def _open(self):
+        """Open the capture file and write the magic in a new file."""
+        self._file = open(self.path, "ab")  # pylint: disable=consider-using-with
+        self._size = self._file.tell()
+        if self._size == 0:
+            self._file.write(CAPTURE_MAGIC)
+            self._size = len(CAPTURE_MAGIC)
+
+    def write(self, data, adapter=0, timestamp=None):
+        """Append a HCI event, the timestamp defaults to time.monotonic_ns()."""
+        if len(data) > MAX_EVENT_LENGTH:
+            raise CaptureFormatError("HCI event is too long")
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        self._file.write(RECORD_HEADER.pack(len(data), adapter, timestamp))
+        self._file.write(data)
+        self._size += RECORD_HEADER.size + len(data)
+        self.events += 1
+        if self.max_size and self._size >= self.max_size:
+            self.rotate()
+
+    def rotate(self):
+        """Move the capture file to the first backup and start a new file."""
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                backup = f"{self.path}.{index}"
+                if os.path.exists(backup):
+                    os.replace(backup, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def flush(self):
+        """Write the buffered events to the capture file."""
+        self._file.flush()
+
+    def close(self):
+        """Close the capture file."""
+        self._file.close()
+
+
+def capture_files(path):
+    """Return the capture file and its backups, oldest first."""
+    files = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.insert(0, f"{path}.{index}")
+        index += 1
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_capture(path):
+    """Yield the (timestamp, adapter, HCI event) records of a capture file.
+
+    The file is memory mapped, so only the records that are read are loaded.
+    A truncated last record (e.g. of a capture that was not closed) is skipped.
+    """
+    with open(path, "rb") as capture_file:
+        if os.fstat(capture_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(capture_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if buffer[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+                raise CaptureFormatError(f"{path} is not a capture file")
+            unpack = RECORD_HEADER.unpack_from
+            header_size = RECORD_HEADER.size
+            size = len(buffer)
+            offset = len(CAPTURE_MAGIC)
+            while size - offset >= header_size:
+                length, adapter, timestamp = unpack(buffer, offset)
+                start = offset + header_size
+                offset = start + length
+                if offset > size:
+                    _LOGGER.debug("Truncated record at the end of %s", path)
+                    return
+                yield timestamp, adapter, buffer[start:offset]
+
+
+def read_capture_stream(stream):
+    """Yield the (timestamp, adapter, HCI event) records of a capture that is read from a stream (e.g. stdin)."""
+    if stream.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+        raise CaptureFormatError("Stream is not a capture file")
+    read = stream.read
+    unpack = RECORD_HEADER.unpack
+    header_size = RECORD_HEADER.size
+    while True:
+        header = read(header_size)
+        if len(header) < header_size:
+            return
+        length, adapter, timestamp = unpack(header)
+        data = read(length)
+        if len(data) < length:
+            _LOGGER.debug("Truncated record at the end of the stream")
+            return
+        yield timestamp, adapter, data
+
+
+def replay(paths, process, speed=None):
+    """Replay capture files, process(data) is called for every HCI event.
+
+    With speed None (or 0) the events are replayed as fast as possible,
+    otherwise the time between the events is the captured time divided by the
+    speed (1 is real-time). The timestamps of the monotonic clock restart when
+    the captured system restarts, the replay then continues from the first
+    event after the restart. Returns the number of replayed events.
+    """
+    events = 0
+    first = start = previous = None
+    for path in paths:
+        for timestamp, _, data in read_capture(path):
+            if speed:
+                if first is None or timestamp < previous:
+                    first = timestamp
+                    start = time.monotonic_ns()
+                previous = timestamp
+                delay = (timestamp - first) / speed - (time.monotonic_ns() - start)
+                if delay > 0:
+                    time.sleep(delay / 1e9)
+            process(data)
+            events += 1
+    return events
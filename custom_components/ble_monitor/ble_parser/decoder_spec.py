@@ -0,0 +1,102 @@
+"""Declarative decoders for advertisements with a fixed layout.
+
+A decoder spec describes one device variant of a vendor:
+
+- key: (length of the advertisement, discriminator). The discriminator is a
+  value that the vendor parser reads from the advertisement (e.g. the device
+  id), a key with discriminator None matches every discriminator.
+- device type, or (offset, {byte value: device type}) when the device type is
+  selected by one byte of the advertisement
+- struct format and offset of the values in the advertisement
+- fields: (measurement, conversion) for every value of the struct. The
+  conversion is a divisor, a function or None to keep the value as it is.
+  Values without measurement name are skipped.
+- post: optional hook(measurements, values) for measurements that are
+  calculated from more than one value (or that need the raw value)
+
+The specs of a vendor are compiled into a lookup table, so an advertisement
+is decoded with one dict lookup and one unpack.
+"""
+import struct
+
+
+def decoder(device_type, obj_struct, offset, fields, post):
+    """Return a function that decodes an advertisement into (device type, measurements)."""
+    unpack = obj_struct.unpack_from
+    plain = tuple(
+        (index, name) for index, (name, conversion) in enumerate(fields)
+        if name is not None and conversion is None
+    )
+    divided = tuple(
+        (index, name, conversion) for index, (name, conversion) in enumerate(fields)
+        if name is not None and isinstance(conversion, (int, float))
+    )
+    converted = tuple(
+        (index, name, conversion) for index, (name, conversion) in enumerate(fields)
+        if name is not None and callable(conversion)
+    )
+
+    if isinstance(device_type, tuple):
+        variant_offset, device_types = device_type
+    else:
+        variant_offset = device_types = None
+
+    def decode(data):
+        if device_types is None:
+            variant = device_type
+        else:
+            variant = device_types.get(data[variant_offset])
+            if variant is None:
+                return None, None
+        values = unpack(data, offset)
+        result = {}
+        for index, name in plain:
+            result[name] = values[index]
+        for index, name, divisor in divided:
+            result[name] = values[index] / divisor
+        for index, name, convert in converted:
+            result[name] = convert(values[index])
+        if post is not None:
+            post(result, values)
+        return variant, result
+    return decode
+
+
+class DecoderSpec:
+    """Decoder of a device variant with a fixed layout."""
+
+    __slots__ = ("key", "offset", "size", "decode")
+
+    def __init__(self, key, device_type, fmt, offset, fields, post=None):
+        """Initialize the decoder spec.
+
+        decode(data) returns the device type and the measurements of an
+        advertisement, the device type is None for an unknown variant.
+        """
+        obj_struct = struct.Struct(fmt)
+        if len(obj_struct.unpack(bytes(obj_struct.size))) != len(fields):
+            raise ValueError(f"Decoder spec {key} has {len(fields)} fields for struct {fmt}")
+        self.key = key
+        self.offset = offset
+        self.size = obj_struct.size
+        self.decode = decoder(device_type, obj_struct, offset, fields, post)
+
+
+def compile_specs(specs):
+    """Compile decoder specs into a lookup table {(length, discriminator): spec}."""
+    table = {}
+    for spec in specs:
+        if spec.key in table:
+            raise ValueError(f"Duplicate decoder spec {spec.key}")
+        if spec.offset + spec.size > spec.key[0]:
+            raise ValueError(f"Decoder spec {spec.key} doesn't fit in the advertisement")
+        table[spec.key] = spec
+    return table
+
+
+def find_spec(table, length, discriminator=None):
+    """Return the decoder spec of an advertisement, or None if there is no spec."""
+    spec = table.get((length, discriminator))
+    if spec is None and discriminator is not None:
+        spec = table.get((length, None))
+    return spec
@@ -0,0 +1,78 @@
+"""Export of parsed advertisements as NDJSON or CSV.
+
+The exporters take an iterable of (timestamp, adapter, sensor data, tracker
+data) tuples, like the btsnoop reader returns, and write every row as soon as
+it is parsed, so the memory use doesn't grow with the size of the input.
+"""
+import csv
+import json
+
+from .const import CONF_DATA, CONF_FIRMWARE, CONF_MAC, CONF_PACKET, CONF_RSSI, CONF_TYPE
+
+CSV_COLUMNS = ("timestamp", "adapter", "kind", "mac", "type", "rssi", "measurement", "value")
+# fields that are in every row of the CSV, or that are not exported as measurement
+NO_MEASUREMENT = frozenset((CONF_MAC, CONF_TYPE, CONF_RSSI, CONF_PACKET, CONF_FIRMWARE, CONF_DATA))
+# fields of the envelope of a NDJSON record
+ENVELOPE = frozenset(("timestamp", "adapter", "kind"))
+# measurements with the name of a field of the envelope, e.g. the time of a lock event,
+# are exported with another name in NDJSON
+RENAMED_MEASUREMENTS = {"timestamp": "lock timestamp"}
+
+
+def json_default(value):
+    """Return bytes (e.g. tracker ids) as hex string."""
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return str(value)
+
+
+def messages(readings):
+    """Yield (timestamp, adapter, kind, data) for the sensor and tracker data of the readings."""
+    for timestamp, adapter, sensor_data, tracker_data in readings:
+        if sensor_data:
+            yield timestamp, adapter, "sensor", sensor_data
+        if tracker_data:
+            yield timestamp, adapter, "tracker", tracker_data
+
+
+def write_ndjson(readings, stream):
+    """Write the readings as one JSON object per line, return the number of lines."""
+    dumps = json.JSONEncoder(default=json_default, separators=(",", ":")).encode
+    write = stream.write
+    lines = 0
+    for timestamp, adapter, kind, data in messages(readings):
+        record = {"timestamp": timestamp, "adapter": adapter, "kind": kind}
+        if ENVELOPE.isdisjoint(data):
+            record.update(data)
+        else:
+            record.update(
+                (RENAMED_MEASUREMENTS.get(key, f"{key} measurement") if key in ENVELOPE else key, value)
+                for key, value in data.items()
+            )
+        write(dumps(record))
+        write("\n")
+        lines += 1
+    return lines
+
+
+def write_csv(readings, stream):
+    """Write the readings as CSV with one row per measurement, return the number of rows.
+
+    Tracker data without measurements is written as one row without
+    measurement.
+    """
+    writer = csv.writer(stream)
+    writer.writerow(CSV_COLUMNS)
+    rows = 0
+    for timestamp, adapter, kind, data in messages(readings):
+        row = (timestamp, adapter, kind, data.get(CONF_MAC), data.get(CONF_TYPE, ""), data.get(CONF_RSSI))
+        measurements = [key for key in data if key not in NO_MEASUREMENT]
+        if not measurements:
+            writer.writerow((*row, "", ""))
+            rows += 1
+            continue
+        for key in measurements:
+            value = data[key]
+            writer.writerow((*row, key, value.hex() if isinstance(value, bytes) else value))
+            rows += 1
+    return rows
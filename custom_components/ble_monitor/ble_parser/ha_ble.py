@@ -1,44 +1,59 @@
 """Parser for HA BLE (DIY sensors) advertisements"""
 import logging
 import struct
-from Cryptodome.Cipher import AES
 
 from .helpers import (
+    HexDump,
+    aes_ccm,
     to_mac,
     to_unformatted_mac,
 )
+from .reading import Reading
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def parse_uint(data_obj, factor=1):
+def decimal_places(factor):
+    """return the number of decimal places of a factor"""
+    return -int(f'{factor:e}'.split('e')[-1])
+
+
+def parse_uint(data_obj, factor=1, places=0):
     """convert bytes (as unsigned integer) and factor to float"""
-    decimal_places = -int(f'{factor:e}'.split('e')[-1])
-    return round(int.from_bytes(data_obj, "little", signed=False) * factor, decimal_places)
+    value = int.from_bytes(data_obj, "little", signed=False)
+    if factor == 1 or factor is None:
+        return value
+    return round(value * factor, places)
 
 
-def parse_int(data_obj, factor=1):
+def parse_int(data_obj, factor=1, places=0):
     """convert bytes (as signed integer) and factor to float"""
-    decimal_places = -int(f'{factor:e}'.split('e')[-1])
-    return round(int.from_bytes(data_obj, "little", signed=True) * factor, decimal_places)
+    value = int.from_bytes(data_obj, "little", signed=True)
+    if factor == 1 or factor is None:
+        return value
+    return round(value * factor, places)
+
+
+FLOAT_STRUCTS = {
+    2: struct.Struct("<e"),
+    4: struct.Struct("<f"),
+    8: struct.Struct("<d"),
+}
 
 
-def parse_float(data_obj, factor=1):
+def parse_float(data_obj, factor=1, places=0):
     """convert bytes (as float) and factor to float"""
-    decimal_places = -int(f'{factor:e}'.split('e')[-1])
-    if len(data_obj) == 2:
-        [val] = struct.unpack('e', data_obj)
-    if len(data_obj) == 4:
-        [val] = struct.unpack('f', data_obj)
-    elif len(data_obj) == 8:
-        [val] = struct.unpack('d', data_obj)
-    else:
+    try:
+        (val,) = FLOAT_STRUCTS[len(data_obj)].unpack(data_obj)
+    except KeyError:
         _LOGGER.error("only 2, 4 or 8 byte long floats are supported in HA BLE")
         return None
-    return round(val * factor, decimal_places)
+    if factor is None:
+        return val
+    return round(val * factor, places)
 
 
-def parse_string(data_obj, factor=None):
+def parse_string(data_obj, factor=None, places=None):
     """convert bytes to string"""
     return data_obj.decode('UTF-8')
 
@@ -83,12 +98,19 @@ DATA_MEAS_DICT = {
     0x13: ["tvoc", 1],
 }
 
+# Measurement types compiled for decoding
+# {measurement type: (measurement, factor, decimal places)}
+HA_BLE_MEASUREMENTS = {
+    meas_type: (name, factor, None if factor is None else decimal_places(factor))
+    for meas_type, (name, factor) in DATA_MEAS_DICT.items()
+}
+
 
 def parse_ha_ble(self, data, uuid16, source_mac, rssi):
     """Home Assistant BLE parser"""
     device_type = "HA BLE DIY"
     ha_ble_mac = source_mac
-    result = {}
+    measurements = {}
     packet_id = None
 
     if uuid16 == 0x181C:
@@ -124,42 +146,43 @@ def parse_ha_ble(self, data, uuid16, source_mac, rssi):
         obj_meas_type = payload[payload_start + 1]
         next_start = payload_start + 1 + obj_data_length
         if payload_length < next_start:
-            _LOGGER.debug("Invalid payload data length, payload: %s", payload.hex())
+            _LOGGER.debug("Invalid payload data length, payload: %s", HexDump(payload))
             break
 
         if obj_data_length != 0:
             if obj_data_format <= 3:
-                if obj_meas_type in DATA_MEAS_DICT:
-                    meas_data = payload[payload_start + 2:next_start]
-                    meas_type = DATA_MEAS_DICT[obj_meas_type][0]
-                    meas_factor = DATA_MEAS_DICT[obj_meas_type][1]
-                    meas = dispatch[obj_data_format](meas_data, meas_factor)
-                    result.update({meas_type: meas})
+                measurement = HA_BLE_MEASUREMENTS.get(obj_meas_type)
+                if measurement is not None:
+                    meas_type, meas_factor, meas_places = measurement
+                    measurements[meas_type] = dispatch[obj_data_format](
+                        payload[payload_start + 2:next_start], meas_factor, meas_places
+                    )
                 else:
                     if self.report_unknown == "HA BLE":
-                        _LOGGER.error("UNKNOWN dataobject in HA BLE payload! Adv: %s", data.hex())
+                        _LOGGER.error("UNKNOWN dataobject in HA BLE payload! Adv: %s", HexDump(data))
             elif obj_data_format == 4:
                 data_mac = dispatch[obj_data_format](payload[payload_start + 1:next_start])
                 if data_mac:
                     ha_ble_mac = data_mac
             else:
                 if self.report_unknown == "HA BLE":
-                    _LOGGER.error("UNKNOWN dataobject in HA BLE payload! Adv: %s", data.hex())
+                    _LOGGER.error("UNKNOWN dataobject in HA BLE payload! Adv: %s", HexDump(data))
         payload_start = next_start
 
-    if not result:
+    if not measurements:
         if self.report_unknown == "HA BLE":
             _LOGGER.info(
                 "BLE ADV from UNKNOWN Home Assistant BLE DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
     # Check for packet id in payload
-    if result.get("packet"):
-        packet_id = result["packet"]
+    payload_packet_id = measurements.pop("packet", None)
+    if payload_packet_id:
+        packet_id = payload_packet_id
 
     # Check for duplicate messages
     if packet_id:
@@ -181,22 +204,14 @@ def parse_ha_ble(self, data, uuid16, source_mac, rssi):
         _LOGGER.debug("Discovery is disabled. MAC: %s is not whitelisted!", to_mac(ha_ble_mac))
         return None
 
-    result.update({
-        "rssi": rssi,
-        "mac": to_unformatted_mac(ha_ble_mac),
-        "packet": packet_id,
-        "type": device_type,
-        "firmware": firmware,
-        "data": True
-    })
-    return result
+    return Reading(rssi, to_unformatted_mac(ha_ble_mac), device_type, packet_id, firmware, True, measurements)
 
 
 def decrypt_data(self, data, ha_ble_mac):
     """Decrypt encrypted HA BLE advertisements"""
     # check for minimum length of encrypted advertisement
     if len(data) < 15:
-        _LOGGER.debug("Invalid data length (for decryption), adv: %s", data.hex())
+        _LOGGER.debug("Invalid data length (for decryption), adv: %s", HexDump(data))
     # try to find encryption key for current device
     try:
         key = self.aeskeys[ha_ble_mac]
@@ -214,15 +229,15 @@ def decrypt_data(self, data, ha_ble_mac):
 
     # nonce: mac [6], uuid16 [2], count_id [4] (6+2+4 = 12 bytes)
     nonce = b"".join([ha_ble_mac, uuid, count_id])
-    cipher = AES.new(key, AES.MODE_CCM, nonce=nonce, mac_len=4)
+    cipher = aes_ccm(key, nonce)
     cipher.update(b"\x11")
     try:
         decrypted_payload = cipher.decrypt_and_verify(encrypted_payload, mic)
     except ValueError as error:
         _LOGGER.warning("Decryption failed: %s", error)
-        _LOGGER.debug("mic: %s", mic.hex())
-        _LOGGER.debug("nonce: %s", nonce.hex())
-        _LOGGER.debug("encrypted_payload: %s", encrypted_payload.hex())
+        _LOGGER.debug("mic: %s", HexDump(mic))
+        _LOGGER.debug("nonce: %s", HexDump(nonce))
+        _LOGGER.debug("encrypted_payload: %s", HexDump(encrypted_payload))
         return None
     if decrypted_payload is None:
         _LOGGER.error(
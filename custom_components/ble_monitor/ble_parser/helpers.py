@@ -1,17 +1,50 @@
 """Helpers for bleparser"""
+from functools import lru_cache
 from uuid import UUID
 
+# Number of formatted addresses and UUIDs that are kept. Every device identity is
+# formatted once and the cached string is returned for its next advertisements.
+IDENTITY_CACHE_SIZE = 1024
 
-def to_uuid(uuid: str) -> str:
+
+@lru_cache(maxsize=IDENTITY_CACHE_SIZE)
+def to_uuid(uuid: bytes) -> str:
     """Return formatted UUID"""
-    return str(UUID(''.join(f'{i:02X}' for i in uuid)))
+    return str(UUID(bytes=uuid))
+
+
+@lru_cache(maxsize=IDENTITY_CACHE_SIZE)
+def to_unformatted_uuid(uuid: bytes) -> str:
+    """Return unformatted UUID"""
+    return uuid.hex()
 
 
-def to_mac(addr: str) -> str:
+@lru_cache(maxsize=IDENTITY_CACHE_SIZE)
+def to_mac(addr: bytes) -> str:
     """Return formatted MAC address"""
-    return ':'.join(f'{i:02X}' for i in addr)
+    return addr.hex(':').upper()
 
 
-def to_unformatted_mac(addr: int):
+@lru_cache(maxsize=IDENTITY_CACHE_SIZE)
+def to_unformatted_mac(addr: bytes) -> str:
     """Return unformatted MAC address"""
-    return ''.join(f'{i:02X}' for i in addr[:])
+    return addr.hex().upper()
+
+
+class HexDump:
+    """Hex dump of bytes for log messages, only formatted when the message is emitted"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def __str__(self) -> str:
+        return self.data.hex()
+
+
+def aes_ccm(key: bytes, nonce: bytes, mac_len: int = 4):
+    """Return an AES CCM cipher, the crypto backend is imported on first use"""
+    from Cryptodome.Cipher import AES  # pylint: disable=import-outside-toplevel
+
+    return AES.new(key, AES.MODE_CCM, nonce=nonce, mac_len=mac_len)
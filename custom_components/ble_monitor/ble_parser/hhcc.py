@@ -16,6 +16,7 @@ from .const import (
     CONF_TEMPERATURE,
 )
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -54,13 +55,12 @@ def parse_hhcc(self, data: str, source_mac: str, rssi: float):
                 "BLE ADV from UNKNOWN HHCC DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
     # Check for duplicate messages
     if packet_id:
-        print("packet_id is", packet_id)
         try:
             prev_packet = self.lpacket_ids[hhcc_mac]
         except KeyError:
@@ -5,10 +5,6 @@ from typing import Final
 
 from .const import (
     CONF_MAC,
-    CONF_TYPE,
-    CONF_PACKET,
-    CONF_FIRMWARE,
-    CONF_DATA,
     CONF_RSSI,
     CONF_UUID,
     CONF_TRACKER_ID,
@@ -19,10 +15,13 @@ from .const import (
     CONF_CYPRESS_HUMIDITY,
 )
 from .helpers import (
+    HexDump,
     to_mac,
     to_uuid,
     to_unformatted_mac,
+    to_unformatted_uuid,
 )
+from .reading import Reading
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,7 +37,7 @@ def parse_ibeacon(self, data: str, source_mac: str, rssi: float):
         tracker_data = {
             CONF_RSSI: rssi,
             CONF_MAC: to_unformatted_mac(source_mac),
-            CONF_UUID: to_uuid(uuid).replace('-', ''),
+            CONF_UUID: to_unformatted_uuid(uuid),
             CONF_TRACKER_ID: uuid,
             CONF_MAJOR: major,
             CONF_MINOR: minor,
@@ -47,12 +46,22 @@ def parse_ibeacon(self, data: str, source_mac: str, rssi: float):
             CONF_CYPRESS_HUMIDITY: 125.0 * (minor & 0xff00) / 65536 - 6,
         }
 
-        sensor_data = {
-            CONF_TYPE: DEVICE_TYPE,
-            CONF_PACKET: "no packet id",
-            CONF_FIRMWARE: DEVICE_TYPE,
-            CONF_DATA: True
-        } | tracker_data
+        sensor_data = Reading(
+            rssi,
+            tracker_data[CONF_MAC],
+            DEVICE_TYPE,
+            "no packet id",
+            DEVICE_TYPE,
+            measurements={
+                CONF_UUID: tracker_data[CONF_UUID],
+                CONF_TRACKER_ID: uuid,
+                CONF_MAJOR: major,
+                CONF_MINOR: minor,
+                CONF_MEASURED_POWER: power,
+                CONF_CYPRESS_TEMPERATURE: tracker_data[CONF_CYPRESS_TEMPERATURE],
+                CONF_CYPRESS_HUMIDITY: tracker_data[CONF_CYPRESS_HUMIDITY],
+            },
+        )
     else:
         if self.report_unknown == DEVICE_TYPE:
             _LOGGER.info(
@@ -60,7 +69,7 @@ def parse_ibeacon(self, data: str, source_mac: str, rssi: float):
                 DEVICE_TYPE,
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None, None
 
@@ -1,8 +1,9 @@
 """Parser for Inkbird BLE advertisements"""
 import logging
-from struct import unpack
 
+from .decoder_spec import DecoderSpec, compile_specs, find_spec
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -19,114 +20,94 @@ def convert_temperature(temp):
     return temperature
 
 
+# Decoder specs on (message length, complete local name). The iBBQ
+# thermometers are selected on the message length only.
+INKBIRD_SPECS = compile_specs((
+    DecoderSpec(
+        (11, "sps"),
+        "IBS-TH",
+        "<hHxxxB",
+        2,
+        (("temperature", 100), ("humidity", 100), ("battery", None)),
+    ),
+    DecoderSpec(
+        (11, "tps"),
+        "IBS-TH2/P01B",
+        "<hHxxxB",
+        2,
+        (("temperature", 100), (None, None), ("battery", None)),
+    ),
+    DecoderSpec(
+        (14, None),
+        "iBBQ-1",
+        "<h",
+        12,
+        (
+            ("temperature probe 1", convert_temperature),
+        ),
+    ),
+    DecoderSpec(
+        (16, None),
+        "iBBQ-2",
+        "<HH",
+        12,
+        (
+            ("temperature probe 1", convert_temperature),
+            ("temperature probe 2", convert_temperature),
+        ),
+    ),
+    DecoderSpec(
+        (20, None),
+        "iBBQ-4",
+        "<hhhh",
+        12,
+        (
+            ("temperature probe 1", convert_temperature),
+            ("temperature probe 2", convert_temperature),
+            ("temperature probe 3", convert_temperature),
+            ("temperature probe 4", convert_temperature),
+        ),
+    ),
+    DecoderSpec(
+        (24, None),
+        "iBBQ-6",
+        "<hhhhhh",
+        12,
+        (
+            ("temperature probe 1", convert_temperature),
+            ("temperature probe 2", convert_temperature),
+            ("temperature probe 3", convert_temperature),
+            ("temperature probe 4", convert_temperature),
+            ("temperature probe 5", convert_temperature),
+            ("temperature probe 6", convert_temperature),
+        ),
+    ),
+))
+
+
 def parse_inkbird(self, data, complete_local_name, source_mac, rssi):
     """Inkbird parser"""
     msg_length = len(data)
     firmware = "Inkbird"
-    result = {"firmware": firmware}
-    if msg_length == 11:
-        inkbird_mac = source_mac
-        xvalue = data[2:10]
-        (temp, hum) = unpack("<hH", xvalue[0:4])
-        bat = int.from_bytes(xvalue[7:8], 'little')
-        if complete_local_name == "sps":
-            device_type = "IBS-TH"
-            result.update(
-                {
-                    "temperature": temp / 100,
-                    "humidity": hum / 100,
-                    "battery": bat,
-                }
-            )
-        elif complete_local_name == "tps":
-            device_type = "IBS-TH2/P01B"
-            result.update(
-                {
-                    "temperature": temp / 100,
-                    "battery": bat,
-                }
-            )
-        else:
-            return None
-    elif msg_length == 14:
-        device_type = "iBBQ-1"
-        inkbird_mac = data[6:12]
-        xvalue = data[12:14]
-        if source_mac not in [inkbird_mac, inkbird_mac[::-1]]:
-            _LOGGER.debug(
-                "Inkbird MAC address doesn't match data MAC address. Data: %s",
-                data.hex()
-            )
-            return None
-        (temp_1,) = unpack("<h", xvalue)
-        result.update(
-            {
-                "temperature probe 1": convert_temperature(temp_1),
-            }
-        )
-    elif msg_length == 16:
-        device_type = "iBBQ-2"
-        inkbird_mac = data[6:12]
-        xvalue = data[12:16]
-        if source_mac not in [inkbird_mac, inkbird_mac[::-1]]:
-            _LOGGER.debug(
-                "Inkbird MAC address doesn't match data MAC address. Data: %s",
-                data.hex()
-            )
-            return None
-        (temp_1, temp_2) = unpack("<HH", xvalue)
-        result.update(
-            {
-                "temperature probe 1": convert_temperature(temp_1),
-                "temperature probe 2": convert_temperature(temp_2),
-            }
-        )
-    elif msg_length == 20:
-        inkbird_mac = data[6:12]
-        xvalue = data[12:20]
-        if source_mac not in [inkbird_mac, inkbird_mac[::-1]]:
-            _LOGGER.debug(
-                "Inkbird MAC address doesn't match data MAC address. Data: %s",
-                data.hex()
-            )
-            return None
-        device_type = "iBBQ-4"
-        (temp_1, temp_2, temp_3, temp_4) = unpack("<hhhh", xvalue)
-        result.update(
-            {
-                "temperature probe 1": convert_temperature(temp_1),
-                "temperature probe 2": convert_temperature(temp_2),
-                "temperature probe 3": convert_temperature(temp_3),
-                "temperature probe 4": convert_temperature(temp_4),
-            }
-        )
-    elif msg_length == 24:
-        inkbird_mac = data[6:12]
-        xvalue = data[12:24]
-        if source_mac not in [inkbird_mac, inkbird_mac[::-1]]:
-            _LOGGER.debug("Inkbird MAC address doesn't match data MAC address. Data: %s", data.hex())
-            return None
-        device_type = "iBBQ-6"
-        (temp_1, temp_2, temp_3, temp_4, temp_5, temp_6) = unpack("<hhhhhh", xvalue)
-        result.update(
-            {
-                "temperature probe 1": convert_temperature(temp_1),
-                "temperature probe 2": convert_temperature(temp_2),
-                "temperature probe 3": convert_temperature(temp_3),
-                "temperature probe 4": convert_temperature(temp_4),
-                "temperature probe 5": convert_temperature(temp_5),
-                "temperature probe 6": convert_temperature(temp_6),
-            }
-        )
-    else:
+    spec = find_spec(INKBIRD_SPECS, msg_length, complete_local_name)
+    if spec is None:
         if self.report_unknown == "Inkbird":
             _LOGGER.info(
                 "BLE ADV from UNKNOWN Inkbird DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
+    if msg_length != 11:
+        inkbird_mac = data[6:12]
+        if source_mac not in [inkbird_mac, inkbird_mac[::-1]]:
+            _LOGGER.debug(
+                "Inkbird MAC address doesn't match data MAC address. Data: %s",
+                HexDump(data)
+            )
+            return None
+    device_type, result = spec.decode(data)
 
     # check for MAC presence in sensor whitelist, if needed
     if self.discovery is False and source_mac not in self.sensor_whitelist:
@@ -4,6 +4,7 @@ import math
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -204,7 +205,7 @@ def parse_inode(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN iNode DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
     device_type = INODE_CARE_SENSORS_IDS[device_id]
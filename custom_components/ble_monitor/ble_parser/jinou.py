@@ -2,6 +2,7 @@
 import logging
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -34,7 +35,7 @@ def parse_jinou(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN Jinou DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
@@ -3,6 +3,7 @@ import logging
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -97,6 +98,6 @@ def parse_kegtron(self, data, source_mac, rssi):
             _LOGGER.debug(
                 "UNKNOWN dataobject from Kegtron DEVICE: MAC: %s, ADV: %s",
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
@@ -3,6 +3,7 @@ import logging
 import math
 from struct import unpack
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -36,9 +37,9 @@ def parse_kkm(self, data, source_mac, rssi):
                     "temperature": temperature,
                     "humidity": humidity,
                     "acceleration": round(math.sqrt(accx ** 2 + accy ** 2 + accz ** 2), 1),
-                    "acceleration_x": accx,
-                    "acceleration_y": accy,
-                    "acceleration_z": accz,
+                    "acceleration x": accx,
+                    "acceleration y": accy,
+                    "acceleration z": accz,
                     "voltage": volt / 1000,
                     "firmware": "KKM",
                     "packet": "no packet id",
@@ -55,7 +56,7 @@ def parse_kkm(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN KKM DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex(),
+                HexDump(data),
             )
         return None
     # reformat battery info to match BLE monitor format
@@ -3,7 +3,7 @@ import logging
 import math
 from struct import unpack
 
-from .helpers import to_mac, to_unformatted_mac
+from .helpers import HexDump, to_mac, to_unformatted_mac
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -91,7 +91,7 @@ def parse_mikrotik(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN Mikrotik DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
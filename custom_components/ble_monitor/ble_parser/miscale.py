@@ -3,6 +3,7 @@ import logging
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -66,7 +67,7 @@ def parse_miscale(self, data, source_mac, rssi):
             _LOGGER.info(
                 "BLE ADV from UNKNOWN Mi Scale DEVICE: MAC: %s, ADV: %s",
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
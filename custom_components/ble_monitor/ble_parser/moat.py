@@ -1,8 +1,9 @@
 """Parser for Moat BLE advertisements"""
 import logging
-from struct import unpack
 
+from .decoder_spec import DecoderSpec, compile_specs, find_spec
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -10,46 +11,57 @@ from .helpers import (
 _LOGGER = logging.getLogger(__name__)
 
 
+def moat_battery(result, values):
+    """Battery level from the voltage."""
+    volt = values[2]
+    if volt >= 3000:
+        batt = 100
+    elif volt >= 2900:
+        batt = 42 + (volt - 2900) * 0.58
+    elif volt >= 2740:
+        batt = 18 + (volt - 2740) * 0.15
+    elif volt >= 2440:
+        batt = 6 + (volt - 2440) * 0.04
+    elif volt >= 2100:
+        batt = (volt - 2100) * (6 / 340)
+    else:
+        batt = 0
+    result["battery"] = round(batt, 1)
+
+
+# Decoder specs on (message length, device id)
+MOAT_SPECS = compile_specs((
+    DecoderSpec(
+        (22, 0x1000),
+        "Moat S2",
+        "<HHH",
+        14,
+        (
+            ("temperature", lambda temp: round(-46.85 + 175.72 * temp / 65536.0, 3)),
+            ("humidity", lambda humi: round(-6.0 + 125.0 * humi / 65536.0, 3)),
+            ("voltage", 1000),
+        ),
+        post=moat_battery,
+    ),
+))
+
+
 def parse_moat(self, data, source_mac, rssi):
     """Parser for Moat sensors"""
-    msg_length = len(data)
     firmware = "Moat"
     moat_mac = source_mac
     device_id = (data[3] << 8) | data[2]
-    result = {"firmware": firmware}
-    if msg_length == 22 and device_id == 0x1000:
-        device_type = "Moat S2"
-        (temp, humi, volt) = unpack("<HHH", data[14:20])
-        temperature = -46.85 + 175.72 * temp / 65536.0
-        humidity = -6.0 + 125.0 * humi / 65536.0
-        voltage = volt / 1000
-        if volt >= 3000:
-            batt = 100
-        elif volt >= 2900:
-            batt = 42 + (volt - 2900) * 0.58
-        elif volt >= 2740:
-            batt = 18 + (volt - 2740) * 0.15
-        elif volt >= 2440:
-            batt = 6 + (volt - 2440) * 0.04
-        elif volt >= 2100:
-            batt = (volt - 2100) * (6 / 340)
-        else:
-            batt = 0
-        result.update({
-            "temperature": round(temperature, 3),
-            "humidity": round(humidity, 3),
-            "voltage": voltage,
-            "battery": round(batt, 1)
-        })
-    else:
+    spec = find_spec(MOAT_SPECS, len(data), device_id)
+    if spec is None:
         if self.report_unknown == "Moat":
             _LOGGER.info(
                 "BLE ADV from UNKNOWN Moat DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
+    device_type, result = spec.decode(data)
 
     # check for MAC presence in whitelist, if needed
     if self.discovery is False and moat_mac not in self.sensor_whitelist:
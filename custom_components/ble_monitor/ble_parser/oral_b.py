@@ -3,6 +3,7 @@ import logging
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -99,7 +100,7 @@ def parse_oral_b(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN Oral-B DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
@@ -3,6 +3,7 @@ import logging
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -83,7 +84,7 @@ def parse_qingping(self, data, source_mac, rssi):
                 else:
                     _LOGGER.debug(
                         "Unknown data received from Qingping device: %s",
-                        data[xdata_point - 2:].hex()
+                        HexDump(data[xdata_point - 2:])
                     )
             xdata_point += xdata_size + 2
     else:
@@ -94,7 +95,7 @@ def parse_qingping(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN Qingping DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
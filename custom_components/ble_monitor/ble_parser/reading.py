@@ -0,0 +1,87 @@
+"""Compact record of a parsed BLE advertisement."""
+from collections.abc import Mapping
+
+from .const import CONF_DATA, CONF_FIRMWARE, CONF_MAC, CONF_PACKET, CONF_RSSI, CONF_TYPE
+
+FIELDS = (CONF_RSSI, CONF_MAC, CONF_TYPE, CONF_PACKET, CONF_FIRMWARE, CONF_DATA)
+_FIELDS = frozenset(FIELDS)
+
+
+class Reading(Mapping):
+    """Parsed BLE advertisement of a sensor.
+
+    The fields that every advertisement has (rssi, mac, type, packet, firmware
+    and data) are stored in slots, the measurements in a small dict. A Reading
+    can be used as a read-only dict of all fields and measurements, like the
+    dicts that are returned by the other parsers. New measurements can be added
+    with item assignment or update().
+    """
+
+    __slots__ = ("rssi", "mac", "type", "packet", "firmware", "data", "measurements")
+
+    def __init__(self, rssi, mac, device_type, packet, firmware, data=True, measurements=None):
+        """Initialize the reading."""
+        self.rssi = rssi
+        self.mac = mac
+        self.type = device_type
+        self.packet = packet
+        self.firmware = firmware
+        self.data = data
+        self.measurements = {} if measurements is None else measurements
+
+    def __getitem__(self, key):
+        """Return a field or measurement."""
+        if key in _FIELDS:
+            return getattr(self, key)
+        return self.measurements[key]
+
+    def __setitem__(self, key, value):
+        """Set a field or measurement."""
+        if key in _FIELDS:
+            setattr(self, key, value)
+        else:
+            self.measurements[key] = value
+
+    def __contains__(self, key):
+        """Return True for fields and available measurements."""
+        return key in _FIELDS or key in self.measurements
+
+    def __iter__(self):
+        """Iterate over the fields and the measurements."""
+        yield from FIELDS
+        yield from self.measurements
+
+    def __len__(self):
+        """Return the number of fields and measurements."""
+        return len(FIELDS) + len(self.measurements)
+
+    def __repr__(self):
+        """Return the reading as dict."""
+        return f"Reading({self.as_dict()!r})"
+
+    def get(self, key, default=None):
+        """Return a field or measurement, or the default when it is not available."""
+        if key in _FIELDS:
+            return getattr(self, key)
+        return self.measurements.get(key, default)
+
+    def pop(self, key, *default):
+        """Remove a measurement and return its value."""
+        return self.measurements.pop(key, *default)
+
+    def update(self, values):
+        """Set the fields and measurements of a dict."""
+        for key, value in values.items():
+            self[key] = value
+
+    def as_dict(self):
+        """Return a dict with all fields and measurements."""
+        return {
+            CONF_RSSI: self.rssi,
+            CONF_MAC: self.mac,
+            CONF_TYPE: self.type,
+            CONF_PACKET: self.packet,
+            CONF_FIRMWARE: self.firmware,
+            CONF_DATA: self.data,
+            **self.measurements,
+        }
@@ -5,6 +5,7 @@ import math
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -178,7 +179,7 @@ def parse_ruuvitag(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN Ruuvitag DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex(),
+                HexDump(data),
             )
         return None
     # reformat battery info to match BLE monitor format
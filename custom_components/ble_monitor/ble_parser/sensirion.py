@@ -2,6 +2,7 @@
 import logging
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -28,7 +29,7 @@ def parse_sensirion(self, data, complete_local_name, source_mac, rssi):
                 "BLE ADV from UNKNOWN Sensirion DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
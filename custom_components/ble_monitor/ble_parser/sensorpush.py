@@ -2,6 +2,7 @@
 import logging
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -38,34 +39,40 @@ SENSORPUSH_DATA_TYPES = {
 }
 
 
+def compile_pack_params(pack_params, data_types):
+    """Compile the pack parameters into (data type, modulus, divisor, step, minimum value) tuples."""
+    decoders = []
+    mod = 1
+    div = 1
+    for (min_value, max_value, step), data_type in zip(pack_params, data_types):
+        count = int((max_value - min_value) / step + step / 2.0) + 1
+        mod *= count
+        decoders.append((data_type, mod, div, step, min_value))
+        div *= count
+    return tuple(decoders)
+
+
+SENSORPUSH_DECODERS = {
+    device_type_id: compile_pack_params(pack_params, SENSORPUSH_DATA_TYPES[device_type_id])
+    for device_type_id, pack_params in SENSORPUSH_PACK_PARAMS.items()
+}
+
+
 def decode_values(mfg_data: bytes, device_type_id: int) -> dict:
     """Decode values"""
-    pack_params = SENSORPUSH_PACK_PARAMS.get(device_type_id, None)
-    if pack_params is None:
+    decoders = SENSORPUSH_DECODERS.get(device_type_id)
+    if decoders is None:
         _LOGGER.error("SensorPush device type id %s unknown", device_type_id)
         return {}
 
     values = {}
-
-    packed_values = 0
-    for i in range(1, len(mfg_data)):
-        packed_values += mfg_data[i] << (8 * (i - 1))
-
-    mod = 1
-    div = 1
-    for i in range(0, len(pack_params)):
-        vp = pack_params[i]
-        min_value = vp[0]
-        max_value = vp[1]
-        step = vp[2]
-        mod *= int((max_value - min_value) / step + step / 2.0) + 1
+    packed_values = int.from_bytes(mfg_data[1:], "little")
+    for data_type, mod, div, step, min_value in decoders:
         value_count = int((packed_values % mod) / div)
-        data_type = SENSORPUSH_DATA_TYPES[device_type_id][i]
         value = round(value_count * step + min_value, 2)
         if data_type == "pressure":
             value = value / 100.0
         values[data_type] = value
-        div *= int((max_value - min_value) / step + step / 2.0) + 1
 
     return values
 
@@ -88,7 +95,7 @@ def parse_sensorpush(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN SensorPush DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
@@ -3,6 +3,7 @@ import logging
 from struct import unpack
 
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -56,7 +57,7 @@ def parse_teltonika(self, data, complete_local_name, source_mac, rssi):
                 rssi,
                 to_mac(source_mac),
                 device_type,
-                data.hex()
+                HexDump(data)
             )
         return None
 
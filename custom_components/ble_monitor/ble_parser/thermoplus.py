@@ -1,8 +1,9 @@
 """Parser for Thermoplus BLE advertisements"""
 import logging
-from struct import unpack
 
+from .decoder_spec import DecoderSpec, compile_specs, find_spec
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -10,54 +11,55 @@ from .helpers import (
 _LOGGER = logging.getLogger(__name__)
 
 
-def parse_thermoplus(self, data, source_mac, rssi):
-    """Thermoplus parser"""
-    msg_length = len(data)
-    if msg_length == 22:
-        device_id = data[2]
-        if device_id == 0x10:
-            device_type = "Lanyard/mini hygrometer"
-        elif device_id in [0x11, 0x15]:
-            device_type = "Smart hygrometer"
-        else:
-            device_type = None
-        firmware = "Thermoplus"
+def thermoplus_battery(result, values):
+    """Battery level from the voltage."""
+    volt = values[0]
+    if volt >= 3000:
+        batt = 100
+    elif volt >= 2600:
+        batt = 60 + (volt - 2600) * 0.1
+    elif volt >= 2500:
+        batt = 40 + (volt - 2500) * 0.2
+    elif volt >= 2450:
+        batt = 20 + (volt - 2450) * 0.4
+    else:
+        batt = 0
+    result["battery"] = batt
 
-        thermoplus_mac_reversed = data[6:12]
-        thermoplus_mac = thermoplus_mac_reversed[::-1]
 
-        xvalue = data[12:18]
-        (volt, temp, humi) = unpack("<HhH", xvalue)
+# Decoder specs on message length, the device type is selected by the device id
+THERMOPLUS_SPECS = compile_specs((
+    DecoderSpec(
+        (22, None),
+        (2, {0x10: "Lanyard/mini hygrometer", 0x11: "Smart hygrometer", 0x15: "Smart hygrometer"}),
+        "<HhH",
+        12,
+        (("voltage", 1000), ("temperature", 16), ("humidity", 16)),
+        post=thermoplus_battery,
+    ),
+))
 
-        if volt >= 3000:
-            batt = 100
-        elif volt >= 2600:
-            batt = 60 + (volt - 2600) * 0.1
-        elif volt >= 2500:
-            batt = 40 + (volt - 2500) * 0.2
-        elif volt >= 2450:
-            batt = 20 + (volt - 2450) * 0.4
-        else:
-            batt = 0
-        result = {
-            "voltage": volt / 1000,
-            "temperature": temp / 16,
-            "humidity": humi / 16,
-            "battery": batt
-        }
-    else:
+
+def parse_thermoplus(self, data, source_mac, rssi):
+    """Thermoplus parser"""
+    firmware = "Thermoplus"
+    spec = find_spec(THERMOPLUS_SPECS, len(data))
+    if spec is None:
         device_type = None
+    else:
+        device_type, result = spec.decode(data)
     if device_type is None:
         if self.report_unknown == "Thermoplus":
             _LOGGER.info(
                 "BLE ADV from UNKNOWN Thermoplus DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
 
     # check for MAC presence in message and in service data
+    thermoplus_mac = data[6:12][::-1]
     if thermoplus_mac != source_mac:
         _LOGGER.debug("Invalid MAC address for Thermoplus device")
         return None
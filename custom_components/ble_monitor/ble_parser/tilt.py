@@ -19,9 +19,11 @@ from .const import (
     TILT_TYPES,
 )
 from .helpers import (
+    HexDump,
     to_mac,
     to_uuid,
     to_unformatted_mac,
+    to_unformatted_uuid,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,7 +40,7 @@ def parse_tilt(self, data: str, source_mac: str, rssi: float):
         tracker_data = {
             CONF_RSSI: rssi,
             CONF_MAC: to_unformatted_mac(source_mac),
-            CONF_UUID: to_uuid(uuid).replace('-', ''),
+            CONF_UUID: to_unformatted_uuid(uuid),
             CONF_TRACKER_ID: uuid,
             CONF_MAJOR: major,
             CONF_MINOR: minor,
@@ -59,7 +61,7 @@ def parse_tilt(self, data: str, source_mac: str, rssi: float):
                 "BLE ADV from UNKNOWN TILT DEVICE: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None, None
 
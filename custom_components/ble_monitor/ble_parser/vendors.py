@@ -0,0 +1,265 @@
+"""Registry of the vendor parsers of the BLE parser.
+
+The vendor modules are only imported when the vendor is enabled in the
+BleParser, on the first advertisement of the vendor. Every rule tells which
+advertisements are parsed by a vendor:
+
+- service data rules are selected on the UUID16 of the service data
+- manufacturer specific data rules are selected on the company identifier,
+  or checked one by one (in order) when there is no rule for the company
+  identifier that matches
+"""
+from importlib import import_module
+
+from .const import TILT_TYPES
+
+VENDORS = (
+    "acconeer",
+    "airmentor",
+    "almendo",
+    "altbeacon",
+    "atc",
+    "bluemaestro",
+    "bparasite",
+    "brifit",
+    "govee",
+    "ha_ble",
+    "hhcc",
+    "ibeacon",
+    "inkbird",
+    "inode",
+    "jinou",
+    "kegtron",
+    "kkm",
+    "laica",
+    "miscale",
+    "mikrotik",
+    "moat",
+    "oral_b",
+    "qingping",
+    "relsib",
+    "ruuvitag",
+    "sensorpush",
+    "sensirion",
+    "switchbot",
+    "smartdry",
+    "teltonika",
+    "thermoplus",
+    "thermopro",
+    "tilt",
+    "xiaomi",
+    "xiaogui",
+)
+
+SENSORPUSH_UUID128 = b'\xb0\x0a\x09\xec\xd7\x9d\xb8\x93\xba\x42\xd6\x11\x00\x00\x09\xef'
+
+
+def _sensor(parse):
+    """Handler for parsers that return sensor data only."""
+    def handler(parser, data, mac, rssi, local_name, key, data_list):
+        return parse(parser, data, mac, rssi), None
+    return handler
+
+
+def _sensor_tracker(parse):
+    """Handler for parsers that return sensor and tracker data."""
+    def handler(parser, data, mac, rssi, local_name, key, data_list):
+        return parse(parser, data, mac, rssi)
+    return handler
+
+
+def _with_local_name(parse):
+    """Handler for parsers that need the local name."""
+    def handler(parser, data, mac, rssi, local_name, key, data_list):
+        return parse(parser, data, local_name, mac, rssi), None
+    return handler
+
+
+def _with_key(parse):
+    """Handler for parsers that need the UUID16 of the service data."""
+    def handler(parser, data, mac, rssi, local_name, key, data_list):
+        return parse(parser, data, key, mac, rssi), None
+    return handler
+
+
+def _altbeacon(parse):
+    """Handler for the AltBeacon parser, that needs the company identifier."""
+    def handler(parser, data, mac, rssi, local_name, key, data_list):
+        return parse(parser, data, key, mac, rssi)
+    return handler
+
+
+def _teltonika(parse):
+    """Handler for the Teltonika parser, that needs both parts of the service data."""
+    def handler(parser, data, mac, rssi, local_name, key, data_list):
+        if len(data_list) == 2:
+            data = b"".join(data_list)
+        return parse(parser, data, local_name, mac, rssi), None
+    return handler
+
+
+def _thermopro(parse):
+    """Handler for the Thermopro parser, that needs the sensor type from the local name."""
+    def handler(parser, data, mac, rssi, local_name, key, data_list):
+        return parse(parser, data, local_name[0:5], mac, rssi), None
+    return handler
+
+
+# Service data rules: (UUID16s, vendor, predicate(service_data, local_name), handler)
+SERVICE_DATA_RULES = (
+    # Environmental Sensing (used by ATC or b-parasite)
+    ((0x181A,), "bparasite", lambda data, name: len(data) in (20, 22), _sensor),
+    ((0x181A,), "atc", lambda data, name: len(data) not in (20, 22), _sensor),
+    # Body Composition and Weight Scale (used by Mi Scale)
+    ((0x181B, 0x181D), "miscale", None, _sensor),
+    # User Data and Bond Management (used by BLE HA)
+    ((0x181C, 0x181E), "ha_ble", None, _with_key),
+    ((0xAA20, 0xAA21, 0xAA22), "relsib", lambda data, name: name == "ECo", _sensor),
+    # unknown (used by Switchbot)
+    ((0xFD3D, 0x0D00), "switchbot", None, _sensor),
+    # Hangzhou Tuya Information Technology Co., Ltd (HHCC)
+    ((0xFD50,), "hhcc", None, _sensor),
+    # Qingping and FIDO (used by Cleargrass)
+    ((0xFDCD, 0xFFF9), "qingping", None, _sensor),
+    ((0xFE95,), "xiaomi", None, _sensor),
+    # Google (used by KKM and Ruuvitag V2/V4)
+    ((0xFEAA,), "kkm", lambda data, name: len(data) == 19, _sensor),
+    ((0xFEAA,), "ruuvitag", lambda data, name: len(data) >= 23, _sensor),
+    # Temperature and Humidity (used by Teltonika)
+    ((0x2A6E, 0x2A6F), "teltonika", None, _teltonika),
+)
+
+# Manufacturer specific data rules on company identifier:
+# (company identifiers, vendor, predicate(data, data_len, local_name, uuid16, uuid128), handler)
+COMP_ID_RULES = (
+    ((0x0001,), "govee", lambda data, size, *_: size in (0x09, 0x0C, 0x22, 0x25), _sensor),
+    (
+        (0x004C,),
+        "tilt",
+        lambda data, size, *_: data[4] == 0x02 and int.from_bytes(data[6:22], byteorder='big') in TILT_TYPES,
+        _sensor_tracker,
+    ),
+    ((0x004C,), "ibeacon", lambda data, size, *_: data[4] == 0x02, _sensor_tracker),
+    ((0x00DC,), "oral_b", lambda data, size, *_: size == 0x0E, _sensor),
+    ((0x0499,), "ruuvitag", None, _sensor),
+    ((0x094F,), "mikrotik", lambda data, size, *_: size == 0x15, _sensor),
+    ((0x06E8,), "almendo", None, _sensor),
+    ((0x1000,), "moat", lambda data, size, *_: size == 0x15, _sensor),
+    ((0x0133,), "bluemaestro", lambda data, size, *_: size == 0x11, _sensor),
+    ((0x01AE,), "smartdry", lambda data, size, *_: size == 0x0F, _sensor),
+    ((0x06D5,), "sensirion", None, _with_local_name),
+    ((0x2121, 0x2122), "airmentor", lambda data, size, *_: size == 0x0B, _sensor),
+    ((0x8801,), "govee", lambda data, size, *_: size in (0x0C, 0x25), _sensor),
+    ((0xAA55,), "brifit", lambda data, size, *_: size == 0x14, _sensor),
+    ((0xEC88,), "govee", lambda data, size, *_: size in (0x09, 0x0A, 0x0C, 0x22, 0x24, 0x25), _sensor),
+    ((0xFFFF,), "kegtron", lambda data, size, *_: size == 0x1E, _sensor),
+    ((0xA0AC,), "laica", lambda data, size, *_: size == 0x0F and data[14] in (0x06, 0x0D), _sensor),
+)
+
+# Other manufacturer specific data rules, checked in this order:
+# (vendor, predicate(data, data_len, local_name, uuid16, uuid128), handler)
+MANUFACTURER_RULES = (
+    # part of the UUID16
+    ("xiaogui", lambda data, size, *_: data[2] == 0xC0 and size == 0x10, _sensor),
+    ("inode", lambda data, size, *_: data[3] == 0x82 and size == 0x0E, _sensor),
+    (
+        "inode",
+        lambda data, size, *_: data[3] in (0x91, 0x92, 0x93, 0x94, 0x95, 0x96, 0x9A, 0x9B, 0x9C, 0x9D)
+        and size == 0x19,
+        _sensor,
+    ),
+    # service class uuid16
+    ("jinou", lambda data, size, name, uuid16, uuid128: uuid16 == 0x20AA and size == 0x0E, _sensor),
+    ("govee", lambda data, size, name, uuid16, uuid128: uuid16 == 0x5182 and size in (0x14, 0x2D), _sensor),
+    ("govee", lambda data, size, name, uuid16, uuid128: uuid16 == 0x5183 and size in (0x11, 0x2A), _sensor),
+    ("govee", lambda data, size, name, uuid16, uuid128: uuid16 == 0x5185 and size in (0x17, 0x30), _sensor),
+    (
+        "thermoplus",
+        lambda data, size, name, uuid16, uuid128: uuid16 == 0xF0FF
+        and ((data[3] << 8) | data[2]) in (0x0010, 0x0011, 0x0015)
+        and size in (0x15, 0x17),
+        _sensor,
+    ),
+    (
+        "inkbird",
+        lambda data, size, name, uuid16, uuid128: uuid16 == 0xF0FF
+        and (((data[3] << 8) | data[2]) in (0x0000, 0x0001) or name in ("iBBQ", "sps", "tps"))
+        and size in (0x0A, 0x0D, 0x0F, 0x13, 0x17),
+        _with_local_name,
+    ),
+    # service class uuid128
+    (
+        "sensorpush",
+        lambda data, size, name, uuid16, uuid128: uuid128 == SENSORPUSH_UUID128 and size in (0x06, 0x08),
+        _sensor,
+    ),
+    # complete local name
+    ("inkbird", lambda data, size, name, *_: name in ("sps", "tps") and size == 0x0A, _with_local_name),
+    ("thermopro", lambda data, size, name, *_: name[0:5] in ("TP357", "TP359") and size == 0x07, _thermopro),
+    # other parts of the manufacturer specific data
+    ("altbeacon", lambda data, size, *_: size == 0x1B and ((data[4] << 8) | data[5]) == 0xBEAC, _altbeacon),
+    ("acconeer", lambda data, size, *_: size == 0x12 and ((data[3] << 8) | data[2]) == 0xACC0, _sensor),
+)
+
+
+def load_parser(vendor):
+    """Import the module of a vendor and return its parse function."""
+    module = import_module(f".{vendor}", __package__)
+    return getattr(module, f"parse_{vendor}")
+
+
+class LazyParser:
+    """Parse function of a vendor, the vendor module is imported on the first call."""
+
+    __slots__ = ("vendor", "parse")
+
+    def __init__(self, vendor):
+        """Initialize the parse function."""
+        self.vendor = vendor
+        self.parse = None
+
+    def __call__(self, *args):
+        """Call the parse function of the vendor."""
+        parse = self.parse
+        if parse is None:
+            parse = self.parse = load_parser(self.vendor)
+        return parse(*args)
+
+
+def build_dispatch(vendors=None):
+    """Build the dispatch tables for the enabled vendors (default all vendors).
+
+    Returns the service data rules per UUID16, the manufacturer specific data
+    rules per company identifier and the other manufacturer specific data rules.
+    """
+    enabled = VENDORS if vendors is None else set(vendors)
+    unknown = set(enabled) - set(VENDORS)
+    if unknown:
+        raise ValueError(f"Unknown vendor(s): {', '.join(sorted(unknown))}")
+    parsers = {}
+
+    def handler(vendor, make_handler):
+        if vendor not in parsers:
+            parsers[vendor] = LazyParser(vendor)
+        return make_handler(parsers[vendor])
+
+    service_data_rules = {}
+    for uuid16s, vendor, predicate, make_handler in SERVICE_DATA_RULES:
+        if vendor in enabled:
+            rule = (predicate, handler(vendor, make_handler))
+            for uuid16 in uuid16s:
+                service_data_rules.setdefault(uuid16, []).append(rule)
+
+    comp_id_rules = {}
+    for comp_ids, vendor, predicate, make_handler in COMP_ID_RULES:
+        if vendor in enabled:
+            rule = (predicate, handler(vendor, make_handler))
+            for comp_id in comp_ids:
+                comp_id_rules.setdefault(comp_id, []).append(rule)
+
+    manufacturer_rules = [
+        (predicate, handler(vendor, make_handler))
+        for vendor, predicate, make_handler in MANUFACTURER_RULES
+        if vendor in enabled
+    ]
+    return service_data_rules, comp_id_rules, manufacturer_rules
@@ -2,6 +2,7 @@
 import logging
 from struct import unpack
 from .helpers import (
+    HexDump,
     to_mac,
     to_unformatted_mac,
 )
@@ -18,7 +19,7 @@ def parse_xiaogui(self, data, source_mac, rssi):
         xiaogui_mac = data[11:]
 
         if xiaogui_mac != source_mac:
-            _LOGGER.error("Xiaogui MAC address doesn't match data MAC address. Data: %s", data.hex())
+            _LOGGER.error("Xiaogui MAC address doesn't match data MAC address. Data: %s", HexDump(data))
             return None
 
         result = {
@@ -62,7 +63,7 @@ def parse_xiaogui(self, data, source_mac, rssi):
             _LOGGER.error(
                 "Stabilized byte of Xiaogui scale is reporting a new value, "
                 "please report an issue to the developers with this error: Payload is %s",
-                data.hex()
+                HexDump(data)
             )
             device_type = None
     else:
@@ -73,7 +74,7 @@ def parse_xiaogui(self, data, source_mac, rssi):
             _LOGGER.info(
                 "BLE ADV from UNKNOWN Xiaogui DEVICE: MAC: %s, ADV: %s",
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
         return None
     else:
@@ -2,14 +2,15 @@
 import logging
 import math
 import struct
-from Cryptodome.Cipher import AES
-
-from homeassistant.util import datetime
+from datetime import datetime
 
 from .helpers import (
+    HexDump,
+    aes_ccm,
     to_mac,
     to_unformatted_mac,
 )
+from .reading import Reading
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -79,6 +80,8 @@ M_STRUCT = struct.Struct("<L")
 P_STRUCT = struct.Struct("<H")
 BUTTON_STRUCT = struct.Struct("<BBB")
 FLOAT_STRUCT = struct.Struct("<f")
+B_STRUCT = struct.Struct("<B")
+BB_STRUCT = struct.Struct("<BB")
 
 # Definition of lock messages
 BLE_LOCK_ERROR = {
@@ -137,6 +140,109 @@ BLE_LOCK_METHOD = {
 }
 
 
+# Results of the fingerprint reader
+FINGERPRINT_RESULTS = {
+    0x00: "match successful",
+    0x01: "match failed",
+    0x02: "timeout",
+    0x033: "low quality (too light, fuzzy)",
+    0x04: "insufficient area",
+    0x05: "skin is too dry",
+    0x06: "skin is too wet",
+}
+
+# Door actions
+# {door byte: (door, action)}
+DOOR_ACTIONS = {
+    0x00: (1, "open the door"),
+    0x01: (0, "close the door"),
+    0x02: (1, "timeout, not closed"),
+    0x03: (0, "knock on the door"),
+    0x04: (1, "pry the door"),
+    0x05: (0, "door stuck"),
+}
+
+# Door/window sensor states
+# {open byte: (opening, status)}
+OPENING_STATUS = {
+    0: (1, "opened"),
+    1: (0, "closed"),
+    2: (1, "closing timeout"),
+    3: (1, "device reset"),
+}
+
+# Commands of the remotes per button type
+REMOTE_COMMANDS = {0: "on", 1: "off", 2: "sun", 3: "+", 4: "m", 5: "-"}
+FAN_REMOTE_COMMANDS = {
+    0: "fan toggle",
+    1: "light toggle",
+    2: "wind speed",
+    3: "color temperature",
+    4: "wind mode",
+    5: "brightness",
+}
+VEN_FAN_REMOTE_COMMANDS = {
+    0: "swing",
+    1: "power toggle",
+    2: "timer 60 minutes",
+    3: "strong wind speed",
+    4: "timer 30 minutes",
+    5: "low wind speed",
+}
+BATHROOM_REMOTE_COMMANDS = {
+    0: "stop",
+    1: "air exchange",
+    2: "fan",
+    3: "speed +",
+    4: "speed -",
+    5: "dry",
+    6: "light toggle",
+    7: "swing",
+    8: "heat",
+}
+REMOTE_BINARY = {0: 1, 1: 0, 3: 1, 5: 1}
+CUBE_DIRECTIONS = {0: "right", 1: "left"}
+
+# Remotes that report a command and the press type
+# {device type: (measurement, commands per button type)}
+REMOTES = {
+    "YLYK01YL-FANRC": ("fan remote", FAN_REMOTE_COMMANDS),
+    "YLYK01YL-VENFAN": ("ventilator fan remote", VEN_FAN_REMOTE_COMMANDS),
+    "YLYB01YL-BHFRC": ("bathroom heater remote", BATHROOM_REMOTE_COMMANDS),
+}
+
+# Buttons of the wall switches that are toggled per button type
+# {device type: {button type: buttons}}
+SWITCH_BUTTONS = {
+    "K9B-2BTN": {
+        0: ("two btn switch left",),
+        1: ("two btn switch right",),
+        2: ("two btn switch left", "two btn switch right"),
+    },
+    "K9B-3BTN": {
+        0: ("three btn switch left",),
+        1: ("three btn switch middle",),
+        2: ("three btn switch right",),
+        3: ("three btn switch left", "three btn switch middle"),
+        4: ("three btn switch middle", "three btn switch right"),
+        5: ("three btn switch left", "three btn switch right"),
+        6: ("three btn switch left", "three btn switch middle", "three btn switch right"),
+    },
+}
+
+# Buttons of the two button switch per click byte
+TWO_BTN_SWITCH_CLICKS = {
+    1: ("two btn switch left",),
+    2: ("two btn switch right",),
+    3: ("two btn switch left", "two btn switch right"),
+}
+
+# Press types per press byte, press 3 and 4 depend on the button type
+BUTTON_PRESS_TYPES = {0: "single press", 1: "double press", 2: "long press", 5: "short press", 6: "long press"}
+SWITCH_PRESS_TYPES = {0: "single press", 1: "long press", 2: "double press"}
+BUTTON_DEVICES = ("RTCGQ02LM", "YLAI003", "JTYJGD03MI", "SJWS01LM")
+
+
 # Advertisement conversion of measurement data
 # https://iot.mi.com/new/doc/embedded-development/ble/object-definition
 def obj0003(xobj):
@@ -155,28 +261,10 @@ def obj0006(xobj):
             key_id = "unknown operator"
         else:
             key_id = int.from_bytes(key_id, 'little')
-        if match_byte == 0x00:
-            result = "match successful"
-        elif match_byte == 0x01:
-            result = "match failed"
-        elif match_byte == 0x02:
-            result = "timeout"
-        elif match_byte == 0x033:
-            result = "low quality (too light, fuzzy)"
-        elif match_byte == 0x04:
-            result = "insufficient area"
-        elif match_byte == 0x05:
-            result = "skin is too dry"
-        elif match_byte == 0x06:
-            result = "skin is too wet"
-        else:
-            result = None
-
-        fingerprint = 1 if match_byte == 0x00 else 0
 
         return {
-            "fingerprint": fingerprint,
-            "result": result,
+            "fingerprint": 1 if match_byte == 0x00 else 0,
+            "result": FINGERPRINT_RESULTS.get(match_byte),
             "key id": key_id,
         }
     else:
@@ -185,26 +273,9 @@ def obj0006(xobj):
 
 def obj0007(xobj):
     """Door"""
-    door_byte = xobj[0]
-    if door_byte == 0x00:
-        action = "open the door"
-        door = 1
-    elif door_byte == 0x01:
-        action = "close the door"
-        door = 0
-    elif door_byte == 0x02:
-        action = "timeout, not closed"
-        door = 1
-    elif door_byte == 0x03:
-        action = "knock on the door"
-        door = 0
-    elif door_byte == 0x04:
-        action = "pry the door"
-        door = 1
-    elif door_byte == 0x05:
-        action = "door stuck"
-        door = 0
-    else:
+    try:
+        door, action = DOOR_ACTIONS[xobj[0]]
+    except KeyError:
         return {}
     return {"door": door, "door action": action}
 
@@ -311,199 +382,63 @@ def obj000f(xobj, device_type):
         return {}
 
 
+def button_press(button_type, value, press):
+    """Return the press type and the dimmer value of a button"""
+    if press == 3:
+        if button_type == 0:
+            return "short press", value
+        if button_type == 1:
+            return "long press", value
+        return "no press", None
+    if press == 4:
+        if button_type == 0:
+            if value <= 127:
+                return "rotate right", value
+            return "rotate left", 256 - value
+        if button_type <= 127:
+            return "rotate right (pressed)", button_type
+        return "rotate left (pressed)", 256 - button_type
+    return BUTTON_PRESS_TYPES.get(press, "no press"), None
+
+
 def obj1001(xobj, device_type):
     """button"""
-    if len(xobj) == 3:
-        (button_type, value, press) = BUTTON_STRUCT.unpack(xobj)
-
-        # remote command and remote binary
-        remote_command = None
-        fan_remote_command = None
-        ven_fan_remote_command = None
-        bathroom_remote_command = None
-        one_btn_switch = None
-        two_btn_switch_left = None
-        two_btn_switch_right = None
-        three_btn_switch_left = None
-        three_btn_switch_middle = None
-        three_btn_switch_right = None
-        cube_direction = None
-        remote_binary = None
-
-        if button_type == 0:
-            remote_command = "on"
-            fan_remote_command = "fan toggle"
-            ven_fan_remote_command = "swing"
-            bathroom_remote_command = "stop"
-            one_btn_switch = "toggle"
-            two_btn_switch_left = "toggle"
-            three_btn_switch_left = "toggle"
-            cube_direction = "right"
-            remote_binary = 1
-        elif button_type == 1:
-            remote_command = "off"
-            fan_remote_command = "light toggle"
-            ven_fan_remote_command = "power toggle"
-            bathroom_remote_command = "air exchange"
-            two_btn_switch_right = "toggle"
-            three_btn_switch_middle = "toggle"
-            cube_direction = "left"
-            remote_binary = 0
-        elif button_type == 2:
-            remote_command = "sun"
-            fan_remote_command = "wind speed"
-            ven_fan_remote_command = "timer 60 minutes"
-            bathroom_remote_command = "fan"
-            two_btn_switch_left = "toggle"
-            two_btn_switch_right = "toggle"
-            three_btn_switch_right = "toggle"
-            remote_binary = None
-        elif button_type == 3:
-            remote_command = "+"
-            fan_remote_command = "color temperature"
-            ven_fan_remote_command = "strong wind speed"
-            bathroom_remote_command = "speed +"
-            three_btn_switch_left = "toggle"
-            three_btn_switch_middle = "toggle"
-            remote_binary = 1
-        elif button_type == 4:
-            remote_command = "m"
-            fan_remote_command = "wind mode"
-            ven_fan_remote_command = "timer 30 minutes"
-            bathroom_remote_command = "speed -"
-            three_btn_switch_middle = "toggle"
-            three_btn_switch_right = "toggle"
-            remote_binary = None
-        elif button_type == 5:
-            remote_command = "-"
-            fan_remote_command = "brightness"
-            ven_fan_remote_command = "low wind speed"
-            bathroom_remote_command = "dry"
-            three_btn_switch_left = "toggle"
-            three_btn_switch_right = "toggle"
-            remote_binary = 1
-        elif button_type == 6:
-            bathroom_remote_command = "light toggle"
-            three_btn_switch_left = "toggle"
-            three_btn_switch_middle = "toggle"
-            three_btn_switch_right = "toggle"
-        elif button_type == 7:
-            bathroom_remote_command = "swing"
-        elif button_type == 8:
-            bathroom_remote_command = "heat"
-
-        # press type and dimmer
-        button_press_type = "no press"
-        btn_switch_press_type = "no press"
-        dimmer = None
-
-        if press == 0:
-            button_press_type = "single press"
-            btn_switch_press_type = "single press"
-        elif press == 1:
-            button_press_type = "double press"
-            btn_switch_press_type = "long press"
-        elif press == 2:
-            button_press_type = "long press"
-            btn_switch_press_type = "double press"
-        elif press == 3:
-            if button_type == 0:
-                button_press_type = "short press"
-                dimmer = value
-            if button_type == 1:
-                button_press_type = "long press"
-                dimmer = value
-        elif press == 4:
-            if button_type == 0:
-                if value <= 127:
-                    button_press_type = "rotate right"
-                    dimmer = value
-                else:
-                    button_press_type = "rotate left"
-                    dimmer = 256 - value
-            elif button_type <= 127:
-                button_press_type = "rotate right (pressed)"
-                dimmer = button_type
+    if len(xobj) != 3:
+        return None
+    (button_type, value, press) = BUTTON_STRUCT.unpack(xobj)
+
+    # return device specific output
+    if device_type in BUTTON_DEVICES:
+        return {"button": button_press(button_type, value, press)[0]}
+    if device_type == "XMMF01JQD":
+        return {"button": CUBE_DIRECTIONS.get(button_type)}
+    if device_type == "YLYK01YL":
+        button_press_type = button_press(button_type, value, press)[0]
+        result = {"remote": REMOTE_COMMANDS.get(button_type), "button": button_press_type}
+        remote_binary = REMOTE_BINARY.get(button_type)
+        if remote_binary is not None:
+            if button_press_type == "single press":
+                result["remote single press"] = remote_binary
             else:
-                button_press_type = "rotate left (pressed)"
-                dimmer = 256 - button_type
-        elif press == 5:
-            button_press_type = "short press"
-        elif press == 6:
-            button_press_type = "long press"
-
-        # return device specific output
-        result = {}
-        if device_type in ["RTCGQ02LM", "YLAI003", "JTYJGD03MI", "SJWS01LM"]:
-            result["button"] = button_press_type
-        elif device_type == "XMMF01JQD":
-            result["button"] = cube_direction
-        elif device_type == "YLYK01YL":
-            result["remote"] = remote_command
-            result["button"] = button_press_type
-            if remote_binary is not None:
-                if button_press_type == "single press":
-                    result["remote single press"] = remote_binary
-                else:
-                    result["remote long press"] = remote_binary
-        elif device_type == "YLYK01YL-FANRC":
-            result["fan remote"] = fan_remote_command
-            result["button"] = button_press_type
-        elif device_type == "YLYK01YL-VENFAN":
-            result["ventilator fan remote"] = ven_fan_remote_command
-            result["button"] = button_press_type
-        elif device_type == "YLYB01YL-BHFRC":
-            result["bathroom heater remote"] = bathroom_remote_command
-            result["button"] = button_press_type
-        elif device_type == "YLKG07YL/YLKG08YL":
-            result["dimmer"] = dimmer
-            result["button"] = button_press_type
-        elif device_type == "K9B-1BTN":
-            result["button switch"] = btn_switch_press_type
-            result["one btn switch"] = one_btn_switch
-        elif device_type == "K9B-2BTN":
-            result["button switch"] = btn_switch_press_type
-            if two_btn_switch_left:
-                result["two btn switch left"] = two_btn_switch_left
-            if two_btn_switch_right:
-                result["two btn switch right"] = two_btn_switch_right
-        elif device_type == "K9B-3BTN":
-            result["button switch"] = btn_switch_press_type
-            if three_btn_switch_left:
-                result["three btn switch left"] = three_btn_switch_left
-            if three_btn_switch_middle:
-                result["three btn switch middle"] = three_btn_switch_middle
-            if three_btn_switch_right:
-                result["three btn switch right"] = three_btn_switch_right
-        else:
-            return None
+                result["remote long press"] = remote_binary
         return result
-
-    else:
-        return None
-
-
-def obj1004(xobj):
-    """Temperature"""
-    if len(xobj) == 2:
-        (temp,) = T_STRUCT.unpack(xobj)
-        return {"temperature": temp / 10}
-    else:
-        return {}
-
-
-def obj1005(xobj):
-    """Switch and Temperature"""
-    return {"switch": xobj[0], "temperature": xobj[1]}
-
-
-def obj1006(xobj):
-    """Humidity"""
-    if len(xobj) == 2:
-        (humi,) = H_STRUCT.unpack(xobj)
-        return {"humidity": humi / 10}
-    else:
-        return {}
+    if device_type in REMOTES:
+        measurement, commands = REMOTES[device_type]
+        return {measurement: commands.get(button_type), "button": button_press(button_type, value, press)[0]}
+    if device_type == "YLKG07YL/YLKG08YL":
+        button_press_type, dimmer = button_press(button_type, value, press)
+        return {"dimmer": dimmer, "button": button_press_type}
+    if device_type == "K9B-1BTN":
+        return {
+            "button switch": SWITCH_PRESS_TYPES.get(press, "no press"),
+            "one btn switch": "toggle" if button_type == 0 else None,
+        }
+    if device_type in SWITCH_BUTTONS:
+        result = {"button switch": SWITCH_PRESS_TYPES.get(press, "no press")}
+        for button in SWITCH_BUTTONS[device_type].get(button_type, ()):
+            result[button] = "toggle"
+        return result
+    return None
 
 
 def obj1007(xobj):
@@ -515,49 +450,6 @@ def obj1007(xobj):
         return {}
 
 
-def obj1008(xobj):
-    """Moisture"""
-    return {"moisture": xobj[0]}
-
-
-def obj1009(xobj):
-    """Conductivity"""
-    if len(xobj) == 2:
-        (cond,) = CND_STRUCT.unpack(xobj)
-        return {"conductivity": cond}
-    else:
-        return {}
-
-
-def obj1010(xobj):
-    """Formaldehyde"""
-    if len(xobj) == 2:
-        (fmdh,) = FMDH_STRUCT.unpack(xobj)
-        return {"formaldehyde": fmdh / 100}
-    else:
-        return {}
-
-
-def obj1012(xobj):
-    """Switch"""
-    return {"switch": xobj[0]}
-
-
-def obj1013(xobj):
-    """Consumable (in percent)"""
-    return {"consumable": xobj[0]}
-
-
-def obj1014(xobj):
-    """Moisture"""
-    return {"moisture": xobj[0]}
-
-
-def obj1015(xobj):
-    """Smoke"""
-    return {"smoke detector": xobj[0]}
-
-
 def obj1017(xobj):
     """Motion"""
     if len(xobj) == 4:
@@ -569,29 +461,9 @@ def obj1017(xobj):
         return {}
 
 
-def obj1018(xobj):
-    """Light intensity"""
-    return {"light": xobj[0]}
-
-
 def obj1019(xobj):
     """Door/Window sensor"""
-    open_obj = xobj[0]
-    if open_obj == 0:
-        opening = 1
-        status = "opened"
-    elif open_obj == 1:
-        opening = 0
-        status = "closed"
-    elif open_obj == 2:
-        opening = 1
-        status = "closing timeout"
-    elif open_obj == 3:
-        opening = 1
-        status = "device reset"
-    else:
-        opening = 0
-        status = None
+    opening, status = OPENING_STATUS.get(xobj[0], (0, None))
     return {"opening": opening, "status": status}
 
 
@@ -602,15 +474,6 @@ def obj100a(xobj):
     return {"battery": batt, "voltage": volt}
 
 
-def obj100d(xobj):
-    """Temperature and humidity"""
-    if len(xobj) == 4:
-        (temp, humi) = TH_STRUCT.unpack(xobj)
-        return {"temperature": temp / 10, "humidity": humi / 10}
-    else:
-        return {}
-
-
 def obj100e(xobj, device_type):
     """Lock common attribute"""
     # https://iot.mi.com/new/doc/accesses/direct-access/embedded-development/ble/object-definition#%E9%94%81%E5%B1%9E%E6%80%A7
@@ -639,157 +502,119 @@ def obj2000(xobj):
         return {}
 
 
-# The following data objects are device specific. For now only added for LYWSD02MMC, XMWSDJ04MMC, XMWXKG01YL
-# https://miot-spec.org/miot-spec-v2/instances?status=all
-def obj4803(xobj):
-    """Battery"""
-    batt = xobj[0]
-    return {"battery": batt}
-
-
-def obj4a01(xobj):
-    """Low Battery"""
-    low_batt = xobj[0]
-    return {"low battery": low_batt}
-
-
-def obj4c02(xobj):
-    """Humidity"""
-    if len(xobj) == 1:
-        humi = xobj[0]
-        return {"humidity": humi}
-    else:
-        return {}
-
-
-def obj4c01(xobj):
-    """Temperature"""
-    if len(xobj) == 4:
-        temp = FLOAT_STRUCT.unpack(xobj)[0]
-        return {"temperature": temp}
-    else:
-        return {}
-
-
-def obj4c08(xobj):
-    """Humidity"""
-    if len(xobj) == 4:
-        humi = FLOAT_STRUCT.unpack(xobj)[0]
-        return {"humidity": humi}
-    else:
-        return {}
-
-
-def obj4c14(xobj):
-    """Mode"""
-    mode = xobj[0]
-    return {"mode": mode}
+def two_btn_switch_click(click, press_type):
+    """Return the buttons of a two button switch that are clicked"""
+    buttons = TWO_BTN_SWITCH_CLICKS.get(click)
+    result = {
+        "two btn switch left": None,
+        "two btn switch right": None,
+        "button switch": press_type if buttons else None,
+    }
+    for button in buttons or ():
+        result[button] = "toggle"
+    return result
 
 
+# The following data objects are device specific. For now only added for LYWSD02MMC, XMWSDJ04MMC, XMWXKG01YL
+# https://miot-spec.org/miot-spec-v2/instances?status=all
 def obj4e0c(xobj):
     """Click"""
-    click = xobj[0]
-    btn_switch_press_type = "single press"
-    two_btn_switch_left = None
-    two_btn_switch_right = None
-    if click == 1:
-        two_btn_switch_left = "toggle"
-    elif click == 2:
-        two_btn_switch_right = "toggle"
-    elif click == 3:
-        two_btn_switch_left = "toggle"
-        two_btn_switch_right = "toggle"
-    else:
-        btn_switch_press_type = None
-    return {
-        "two btn switch left": two_btn_switch_left,
-        "two btn switch right": two_btn_switch_right,
-        "button switch": btn_switch_press_type,
-    }
+    return two_btn_switch_click(xobj[0], "single press")
 
 
 def obj4e0d(xobj):
     """Double Click"""
-    click = xobj[0]
-    btn_switch_press_type = "double press"
-    two_btn_switch_left = None
-    two_btn_switch_right = None
-    if click == 1:
-        two_btn_switch_left = "toggle"
-    elif click == 2:
-        two_btn_switch_right = "toggle"
-    elif click == 3:
-        two_btn_switch_left = "toggle"
-        two_btn_switch_right = "toggle"
-    else:
-        btn_switch_press_type = None
-    return {
-        "two btn switch left": two_btn_switch_left,
-        "two btn switch right": two_btn_switch_right,
-        "button switch": btn_switch_press_type,
-    }
+    return two_btn_switch_click(xobj[0], "double press")
 
 
 def obj4e0e(xobj):
     """Long Press"""
-    click = xobj[0]
-    btn_switch_press_type = "long press"
-    two_btn_switch_left = None
-    two_btn_switch_right = None
-    if click == 1:
-        two_btn_switch_left = "toggle"
-    elif click == 2:
-        two_btn_switch_right = "toggle"
-    elif click == 3:
-        two_btn_switch_left = "toggle"
-        two_btn_switch_right = "toggle"
-    else:
-        btn_switch_press_type = None
-    return {
-        "two btn switch left": two_btn_switch_left,
-        "two btn switch right": two_btn_switch_right,
-        "button switch": btn_switch_press_type,
-    }
+    return two_btn_switch_click(xobj[0], "long press")
+
+
+# Data objects with numeric values, decoded with one unpack
+# {data object id: (struct, length, ((measurement, divisor), ...))}
+# The length is the required length of the object, or None if the object can be longer than the struct.
+# Each value is divided by its divisor, values without divisor are kept as integer.
+XIAOMI_MEASUREMENT_OBJECTS = {
+    0x1004: (T_STRUCT, 2, (("temperature", 10),)),
+    0x1005: (BB_STRUCT, None, (("switch", None), ("temperature", None))),
+    0x1006: (H_STRUCT, 2, (("humidity", 10),)),
+    0x1008: (B_STRUCT, None, (("moisture", None),)),
+    0x1009: (CND_STRUCT, 2, (("conductivity", None),)),
+    0x1010: (FMDH_STRUCT, 2, (("formaldehyde", 100),)),
+    0x1012: (B_STRUCT, None, (("switch", None),)),
+    0x1013: (B_STRUCT, None, (("consumable", None),)),
+    0x1014: (B_STRUCT, None, (("moisture", None),)),
+    0x1015: (B_STRUCT, None, (("smoke detector", None),)),
+    0x1018: (B_STRUCT, None, (("light", None),)),
+    0x100D: (TH_STRUCT, 4, (("temperature", 10), ("humidity", 10))),
+    0x4803: (B_STRUCT, None, (("battery", None),)),
+    0x4a01: (B_STRUCT, None, (("low battery", None),)),
+    0x4c01: (FLOAT_STRUCT, 4, (("temperature", None),)),
+    0x4c02: (B_STRUCT, 1, (("humidity", None),)),
+    0x4c08: (FLOAT_STRUCT, 4, (("humidity", None),)),
+    0x4c14: (B_STRUCT, None, (("mode", None),)),
+}
+
+# Data objects with a converter
+# {data object id: (converter, converter needs device type)}
+XIAOMI_CONVERTER_OBJECTS = {
+    0x0003: (obj0003, False),
+    0x0006: (obj0006, False),
+    0x0007: (obj0007, False),
+    0x0008: (obj0008, True),
+    0x0010: (obj0010, False),
+    0x000B: (obj000b, True),
+    0x000F: (obj000f, True),
+    0x1001: (obj1001, True),
+    0x1007: (obj1007, False),
+    0x1017: (obj1017, False),
+    0x1019: (obj1019, False),
+    0x100A: (obj100a, False),
+    0x100E: (obj100e, True),
+    0x2000: (obj2000, False),
+    0x4e0c: (obj4e0c, False),
+    0x4e0d: (obj4e0d, False),
+    0x4e0e: (obj4e0e, False),
+}
+
 
+def measurement_converter(obj_struct, length, fields):
+    """Return a converter for a data object with numeric values"""
+    unpack = obj_struct.unpack_from
+    min_length = obj_struct.size
+    max_length = 0xFF if length is None else length
+    if len(fields) == 1:
+        ((measurement, divisor),) = fields
 
-# Dataobject dictionary
-# {dataObject_id: (converter}
-xiaomi_dataobject_dict = {
-    0x0003: obj0003,
-    0x0006: obj0006,
-    0x0007: obj0007,
-    0x0008: obj0008,
-    0x0010: obj0010,
-    0x000B: obj000b,
-    0x000F: obj000f,
-    0x1001: obj1001,
-    0x1004: obj1004,
-    0x1005: obj1005,
-    0x1006: obj1006,
-    0x1007: obj1007,
-    0x1008: obj1008,
-    0x1009: obj1009,
-    0x1010: obj1010,
-    0x1012: obj1012,
-    0x1013: obj1013,
-    0x1014: obj1014,
-    0x1015: obj1015,
-    0x1017: obj1017,
-    0x1018: obj1018,
-    0x1019: obj1019,
-    0x100A: obj100a,
-    0x100D: obj100d,
-    0x100E: obj100e,
-    0x2000: obj2000,
-    0x4803: obj4803,
-    0x4a01: obj4a01,
-    0x4c01: obj4c01,
-    0x4c02: obj4c02,
-    0x4c08: obj4c08,
-    0x4c14: obj4c14,
-    0x4e0c: obj4e0c,
-    0x4e0d: obj4e0d,
-    0x4e0e: obj4e0e,
+        def converter(xobj):
+            if not min_length <= len(xobj) <= max_length:
+                return None
+            (value,) = unpack(xobj)
+            return {measurement: value if divisor is None else value / divisor}
+    else:
+        ((first, first_divisor), (second, second_divisor)) = fields
+
+        def converter(xobj):
+            if not min_length <= len(xobj) <= max_length:
+                return None
+            (first_value, second_value) = unpack(xobj)
+            return {
+                first: first_value if first_divisor is None else first_value / first_divisor,
+                second: second_value if second_divisor is None else second_value / second_divisor,
+            }
+    return converter
+
+
+# All data objects, a single lookup returns the converter of a data object
+# {data object id: (converter, converter needs device type)}
+XIAOMI_DATA_OBJECTS = {
+    **XIAOMI_CONVERTER_OBJECTS,
+    **{
+        obj_typecode: (measurement_converter(*descriptor), False)
+        for obj_typecode, descriptor in XIAOMI_MEASUREMENT_OBJECTS.items()
+    },
 }
 
 
@@ -799,42 +624,38 @@ def parse_xiaomi(self, data, source_mac, rssi):
     i = 9  # till Frame Counter
     msg_length = len(data)
     if msg_length < i:
-        _LOGGER.debug("Invalid data length (initial check), adv: %s", data.hex())
+        _LOGGER.debug("Invalid data length (initial check), adv: %s", HexDump(data))
         return None
 
     # extract frame control bits
     frctrl = data[4] + (data[5] << 8)
     frctrl_mesh = (frctrl >> 7) & 1  # mesh device
     frctrl_version = frctrl >> 12  # version
-    frctrl_auth_mode = (frctrl >> 10) & 3
-    frctrl_solicited = (frctrl >> 9) & 1
-    frctrl_registered = (frctrl >> 8) & 1
     frctrl_object_include = (frctrl >> 6) & 1
     frctrl_capability_include = (frctrl >> 5) & 1
     frctrl_mac_include = (frctrl >> 4) & 1  # check for MAC address in data
     frctrl_is_encrypted = (frctrl >> 3) & 1  # check for encryption being used
-    frctrl_request_timing = frctrl & 1  # old version
 
     # Check that device is not of mesh type
     if frctrl_mesh != 0:
-        _LOGGER.debug("Xiaomi device data is a mesh type device, which is not supported. Data: %s", data.hex())
+        _LOGGER.debug("Xiaomi device data is a mesh type device, which is not supported. Data: %s", HexDump(data))
         return None
 
     # Check that version is 2 or higher
     if frctrl_version < 2:
-        _LOGGER.debug("Xiaomi device data is using old data format, which is not supported. Data: %s", data.hex())
+        _LOGGER.debug("Xiaomi device data is using old data format, which is not supported. Data: %s", HexDump(data))
         return None
 
     # Check that MAC in data is the same as the source MAC
     if frctrl_mac_include != 0:
         i += 6
         if msg_length < i:
-            _LOGGER.debug("Invalid data length (in MAC check), adv: %s", data.hex())
+            _LOGGER.debug("Invalid data length (in MAC check), adv: %s", HexDump(data))
             return None
         xiaomi_mac_reversed = data[9:15]
         xiaomi_mac = xiaomi_mac_reversed[::-1]
         if xiaomi_mac != source_mac:
-            _LOGGER.debug("Xiaomi MAC address doesn't match data MAC address. Data: %s", data.hex())
+            _LOGGER.debug("Xiaomi MAC address doesn't match data MAC address. Data: %s", HexDump(data))
             return None
     else:
         xiaomi_mac = source_mac
@@ -849,31 +670,13 @@ def parse_xiaomi(self, data, source_mac, rssi):
                 "BLE ADV from UNKNOWN Xiaomi device: RSSI: %s, MAC: %s, ADV: %s",
                 rssi,
                 to_mac(source_mac),
-                data.hex()
+                HexDump(data)
             )
-        _LOGGER.debug("Unknown Xiaomi device found. Data: %s", data.hex())
+        _LOGGER.debug("Unknown Xiaomi device found. Data: %s", HexDump(data))
         return None
 
     packet_id = data[8]
 
-    sinfo = 'MiVer: ' + str(frctrl_version)
-    sinfo += ', DevID: ' + hex(device_id) + ' : ' + device_type
-    sinfo += ', FnCnt: ' + str(packet_id)
-    if frctrl_request_timing != 0:
-        sinfo += ', Request timing'
-    if frctrl_registered != 0:
-        sinfo += ', Registered and bound'
-    else:
-        sinfo += ', Not bound'
-    if frctrl_solicited != 0:
-        sinfo += ', Request APP to register and bind'
-    if frctrl_auth_mode == 0:
-        sinfo += ', Old version certification'
-    elif frctrl_auth_mode == 1:
-        sinfo += ', Safety certification'
-    elif frctrl_auth_mode == 2:
-        sinfo += ', Standard certification'
-
     # check for MAC presence in sensor whitelist, if needed
     if self.discovery is False and xiaomi_mac not in self.sensor_whitelist:
         _LOGGER.debug("Discovery is disabled. MAC: %s is not whitelisted!", to_mac(xiaomi_mac))
@@ -922,23 +725,19 @@ def parse_xiaomi(self, data, source_mac, rssi):
     if frctrl_capability_include != 0:
         i += 1
         if msg_length < i:
-            _LOGGER.debug("Invalid data length (in capability check), adv: %s", data.hex())
+            _LOGGER.debug("Invalid data length (in capability check), adv: %s", HexDump(data))
             return None
         capability_types = data[i - 1]
-        sinfo += ', Capability: ' + hex(capability_types)
         if (capability_types & 0x20) != 0:
             i += 1
             if msg_length < i:
-                _LOGGER.debug("Invalid data length (in capability type check), adv: %s", data.hex())
+                _LOGGER.debug("Invalid data length (in capability type check), adv: %s", HexDump(data))
                 return None
-            capability_io = data[i - 1]
-            sinfo += ', IO: ' + hex(capability_io)
 
     # check that data contains object
     if frctrl_object_include != 0:
         # check for encryption
         if frctrl_is_encrypted != 0:
-            sinfo += ', Encryption'
             firmware = "Xiaomi (MiBeacon V" + str(frctrl_version) + " encrypted)"
             if frctrl_version <= 3:
                 payload = decrypt_mibeacon_legacy(self, data, i, xiaomi_mac)
@@ -947,28 +746,20 @@ def parse_xiaomi(self, data, source_mac, rssi):
         else:   # No encryption
             # check minimum advertisement length with data
             firmware = "Xiaomi (MiBeacon V" + str(frctrl_version) + ")"
-            sinfo += ', No encryption'
             if msg_length < i + 3:
-                _LOGGER.debug("Invalid data length (in non-encrypted data), adv: %s", data.hex())
+                _LOGGER.debug("Invalid data length (in non-encrypted data), adv: %s", HexDump(data))
                 return None
             payload = data[i:]
     else:
         # data does not contain Object
-        _LOGGER.debug("Advertisement doesn't contain payload, adv: %s", data.hex())
+        _LOGGER.debug("Advertisement doesn't contain payload, adv: %s", HexDump(data))
         return None
 
-    result = {
-        "rssi": rssi,
-        "mac": to_unformatted_mac(xiaomi_mac),
-        "type": device_type,
-        "packet": packet_id,
-        "firmware": firmware,
-        "data": False,
-    }
+    result = Reading(rssi, to_unformatted_mac(xiaomi_mac), device_type, packet_id, firmware, data=False)
 
     if payload is not None:
-        result.update({"data": True})
-        sinfo += ', Object data: ' + payload.hex()
+        result.data = True
+        measurements = result.measurements
         # loop through parse_xiaomi payload
         payload_start = 0
         payload_length = len(payload)
@@ -978,29 +769,71 @@ def parse_xiaomi(self, data, source_mac, rssi):
             obj_length = payload[payload_start + 2]
             next_start = payload_start + 3 + obj_length
             if payload_length < next_start:
-                _LOGGER.debug("Invalid payload data length, payload: %s", payload.hex())
+                _LOGGER.debug("Invalid payload data length, payload: %s", HexDump(payload))
                 break
             dobject = payload[payload_start + 3:next_start]
             if obj_length != 0:
-                resfunc = xiaomi_dataobject_dict.get(obj_typecode, None)
-                if resfunc:
-                    if hex(obj_typecode) in ["0x8", "0x100e", "0x1001", "0xf", "0xb"]:
-                        result.update(resfunc(dobject, device_type))
+                data_object = XIAOMI_DATA_OBJECTS.get(obj_typecode)
+                if data_object is not None:
+                    converter, with_device_type = data_object
+                    if with_device_type:
+                        values = converter(dobject, device_type)
                     else:
-                        result.update(resfunc(dobject))
+                        values = converter(dobject)
+                    if values:
+                        if measurements:
+                            measurements.update(values)
+                        else:
+                            # most advertisements have one object, use its dict for the measurements
+                            result.measurements = measurements = values
                 else:
                     if self.report_unknown == "Xiaomi":
-                        _LOGGER.info("%s, UNKNOWN dataobject in payload! Adv: %s", sinfo, data.hex())
+                        _LOGGER.info(
+                            "%s, UNKNOWN dataobject in payload! Adv: %s",
+                            mibeacon_info(data, device_type, payload),
+                            HexDump(data),
+                        )
             payload_start = next_start
 
     return result
 
 
+def mibeacon_info(data, device_type, payload):
+    """Return a description of the MiBeacon frame for log messages"""
+    frctrl = data[4] + (data[5] << 8)
+    frctrl_version = frctrl >> 12
+    frctrl_auth_mode = (frctrl >> 10) & 3
+    device_id = data[6] + (data[7] << 8)
+    sinfo = ['MiVer: ' + str(frctrl_version)]
+    sinfo.append('DevID: ' + hex(device_id) + ' : ' + device_type)
+    sinfo.append('FnCnt: ' + str(data[8]))
+    if frctrl & 1:
+        sinfo.append('Request timing')
+    sinfo.append('Registered and bound' if (frctrl >> 8) & 1 else 'Not bound')
+    if (frctrl >> 9) & 1:
+        sinfo.append('Request APP to register and bind')
+    if frctrl_auth_mode == 0:
+        sinfo.append('Old version certification')
+    elif frctrl_auth_mode == 1:
+        sinfo.append('Safety certification')
+    elif frctrl_auth_mode == 2:
+        sinfo.append('Standard certification')
+    if (frctrl >> 5) & 1:
+        i = 15 if (frctrl >> 4) & 1 else 9
+        capability_types = data[i]
+        sinfo.append('Capability: ' + hex(capability_types))
+        if capability_types & 0x20:
+            sinfo.append('IO: ' + hex(data[i + 1]))
+    sinfo.append('Encryption' if (frctrl >> 3) & 1 else 'No encryption')
+    sinfo.append('Object data: ' + payload.hex())
+    return ', '.join(sinfo)
+
+
 def decrypt_mibeacon_v4_v5(self, data, i, xiaomi_mac):
     """decrypt MiBeacon v4/v5 encrypted advertisements"""
     # check for minimum length of encrypted advertisement
     if len(data) < i + 9:
-        _LOGGER.debug("Invalid data length (for decryption), adv: %s", data.hex())
+        _LOGGER.debug("Invalid data length (for decryption), adv: %s", HexDump(data))
     # try to find encryption key for current device
     try:
         key = self.aeskeys[xiaomi_mac]
@@ -1016,16 +849,16 @@ def decrypt_mibeacon_v4_v5(self, data, i, xiaomi_mac):
     aad = b"\x11"
     token = data[-4:]
     cipherpayload = data[i:-7]
-    cipher = AES.new(key, AES.MODE_CCM, nonce=nonce, mac_len=4)
+    cipher = aes_ccm(key, nonce)
     cipher.update(aad)
 
     try:
         decrypted_payload = cipher.decrypt_and_verify(cipherpayload, token)
     except ValueError as error:
         _LOGGER.warning("Decryption failed: %s", error)
-        _LOGGER.debug("token: %s", token.hex())
-        _LOGGER.debug("nonce: %s", nonce.hex())
-        _LOGGER.debug("cipherpayload: %s", cipherpayload.hex())
+        _LOGGER.debug("token: %s", HexDump(token))
+        _LOGGER.debug("nonce: %s", HexDump(nonce))
+        _LOGGER.debug("cipherpayload: %s", HexDump(cipherpayload))
         return None
     if decrypted_payload is None:
         _LOGGER.error(
@@ -1040,7 +873,7 @@ def decrypt_mibeacon_legacy(self, data, i, xiaomi_mac):
     """decrypt MiBeacon v2/v3 encrypted advertisements"""
     # check for minimum length of encrypted advertisement
     if len(data) < i + 7:
-        _LOGGER.debug("Invalid data length (for decryption), adv: %s", data.hex())
+        _LOGGER.debug("Invalid data length (for decryption), adv: %s", HexDump(data))
     # try to find encryption key for current device
     try:
         aeskey = self.aeskeys[xiaomi_mac]
@@ -1056,15 +889,15 @@ def decrypt_mibeacon_legacy(self, data, i, xiaomi_mac):
     nonce = b"".join([data[4:9], data[-4:-1], xiaomi_mac[::-1][:-1]])
     aad = b"\x11"
     cipherpayload = data[i:-4]
-    cipher = AES.new(key, AES.MODE_CCM, nonce=nonce, mac_len=4)
+    cipher = aes_ccm(key, nonce)
     cipher.update(aad)
 
     try:
         decrypted_payload = cipher.decrypt(cipherpayload)
     except ValueError as error:
         _LOGGER.warning("Decryption failed: %s", error)
-        _LOGGER.debug("nonce: %s", nonce.hex())
-        _LOGGER.debug("cipherpayload: %s", cipherpayload.hex())
+        _LOGGER.debug("nonce: %s", HexDump(nonce))
+        _LOGGER.debug("cipherpayload: %s", HexDump(cipherpayload))
         return None
     if decrypted_payload is None:
         _LOGGER.warning(
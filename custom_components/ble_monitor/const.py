@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -50,23 +51,39 @@ CONF_BT_INTERFACE = "bt_interface"
 CONF_BATT_ENTITIES = "batt_entities"
 CONF_REPORT_UNKNOWN = "report_unknown"
 CONF_RESTORE_STATE = "restore_state"
+CONF_DEADBAND = "deadband"
+CONF_HEARTBEAT = "heartbeat"
+CONF_GATEWAY_LISTEN_ADDRESS = "gateway_listen_address"
+CONF_GATEWAY_UDP_PORT = "gateway_udp_port"
+CONF_GATEWAY_TCP_PORT = "gateway_tcp_port"
+CONF_VENDORS = "vendors"
+CONF_CAPTURE_FILE = "capture_file"
+CONF_CAPTURE_MAX_SIZE = "capture_max_size"
 CONF_DEVICE_ENCRYPTION_KEY = "encryption_key"
 CONF_DEVICE_DECIMALS = "decimals"
 CONF_DEVICE_USE_MEDIAN = "use_median"
 CONF_DEVICE_REPORT_UNKNOWN = "report_unknown"
 CONF_DEVICE_RESTORE_STATE = "restore_state"
 CONF_DEVICE_RESET_TIMER = "reset_timer"
+CONF_DEVICE_PERIOD = "period"
+CONF_DEVICE_MEASUREMENT_PERIODS = "measurement_periods"
+CONF_DEVICE_DEADBAND = "deadband"
 CONF_DEVICE_TRACK = "track_device"
 CONF_DEVICE_TRACKER_SCAN_INTERVAL = "tracker_scan_interval"
 CONF_DEVICE_TRACKER_CONSIDER_HOME = "consider_home"
 CONF_DEVICE_DELETE_DEVICE = "delete device"
 CONF_PACKET = "packet"
+CONF_PACKETS = "packets"
+CONF_ENCODING = "encoding"
+CONF_TIMESTAMP = "timestamp"
 CONF_GATEWAY_ID = "gateway_id"
 CONF_UUID = "uuid"
 CONFIG_IS_FLOW = "is_flow"
+CONFIG_DEVICE_INDEX = "device_index"
 
 SERVICE_CLEANUP_ENTRIES = "cleanup_entries"
 SERVICE_PARSE_DATA = "parse_data"
+SERVICE_PARSE_DATA_BULK = "parse_data_bulk"
 
 # Default values for configuration options
 DEFAULT_BT_AUTO_RESTART = False
@@ -79,6 +96,9 @@ DEFAULT_BATT_ENTITIES = True
 DEFAULT_REPORT_UNKNOWN = "Off"
 DEFAULT_DISCOVERY = True
 DEFAULT_RESTORE_STATE = False
+DEFAULT_HEARTBEAT = 3600
+DEFAULT_GATEWAY_LISTEN_ADDRESS = "0.0.0.0"
+DEFAULT_CAPTURE_MAX_SIZE = 100
 DEFAULT_DEVICE_MAC = ""
 DEFAULT_DEVICE_UUID = ""
 DEFAULT_DEVICE_ENCRYPTION_KEY = ""
@@ -87,6 +107,7 @@ DEFAULT_DEVICE_USE_MEDIAN = "default"
 DEFAULT_DEVICE_REPORT_UNKNOWN = False
 DEFAULT_DEVICE_RESTORE_STATE = "default"
 DEFAULT_DEVICE_RESET_TIMER = 35
+DEFAULT_DEVICE_PERIOD = "default"
 DEFAULT_DEVICE_TRACKER_SCAN_INTERVAL = 20
 DEFAULT_DEVICE_TRACKER_CONSIDER_HOME = 180
 DEFAULT_DEVICE_TRACK = False
@@ -111,6 +132,11 @@ CONF_TMAX_PROBES = 300.0
 CONF_HMIN = 0.0
 CONF_HMAX = 99.9
 
+# Device tracker presence: number of RSSI values in the sliding window per gateway and
+# the RSSI difference (dB) needed before another gateway is considered the nearest gateway
+PRESENCE_WINDOW = 10
+PRESENCE_HYSTERESIS = 3
+
 
 # Sensors with deviating temperature range
 KETTLES = ('YM-K1501', 'YM-K1501EU', 'V-SK152')
@@ -141,8 +167,8 @@ class BLEMonitorBinarySensorEntityDescription(
     """Describes BLE Monitor binary sensor entity."""
 
 
-BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
-    BLEMonitorBinarySensorEntityDescription(
+BINARY_SENSOR_TYPE_SPECS: dict[str, dict] = {
+    "binary": dict(
         key="binary",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -151,7 +177,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "remote single press": dict(
         key="remote single press",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -160,7 +186,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "remote long press": dict(
         key="remote long press",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -169,7 +195,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "switch": dict(
         key="switch",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -178,7 +204,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.POWER,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "opening": dict(
         key="opening",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -187,7 +213,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.OPENING,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "light": dict(
         key="light",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -196,7 +222,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.LIGHT,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "moisture": dict(
         key="moisture",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -205,7 +231,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.MOISTURE,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "motion": dict(
         key="motion",
         sensor_class="MotionBinarySensor",
         update_behavior="Instantly",
@@ -214,7 +240,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.MOTION,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "weight removed": dict(
         key="weight removed",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -224,7 +250,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "smoke detector": dict(
         key="smoke detector",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -233,7 +259,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.SMOKE,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "fingerprint": dict(
         key="fingerprint",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -243,7 +269,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "door": dict(
         key="door",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -252,7 +278,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.DOOR,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "lock": dict(
         key="lock",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -261,7 +287,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.LOCK,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "antilock": dict(
         key="antilock",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -270,7 +296,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.LOCK,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "childlock": dict(
         key="childlock",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -279,7 +305,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.LOCK,
         force_update=True,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "armed away": dict(
         key="armed away",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -288,7 +314,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.LOCK,
         force_update=True,
     ),  
-    BLEMonitorBinarySensorEntityDescription(
+    "toothbrush": dict(
         key="toothbrush",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -298,7 +324,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=BinarySensorDeviceClass.POWER,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "tilt": dict(
         key="tilt",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -308,7 +334,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "dropping": dict(
         key="dropping",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -318,7 +344,7 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=False,
     ),
-    BLEMonitorBinarySensorEntityDescription(
+    "impact": dict(
         key="impact",
         sensor_class="BaseBinarySensor",
         update_behavior="Instantly",
@@ -328,11 +354,11 @@ BINARY_SENSOR_TYPES: tuple[BLEMonitorBinarySensorEntityDescription, ...] = (
         device_class=None,
         force_update=False,
     ),
-)
+}
 
 
-SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
-    BLEMonitorSensorEntityDescription(
+SENSOR_TYPE_SPECS: dict[str, dict] = {
+    "temperature": dict(
         key="temperature",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -342,7 +368,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "cypress temperature": dict(
         key="cypress temperature",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -352,7 +378,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature probe 1": dict(
         key="temperature probe 1",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -362,7 +388,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature probe 2": dict(
         key="temperature probe 2",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -372,7 +398,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature probe 3": dict(
         key="temperature probe 3",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -382,7 +408,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature probe 4": dict(
         key="temperature probe 4",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -392,7 +418,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature probe 5": dict(
         key="temperature probe 5",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -402,7 +428,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature probe 6": dict(
         key="temperature probe 6",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -412,7 +438,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature alarm probe 1": dict(
         key="temperature alarm probe 1",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -422,7 +448,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature alarm probe 2": dict(
         key="temperature alarm probe 2",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -432,7 +458,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "temperature calibrated": dict(
         key="temperature calibrated",
         sensor_class="TemperatureSensor",
         update_behavior="Averaging",
@@ -442,7 +468,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "humidity": dict(
         key="humidity",
         sensor_class="HumiditySensor",
         update_behavior="Averaging",
@@ -452,7 +478,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.HUMIDITY,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "cypress humidity": dict(
         key="cypress humidity",
         sensor_class="HumiditySensor",
         update_behavior="Averaging",
@@ -462,7 +488,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.HUMIDITY,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "moisture": dict(
         key="moisture",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -472,7 +498,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.HUMIDITY,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "pressure": dict(
         key="pressure",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -482,7 +508,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "conductivity": dict(
         key="conductivity",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -493,7 +519,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "illuminance": dict(
         key="illuminance",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -503,7 +529,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         native_unit_of_measurement=LIGHT_LUX,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "formaldehyde": dict(
         key="formaldehyde",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -514,7 +540,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "dewpoint": dict(
         key="dewpoint",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -525,7 +551,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "rssi": dict(
         key="rssi",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -536,7 +562,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "measured power": dict(
         key="measured power",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -547,7 +573,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "battery": dict(
         key="battery",
         sensor_class="BatterySensor",
         update_behavior="Averaging",
@@ -558,7 +584,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "voltage": dict(
         key="voltage",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -569,7 +595,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "co2": dict(
         key="co2",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -579,7 +605,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
         device_class=SensorDeviceClass.CO2,
     ),
-    BLEMonitorSensorEntityDescription(
+    "pm2.5": dict(
         key="pm2.5",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -589,7 +615,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         device_class=SensorDeviceClass.PM25,
     ),
-    BLEMonitorSensorEntityDescription(
+    "pm10": dict(
         key="pm10",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -599,7 +625,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         device_class=SensorDeviceClass.PM10,
     ),
-    BLEMonitorSensorEntityDescription(
+    "gravity": dict(
         key="gravity",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -610,7 +636,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "tvoc": dict(
         key="tvoc",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -620,7 +646,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS,
     ),
-    BLEMonitorSensorEntityDescription(
+    "aqi": dict(
         key="aqi",
         sensor_class="MeasuringSensor",
         update_behavior="Averaging",
@@ -631,7 +657,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "mac": dict(
         key="mac",
         sensor_class="StateChangedSensor",
         update_behavior="StateChange",
@@ -643,7 +669,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "uuid": dict(
         key="uuid",
         sensor_class="StateChangedSensor",
         update_behavior="StateChange",
@@ -655,7 +681,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "major": dict(
         key="major",
         sensor_class="StateChangedSensor",
         update_behavior="StateChange",
@@ -667,7 +693,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "minor": dict(
         key="minor",
         sensor_class="StateChangedSensor",
         update_behavior="StateChange",
@@ -679,7 +705,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         state_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    BLEMonitorSensorEntityDescription(
+    "count": dict(
         key="count",
         sensor_class="StateChangedSensor",
         update_behavior="StateChange",
@@ -690,7 +716,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "air quality": dict(
         key="air quality",
         sensor_class="StateChangedSensor",
         update_behavior="StateChange",
@@ -701,7 +727,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "consumable": dict(
         key="consumable",
         sensor_class="InstantUpdateSensor",
         update_behavior="Instantly",
@@ -712,7 +738,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "shake": dict(
         key="shake",
         sensor_class="InstantUpdateSensor",
         update_behavior="Instantly",
@@ -723,7 +749,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "acceleration": dict(
         key="acceleration",
         sensor_class="AccelerationSensor",
         update_behavior="Instantly",
@@ -734,7 +760,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "weight": dict(
         key="weight",
         sensor_class="WeightSensor",
         update_behavior="Instantly",
@@ -745,7 +771,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "stabilized weight": dict(
         key="stabilized weight",
         sensor_class="WeightSensor",
         update_behavior="Instantly",
@@ -756,7 +782,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "non-stabilized weight": dict(
         key="non-stabilized weight",
         sensor_class="WeightSensor",
         update_behavior="Instantly",
@@ -767,7 +793,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "impedance": dict(
         key="impedance",
         sensor_class="InstantUpdateSensor",
         update_behavior="Instantly",
@@ -778,7 +804,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "energy": dict(
         key="energy",
         sensor_class="EnergySensor",
         update_behavior="Instantly",
@@ -788,7 +814,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
-    BLEMonitorSensorEntityDescription(
+    "power": dict(
         key="power",
         sensor_class="PowerSensor",
         update_behavior="Instantly",
@@ -798,7 +824,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "magnetic field": dict(
         key="magnetic field",
         sensor_class="InstantUpdateSensor",
         update_behavior="Instantly",
@@ -809,7 +835,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "magnetic field direction": dict(
         key="magnetic field direction",
         sensor_class="InstantUpdateSensor",
         update_behavior="Instantly",
@@ -820,7 +846,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "button": dict(
         key="button",
         sensor_class="ButtonSensor",
         update_behavior="Instantly",
@@ -831,7 +857,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "dimmer": dict(
         key="dimmer",
         sensor_class="DimmerSensor",
         update_behavior="Instantly",
@@ -842,7 +868,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "one btn switch": dict(
         key="one btn switch",
         sensor_class="SwitchSensor",
         update_behavior="Instantly",
@@ -853,7 +879,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "two btn switch left": dict(
         key="two btn switch left",
         sensor_class="SwitchSensor",
         update_behavior="Instantly",
@@ -864,7 +890,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "two btn switch right": dict(
         key="two btn switch right",
         sensor_class="SwitchSensor",
         update_behavior="Instantly",
@@ -875,7 +901,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "three btn switch left": dict(
         key="three btn switch left",
         sensor_class="SwitchSensor",
         update_behavior="Instantly",
@@ -886,7 +912,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "three btn switch middle": dict(
         key="three btn switch middle",
         sensor_class="SwitchSensor",
         update_behavior="Instantly",
@@ -897,7 +923,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "three btn switch right": dict(
         key="three btn switch right",
         sensor_class="SwitchSensor",
         update_behavior="Instantly",
@@ -908,7 +934,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "remote": dict(
         key="remote",
         sensor_class="BaseRemoteSensor",
         update_behavior="Instantly",
@@ -919,7 +945,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "fan remote": dict(
         key="fan remote",
         sensor_class="BaseRemoteSensor",
         update_behavior="Instantly",
@@ -930,7 +956,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "ventilator fan remote": dict(
         key="ventilator fan remote",
         sensor_class="BaseRemoteSensor",
         update_behavior="Instantly",
@@ -941,7 +967,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "bathroom heater remote": dict(
         key="bathroom heater remote",
         sensor_class="BaseRemoteSensor",
         update_behavior="Instantly",
@@ -952,7 +978,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=None,
     ),
-    BLEMonitorSensorEntityDescription(
+    "volume dispensed port 1": dict(
         key="volume dispensed port 1",
         sensor_class="VolumeDispensedSensor",
         update_behavior="Instantly",
@@ -963,7 +989,7 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    BLEMonitorSensorEntityDescription(
+    "volume dispensed port 2": dict(
         key="volume dispensed port 2",
         sensor_class="VolumeDispensedSensor",
         update_behavior="Instantly",
@@ -974,7 +1000,41 @@ SENSOR_TYPES: tuple[BLEMonitorSensorEntityDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-)
+}
+
+
+def _keys_by_unique_id(specs):
+    """Return the keys per unique id prefix of the entity description specs."""
+    keys = {}
+    for key, spec in specs.items():
+        keys.setdefault(spec["unique_id"], []).append(key)
+    return {unique_id: tuple(keys_list) for unique_id, keys_list in keys.items()}
+
+
+# Keys of the entity descriptions per unique id prefix (some prefixes are used for more keys)
+BINARY_SENSOR_KEYS_BY_UNIQUE_ID = _keys_by_unique_id(BINARY_SENSOR_TYPE_SPECS)
+SENSOR_KEYS_BY_UNIQUE_ID = _keys_by_unique_id(SENSOR_TYPE_SPECS)
+
+
+@lru_cache(maxsize=None)
+def binary_sensor_description(key: str) -> BLEMonitorBinarySensorEntityDescription:
+    """Return the entity description of a binary sensor, created on first use."""
+    return BLEMonitorBinarySensorEntityDescription(**BINARY_SENSOR_TYPE_SPECS[key])
+
+
+@lru_cache(maxsize=None)
+def sensor_description(key: str) -> BLEMonitorSensorEntityDescription:
+    """Return the entity description of a sensor, created on first use."""
+    return BLEMonitorSensorEntityDescription(**SENSOR_TYPE_SPECS[key])
+
+
+def __getattr__(name):
+    """Create all entity descriptions for BINARY_SENSOR_TYPES and SENSOR_TYPES on request."""
+    if name == "BINARY_SENSOR_TYPES":
+        return tuple(binary_sensor_description(key) for key in BINARY_SENSOR_TYPE_SPECS)
+    if name == "SENSOR_TYPES":
+        return tuple(sensor_description(key) for key in SENSOR_TYPE_SPECS)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Dictionary with supported sensors
@@ -1,5 +1,6 @@
 """Passive BLE monitor device tracker platform."""
 from datetime import timedelta
+from functools import partial
 import asyncio
 import logging
 
@@ -18,15 +19,16 @@ from homeassistant.const import (
     STATE_NOT_HOME,
 )
 
-from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers import device_registry
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt
 
+from .presence import PresenceEngine
 from .helper import (
     identifier_normalize,
     identifier_clean,
     detect_conf_type,
+    device_config,
     dict_get_or,
 )
 
@@ -45,15 +47,18 @@ from .const import (
     DOMAIN,
 )
 
-RESTORE_ATTRIBUTES = [
+RESTORE_ATTRIBUTES = (
     'rssi',
     CONF_GATEWAY_ID,
     'major',
     'minor',
     'measured_power',
     'cypress_temperature',
-    'cypress_humidity'
-]
+    'cypress_humidity',
+)
+# besides the common attributes, beacons restore the MAC address and other devices the UUID
+RESTORE_ATTRIBUTES_BEACON = RESTORE_ATTRIBUTES + ("mac_address",)
+RESTORE_ATTRIBUTES_MAC = RESTORE_ATTRIBUTES + ("uuid",)
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -96,20 +101,43 @@ class BLEupdaterTracker:
             if key not in trackers_by_key:
                 tracker_entities = []
                 tracker = BleScannerEntity(self.config, key)
+                # release the RSSI windows of the tracker when the entity is removed
+                tracker.async_on_remove(partial(presence.remove, key))
                 tracker_entities.insert(0, tracker)
                 trackers_by_key[key] = tracker_entities
-                self.add_entities(tracker_entities)
+                new_entities.extend(tracker_entities)
             else:
                 tracker_entities = trackers_by_key[key]
             return tracker_entities
 
+        def period_tick():
+            nonlocal period_timer, ble_adv_cnt
+            period_timer = loop.call_later(self.period, period_tick)
+            # trackers that are away are forgotten by the presence engine
+            presence.expire(loop.time(), lambda key: trackers_by_key[key][0].consider_home)
+            _LOGGER.debug(
+                "%i BLE ADV messages processed last %i seconds for %i device tracker device(s)",
+                ble_adv_cnt,
+                self.period,
+                len(trackers_by_key),
+            )
+            ble_adv_cnt = 0
+
+        def add_new_entities():
+            # register all entities that were created since the last call at once
+            nonlocal new_entities
+            if new_entities:
+                self.add_entities(new_entities)
+                new_entities = []
+
         _LOGGER.debug("Device tracker updater loop started!")
+        new_entities = []
         trackers_by_key = {}
         trackers = []
+        presence = PresenceEngine()
         ble_adv_cnt = 0
-        ts_last = dt.now()
-        ts_now = ts_last
-        data = None
+        loop = hass.loop
+        period_timer = loop.call_later(self.period, period_tick)
         await asyncio.sleep(0)
 
         # Set up device trackers of configured devices on startup when device tracker is available in device registry
@@ -130,51 +158,52 @@ class BLEupdaterTracker:
         else:
             trackers = []
 
+        add_new_entities()
+
         # Set up new device trackers when first BLE advertisement is received
         trackers = []
         while True:
+            # wait for the first advertisement and take all others that are already queued
+            advevents = [await self.dataqueue.get()]
             try:
-                advevent = await asyncio.wait_for(self.dataqueue.get(), 1)
-                if advevent is None:
+                while True:
+                    advevents.append(self.dataqueue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+            # the log level is checked once per batch of advertisements
+            debug = _LOGGER.isEnabledFor(logging.DEBUG)
+            for data in advevents:
+                self.dataqueue.task_done()
+                if data is None:
+                    period_timer.cancel()
                     _LOGGER.debug("Entities updater loop stopped")
                     return True
-                data = advevent
-                self.dataqueue.task_done()
-            except asyncio.TimeoutError:
-                pass
-            if data:
-                _LOGGER.debug("Data device tracker received: %s", data)
+                if debug:
+                    _LOGGER.debug("Data device tracker received: %s", data)
                 ble_adv_cnt += 1
                 key = identifier_clean(dict_get_or(data))
                 # Set up new device tracker when first BLE advertisement is received
                 trackers = await async_add_device_tracker(key)
 
                 if data["is connected"] is False:
-                    data = None
                     continue
 
                 # schedule an immediate update of device tracker
                 if "is connected" in data:
                     entity = trackers[0]
-                    entity.data_update(data)
+                    nearest_changed = presence.update(
+                        key, data[CONF_GATEWAY_ID], data["rssi"], loop.time(), entity.consider_home
+                    )
+                    nearest_gateway, nearest_rssi = presence.nearest(key)
+                    entity.data_update(data, nearest_gateway, nearest_rssi, nearest_changed)
                     if entity.pending_update is True:
                         try:
                             entity.async_schedule_update_ha_state(True)
                         except AttributeError:
                             continue
-                data = None
-            ts_now = dt.now()
-            if ts_now - ts_last < timedelta(seconds=self.period):
-                continue
-            ts_last = ts_now
-            _LOGGER.debug(
-                "%i BLE ADV messages processed last %i seconds for %i device tracker device(s)",
-                ble_adv_cnt,
-                self.period,
-                len(trackers),
-            )
-            ble_adv_cnt = 0
-        return True
+            add_new_entities()
+            # give the timers a chance to run when the queue doesn't get empty
+            await asyncio.sleep(0)
 
 
 class BleScannerEntity(ScannerEntity, RestoreEntity):
@@ -196,6 +225,8 @@ class BleScannerEntity(ScannerEntity, RestoreEntity):
         self._restore_state = self._device_settings["restore state"]
         self._scan_interval = self._device_settings["scan interval"]
         self._consider_home = self._device_settings["consider home"]
+        # (attribute, data key) of the identifier that is not used as key of the tracker
+        self._id_attribute = ("mac_address", CONF_MAC) if self.is_beacon else ("uuid", "uuid")
         self._newstate = None
         self._last_seen = None
 
@@ -217,8 +248,7 @@ class BleScannerEntity(ScannerEntity, RestoreEntity):
                 old_state.attributes["last_seen"]
             )
 
-        restore_attr = RESTORE_ATTRIBUTES
-        restore_attr.append('mac_address' if self.is_beacon else 'uuid')
+        restore_attr = RESTORE_ATTRIBUTES_BEACON if self.is_beacon else RESTORE_ATTRIBUTES_MAC
 
         for attr in restore_attr:
             if attr in old_state.attributes:
@@ -312,23 +342,22 @@ class BleScannerEntity(ScannerEntity, RestoreEntity):
             id_selector = CONF_NAME
 
         # overrule settings with device setting if available
-        if self._config[CONF_DEVICES]:
-            for device in self._config[CONF_DEVICES]:
-                if self._fkey.upper() == dict_get_or(device).upper():
-                    if id_selector in device:
-                        # get device name (from YAML config)
-                        dev_name = device[id_selector]
-                    if CONF_DEVICE_RESTORE_STATE in device:
-                        if isinstance(device[CONF_DEVICE_RESTORE_STATE], bool):
-                            dev_restore_state = device[CONF_DEVICE_RESTORE_STATE]
-                        else:
-                            dev_restore_state = self._config[CONF_RESTORE_STATE]
-                    if CONF_DEVICE_TRACK in device:
-                        dev_track = device[CONF_DEVICE_TRACK]
-                    if CONF_DEVICE_TRACKER_SCAN_INTERVAL in device:
-                        dev_scan_interval = device[CONF_DEVICE_TRACKER_SCAN_INTERVAL]
-                    if CONF_DEVICE_TRACKER_CONSIDER_HOME in device:
-                        dev_consider_home = device[CONF_DEVICE_TRACKER_CONSIDER_HOME]
+        device = device_config(self._config, self._key)
+        if device:
+            if id_selector in device:
+                # get device name (from YAML config)
+                dev_name = device[id_selector]
+            if CONF_DEVICE_RESTORE_STATE in device:
+                if isinstance(device[CONF_DEVICE_RESTORE_STATE], bool):
+                    dev_restore_state = device[CONF_DEVICE_RESTORE_STATE]
+                else:
+                    dev_restore_state = self._config[CONF_RESTORE_STATE]
+            if CONF_DEVICE_TRACK in device:
+                dev_track = device[CONF_DEVICE_TRACK]
+            if CONF_DEVICE_TRACKER_SCAN_INTERVAL in device:
+                dev_scan_interval = device[CONF_DEVICE_TRACKER_SCAN_INTERVAL]
+            if CONF_DEVICE_TRACKER_CONSIDER_HOME in device:
+                dev_consider_home = device[CONF_DEVICE_TRACKER_CONSIDER_HOME]
         device_settings = {
             "name": dev_name,
             "restore state": dev_restore_state,
@@ -353,30 +382,35 @@ class BleScannerEntity(ScannerEntity, RestoreEntity):
         """Check if entity is enabled."""
         return self.enabled and self.ready_for_update
 
-    def data_update(self, data):
+    @property
+    def consider_home(self):
+        """Return the consider home interval in seconds."""
+        return self._consider_home
+
+    def data_update(self, data, nearest_gateway=None, nearest_rssi=None, nearest_changed=False):
         """Prepare data for update."""
         if self.enabled is False:
             return
 
         now = dt.now()
-        # Do not update within scan interval to save resources
-        if self._last_seen:
+        # Do not update within scan interval to save resources, unless the nearest gateway changed
+        if self._last_seen and not nearest_changed:
             if now - self._last_seen <= timedelta(seconds=self._scan_interval):
                 self.ready_for_update = False
                 return
         self._last_seen = now
         self._extra_state_attributes["last_seen"] = self._last_seen
-        restore_attr = RESTORE_ATTRIBUTES
-        restore_attr.append('mac_address' if self.is_beacon else 'uuid')
-
-        for attr in restore_attr:
-            key = CONF_MAC if attr == 'mac_address' else attr
-            if key in data:
-                if attr in ['uuid', 'mac_address']:
-                    self._extra_state_attributes[attr] = identifier_normalize(data[key])
-                    continue
 
-                self._extra_state_attributes[attr] = data[key]
+        for attr in RESTORE_ATTRIBUTES:
+            if attr in data:
+                self._extra_state_attributes[attr] = data[attr]
+        id_attr, id_key = self._id_attribute
+        if id_key in data:
+            self._extra_state_attributes[id_attr] = identifier_normalize(data[id_key])
+        if nearest_gateway is not None:
+            # report the nearest gateway with its smoothed RSSI instead of the last packet
+            self._extra_state_attributes[CONF_GATEWAY_ID] = nearest_gateway
+            self._extra_state_attributes["rssi"] = round(nearest_rssi)
 
         self.ready_for_update = True
 
@@ -387,4 +421,4 @@ class BleScannerEntity(ScannerEntity, RestoreEntity):
     async def async_update(self):
         """Update tracker state and attribute."""
         self._state = self.state
-        async_call_later(self.hass, self._consider_home, self.recheck_state)
+        self.hass.data[DOMAIN]["timer_wheel"].schedule(self, self._consider_home, self.recheck_state)
@@ -0,0 +1,233 @@
+"""UDP and TCP listener for packets of remote BLE gateways."""
+import asyncio
+import logging
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+# A frame is a 2 byte (big endian) length of the rest of the frame, followed by
+# the length of the gateway id (1 byte), the gateway id (utf-8), the receive
+# timestamp (8 byte double) and the raw HCI event.
+FRAME_LENGTH = struct.Struct(">H")
+FRAME_TIMESTAMP = struct.Struct(">d")
+MAX_FRAME_LENGTH = 0xFFFF
+# gateways that are counted per period, packets of other gateways are counted together
+MAX_GATEWAYS = 100
+
+
+class GatewayFrameError(ValueError):
+    """Invalid gateway frame."""
+
+
+def encode_frame(gateway_id, timestamp, data):
+    """Encode a HCI event of a gateway into a frame."""
+    gateway = gateway_id.encode()
+    if len(gateway) > 0xFF:
+        raise GatewayFrameError(f"Gateway id {gateway_id} is too long")
+    payload = bytes([len(gateway)]) + gateway + FRAME_TIMESTAMP.pack(timestamp) + data
+    if len(payload) > MAX_FRAME_LENGTH:
+        raise GatewayFrameError("HCI event is too long")
+    return FRAME_LENGTH.pack(len(payload)) + payload
+
+
+def decode_payload(payload):
+    """Decode the payload of a frame into a (gateway_id, timestamp, data) tuple."""
+    if not payload:
+        raise GatewayFrameError("Empty frame")
+    gateway_end = 1 + payload[0]
+    data_start = gateway_end + FRAME_TIMESTAMP.size
+    if len(payload) < data_start:
+        raise GatewayFrameError("Frame is too short")
+    try:
+        gateway_id = payload[1:gateway_end].decode()
+    except UnicodeDecodeError as error:
+        raise GatewayFrameError("Invalid gateway id") from error
+    (timestamp,) = FRAME_TIMESTAMP.unpack_from(payload, gateway_end)
+    return gateway_id, timestamp, payload[data_start:]
+
+
+def decode_frames(buffer):
+    """Decode the complete frames in a buffer.
+
+    Returns a list of (gateway_id, timestamp, data) tuples, a list of the
+    errors of the invalid frames and the number of bytes that were used, the
+    remaining bytes are the start of the next frame. An invalid frame is
+    skipped, the length prefix tells where the next frame starts.
+    """
+    frames = []
+    errors = []
+    offset = 0
+    size = len(buffer)
+    while size - offset >= FRAME_LENGTH.size:
+        (length,) = FRAME_LENGTH.unpack_from(buffer, offset)
+        end = offset + FRAME_LENGTH.size + length
+        if end > size:
+            break
+        try:
+            frames.append(decode_payload(bytes(buffer[offset + FRAME_LENGTH.size:end])))
+        except GatewayFrameError as error:
+            errors.append(error)
+        offset = end
+    return frames, errors, offset
+
+
+class GatewayCounter:
+    """Packet counters of a gateway in the current period."""
+
+    __slots__ = ("packets", "first_seen", "last_seen")
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.packets = 0
+        self.first_seen = None
+        self.last_seen = None
+
+    def add(self, now):
+        """Count a packet."""
+        if self.first_seen is None:
+            self.first_seen = now
+        self.last_seen = now
+        self.packets += 1
+
+    @property
+    def rate(self):
+        """Return the average number of packets per second in the current period."""
+        if self.packets < 2 or self.last_seen == self.first_seen:
+            return 0.0
+        return (self.packets - 1) / (self.last_seen - self.first_seen)
+
+
+class GatewayDatagramProtocol(asyncio.DatagramProtocol):
+    """Receive frames of gateways in UDP datagrams."""
+
+    def __init__(self, listener):
+        """Initialize the protocol."""
+        self._listener = listener
+
+    def datagram_received(self, data, addr):
+        """Process the frames of a datagram, a partial frame at the end is dropped."""
+        self._listener.receive(data, addr)
+
+
+class GatewayStreamProtocol(asyncio.Protocol):
+    """Receive frames of gateways from a TCP stream."""
+
+    def __init__(self, listener):
+        """Initialize the protocol."""
+        self._listener = listener
+        self._buffer = bytearray()
+        self._peer = None
+
+    def connection_made(self, transport):
+        """Store the peer of the connection."""
+        self._peer = transport.get_extra_info("peername")
+        _LOGGER.debug("Gateway %s connected", self._peer)
+
+    def data_received(self, data):
+        """Process the complete frames in the stream."""
+        buffer = self._buffer
+        buffer += data
+        del buffer[:self._listener.receive(buffer, self._peer)]
+
+    def connection_lost(self, exc):
+        """Log the end of the connection."""
+        _LOGGER.debug("Gateway %s disconnected", self._peer)
+
+
+class GatewayListener:
+    """Listen for frames of remote gateways and pass the HCI events to a callback.
+
+    The servers are created in the event loop of the HCIdump thread, so the
+    callback is called in the same thread as the callback for the HCI events
+    of the local Bluetooth adapters.
+    """
+
+    def __init__(self, process, host, udp_port=None, tcp_port=None):
+        """Initialize the listener."""
+        self._process = process
+        self._host = host
+        self._udp_port = udp_port
+        self._tcp_port = tcp_port
+        self._udp_transport = None
+        self._tcp_server = None
+        self.counters = {}
+        self.uncounted = 0
+        self.invalid = 0
+
+    async def start(self):
+        """Start the UDP and TCP servers."""
+        loop = asyncio.get_running_loop()
+        if self._udp_port is not None:
+            self._udp_transport, _ = await loop.create_datagram_endpoint(
+                lambda: GatewayDatagramProtocol(self),
+                local_addr=(self._host, self._udp_port),
+            )
+            _LOGGER.debug("Gateway listener: UDP port %s", self.udp_address[1])
+        if self._tcp_port is not None:
+            self._tcp_server = await loop.create_server(
+                lambda: GatewayStreamProtocol(self), self._host, self._tcp_port
+            )
+            _LOGGER.debug("Gateway listener: TCP port %s", self.tcp_address[1])
+
+    async def stop(self):
+        """Stop the UDP and TCP servers."""
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+            self._udp_transport = None
+        if self._tcp_server is not None:
+            self._tcp_server.close()
+            await self._tcp_server.wait_closed()
+            self._tcp_server = None
+
+    @property
+    def udp_address(self):
+        """Return the address of the UDP server."""
+        return self._udp_transport.get_extra_info("sockname")
+
+    @property
+    def tcp_address(self):
+        """Return the address of the TCP server."""
+        return self._tcp_server.sockets[0].getsockname()
+
+    def receive(self, buffer, peer):
+        """Process the complete frames in a buffer and return the number of bytes used."""
+        frames, errors, used = decode_frames(buffer)
+        if errors:
+            # one warning per read, the valid frames of the read are processed
+            self.invalid += len(errors)
+            _LOGGER.warning("%i invalid frame(s) received from gateway %s: %s", len(errors), peer, errors[0])
+        if not frames:
+            return used
+        now = asyncio.get_running_loop().time()
+        counters = self.counters
+        # frames of one read are processed in order of their receive timestamps
+        frames.sort(key=lambda frame: frame[1])
+        for gateway_id, _, data in frames:
+            counter = counters.get(gateway_id)
+            if counter is None and len(counters) < MAX_GATEWAYS:
+                counter = counters[gateway_id] = GatewayCounter()
+            if counter is None:
+                # the gateway ids are sent by the peers, the counters must not grow without limit
+                self.uncounted += 1
+            else:
+                counter.add(now)
+            self._process(data, gateway_id)
+        return used
+
+    def log_counters(self):
+        """Log the packet counters of the gateways and start a new period."""
+        for gateway_id, counter in self.counters.items():
+            _LOGGER.debug(
+                "Gateway %s: %i packets, %.1f packets/s",
+                gateway_id,
+                counter.packets,
+                counter.rate,
+            )
+        if self.uncounted:
+            _LOGGER.debug("%i packets of more than %i gateways", self.uncounted, MAX_GATEWAYS)
+        if self.invalid:
+            _LOGGER.debug("%i invalid frames skipped", self.invalid)
+        # gateways that are gone are forgotten after a period without packets
+        self.counters = {}
+        self.uncounted = 0
+        self.invalid = 0
@@ -1,25 +1,31 @@
 """Helper for ble_monitor."""
 import logging
 import re
-from typing import Optional, Any
+from functools import lru_cache
+from typing import Optional, Any, Tuple
 from uuid import UUID
 import voluptuous as vol
 
 from homeassistant.const import (
+    CONF_DEVICES,
     CONF_MAC,
 )
+from .ble_parser.helpers import IDENTITY_CACHE_SIZE
 from .const import (
     MAC_REGEX,
     AES128KEY24_REGEX,
     AES128KEY32_REGEX,
 
     CONF_UUID,
+    CONFIG_DEVICE_INDEX,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=IDENTITY_CACHE_SIZE)
 def identifier_normalize(value: str) -> str:
+    """Return the MAC address with colons or the UUID with dashes."""
     if validate_uuid(value):
         return str(UUID(value))
 
@@ -53,6 +59,20 @@ def dict_get_key_or(data: dict, first: str = CONF_UUID, second: str = CONF_MAC)
     return first if first in data and data[first] else second
 
 
+def device_index(config: dict) -> dict:
+    """Return the device configurations by cleaned MAC address or UUID."""
+    return {identifier_clean(dict_get_or(device)): device for device in config[CONF_DEVICES]}
+
+
+def device_config(config: dict, key: str) -> Optional[dict]:
+    """Return the configuration of a device by its MAC address or UUID.
+
+    The index is built once per config entry, in async_setup_entry.
+    """
+    return config[CONFIG_DEVICE_INDEX].get(identifier_clean(key))
+
+
+@lru_cache(maxsize=IDENTITY_CACHE_SIZE)
 def identifier_clean(value: str) -> str:
     """Clean the identifier key."""
     return value.replace("-", "").replace(":", "").upper()
@@ -93,6 +113,32 @@ def _validate_regex(value: str, regex: str) -> bool:
     return True
 
 
+def config_validation_deadband(value: Any):
+    """Deadband validation, an absolute value or a percentage like '5%'."""
+    if isinstance(value, str) and value.strip().endswith("%"):
+        try:
+            percentage = float(value.strip()[:-1])
+        except ValueError as error:
+            raise vol.Invalid("Invalid deadband percentage", error_message=str(error))
+        if percentage < 0:
+            raise vol.Invalid("Deadband percentage must be positive")
+        return value.strip()
+    try:
+        absolute = float(value)
+    except (ValueError, TypeError) as error:
+        raise vol.Invalid("Invalid deadband", error_message=str(error))
+    if absolute < 0:
+        raise vol.Invalid("Deadband must be positive")
+    return absolute
+
+
+def parse_deadband(value: Any) -> Tuple[float, float]:
+    """Return the (absolute, relative) deadband of a validated deadband value."""
+    if isinstance(value, str) and value.endswith("%"):
+        return 0.0, float(value[:-1]) / 100
+    return float(value), 0.0
+
+
 def config_validation_uuid(value: Any) -> str:
     try:
         result = str(UUID(value))
@@ -0,0 +1,125 @@
+"""Presence engine for the BLE monitor device trackers."""
+from collections import deque
+
+from .const import PRESENCE_HYSTERESIS, PRESENCE_WINDOW
+
+
+class GatewayWindow:
+    """Sliding window of the RSSI values of a tracker received by one gateway."""
+
+    __slots__ = ("values", "total", "last_seen")
+
+    def __init__(self, size):
+        """Initialize the window."""
+        self.values = deque(maxlen=size)
+        self.total = 0
+        self.last_seen = None
+
+    def add(self, rssi, now):
+        """Add a RSSI value, dropping the oldest value when the window is full."""
+        values = self.values
+        if len(values) == values.maxlen:
+            self.total -= values[0]
+        values.append(rssi)
+        self.total += rssi
+        self.last_seen = now
+
+    @property
+    def mean(self):
+        """Return the mean RSSI of the window."""
+        return self.total / len(self.values)
+
+
+class PresenceEngine:
+    """Keep track of the nearest gateway of every device tracker.
+
+    Every (tracker, gateway) pair has a fixed size window with a running sum, so
+    adding a packet is O(1). Another gateway has to be stronger by the
+    hysteresis to take over. For every tracker an upper bound of the mean RSSI
+    of the other gateways is kept, so the gateways are only searched again when
+    the current nearest gateway gets weaker than this bound (minus the
+    hysteresis) or has not seen the tracker for max_age seconds.
+    """
+
+    def __init__(self, window=PRESENCE_WINDOW, hysteresis=PRESENCE_HYSTERESIS):
+        """Initialize the presence engine."""
+        self._window = window
+        self._hysteresis = hysteresis
+        self._windows = {}
+        self._nearest = {}
+        # upper bound of the mean RSSI of the gateways that are not the nearest gateway
+        self._others = {}
+        self._last_seen = {}
+
+    def update(self, key, gateway, rssi, now, max_age):
+        """Add a packet of a tracker and return True if the nearest gateway changed."""
+        windows = self._windows.setdefault(key, {})
+        window = windows.get(gateway)
+        if window is None:
+            window = windows[gateway] = GatewayWindow(self._window)
+        window.add(rssi, now)
+        self._last_seen[key] = now
+
+        nearest = self._nearest.get(key)
+        if nearest is None:
+            new_nearest = gateway
+            self._others[key] = float("-inf")
+        elif nearest == gateway:
+            new_nearest = nearest
+            if window.mean + self._hysteresis < self._others[key]:
+                # the nearest gateway got weaker, another gateway might be nearer now
+                new_nearest = self._select(key, now, max_age)
+        else:
+            nearest_window = windows[nearest]
+            if now - nearest_window.last_seen > max_age:
+                new_nearest = self._select(key, now, max_age)
+            elif window.mean > nearest_window.mean + self._hysteresis:
+                new_nearest = self._select(key, now, max_age)
+            else:
+                new_nearest = nearest
+                if window.mean > self._others[key]:
+                    self._others[key] = window.mean
+        self._nearest[key] = new_nearest
+        return new_nearest != nearest
+
+    def _select(self, key, now, max_age):
+        """Search the nearest gateway, dropping the gateways that didn't see the tracker recently.
+
+        The nearest gateway is stored and the bound of the other gateways is
+        set to the strongest of the other gateways.
+        """
+        windows = self._windows[key]
+        for gateway in [gw for gw, window in windows.items() if now - window.last_seen > max_age]:
+            del windows[gateway]
+        nearest = self._nearest.get(key)
+        best = max(windows, key=lambda gw: windows[gw].mean)
+        if nearest in windows and windows[best].mean <= windows[nearest].mean + self._hysteresis:
+            best = nearest
+        self._nearest[key] = best
+        self._others[key] = max(
+            (window.mean for gateway, window in windows.items() if gateway != best), default=float("-inf")
+        )
+        return best
+
+    def nearest(self, key):
+        """Return the nearest gateway of a tracker and its smoothed RSSI."""
+        gateway = self._nearest.get(key)
+        if gateway is None:
+            return None, None
+        return gateway, self._windows[key][gateway].mean
+
+    def gateways(self, key):
+        """Return the smoothed RSSI per gateway of a tracker."""
+        return {gateway: window.mean for gateway, window in self._windows.get(key, {}).items()}
+
+    def expire(self, now, max_age):
+        """Forget the trackers that were not seen for max_age(key) seconds."""
+        for key in [key for key, last_seen in self._last_seen.items() if now - last_seen > max_age(key)]:
+            self.remove(key)
+
+    def remove(self, key):
+        """Forget a tracker."""
+        self._windows.pop(key, None)
+        self._nearest.pop(key, None)
+        self._others.pop(key, None)
+        self._last_seen.pop(key, None)
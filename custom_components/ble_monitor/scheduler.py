@@ -0,0 +1,81 @@
+"""Flush scheduler for the BLE monitor entity updaters."""
+import heapq
+import itertools
+import zlib
+
+
+def flush_phase(key, period):
+    """Return the deterministic offset of a key within its period.
+
+    The offset is derived from a CRC32 of the key, so the same device always
+    flushes at the same position in its period, while different devices are
+    spread evenly over the period.
+    """
+    return zlib.crc32(repr(key).encode()) / 0x100000000 * period
+
+
+class FlushScheduler:
+    """Heap based scheduler that keeps a flush deadline per key.
+
+    Every key gets its own period and a jittered first deadline. Keys that are
+    rescheduled or removed leave a stale heap entry behind, which is skipped
+    when it reaches the top of the heap.
+    """
+
+    def __init__(self):
+        """Initialize the scheduler."""
+        self._heap = []
+        self._deadlines = {}
+        self._periods = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        """Return the number of scheduled keys."""
+        return len(self._deadlines)
+
+    def __contains__(self, key):
+        """Return True if the key is scheduled."""
+        return key in self._deadlines
+
+    def schedule(self, key, period, now):
+        """Schedule a key to be flushed every period seconds."""
+        period = max(period, 1)
+        deadline = now + flush_phase(key, period)
+        self._periods[key] = period
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), key))
+
+    def remove(self, key):
+        """Remove a key from the schedule."""
+        self._deadlines.pop(key, None)
+        self._periods.pop(key, None)
+
+    def next_deadline(self):
+        """Return the earliest deadline, or None if nothing is scheduled."""
+        heap = self._heap
+        while heap:
+            deadline, _, key = heap[0]
+            if self._deadlines.get(key) == deadline:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now):
+        """Return the keys with a deadline at or before now and re-arm them.
+
+        Missed periods are skipped, so a key is returned at most once per call.
+        """
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            deadline, tiebreak, key = heapq.heappop(heap)
+            if self._deadlines.get(key) != deadline:
+                continue
+            due.append(key)
+            period = self._periods[key]
+            deadline += period
+            if deadline <= now:
+                deadline += ((now - deadline) // period + 1) * period
+            self._deadlines[key] = deadline
+            heapq.heappush(heap, (deadline, tiebreak, key))
+        return due
@@ -1,8 +1,8 @@
 """Passive BLE monitor sensor platform."""
-from datetime import timedelta
 import asyncio
 import logging
 import statistics as sts
+import time
 
 from homeassistant.const import (
     ATTR_BATTERY_LEVEL,
@@ -15,24 +15,27 @@ from homeassistant.const import (
     TEMP_FAHRENHEIT,
 )
 
-from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.util import dt
 from homeassistant.util.temperature import convert as convert_temp
 
+from .scheduler import FlushScheduler
 from .helper import (
     identifier_normalize,
     identifier_clean,
     detect_conf_type,
+    device_config,
     dict_get_or,
     dict_get_or_normalize,
+    parse_deadband,
 )
 
 from .const import (
     AUTO_MANUFACTURER_DICT,
     AUTO_SENSOR_LIST,
+    CONF_DEADBAND,
     CONF_DECIMALS,
+    CONF_HEARTBEAT,
     CONF_PERIOD,
     CONF_UUID,
     CONF_LOG_SPIKES,
@@ -42,6 +45,9 @@ from .const import (
     CONF_DEVICE_USE_MEDIAN,
     CONF_DEVICE_RESTORE_STATE,
     CONF_DEVICE_RESET_TIMER,
+    CONF_DEVICE_PERIOD,
+    CONF_DEVICE_MEASUREMENT_PERIODS,
+    CONF_DEVICE_DEADBAND,
     CONF_TMIN,
     CONF_TMAX,
     CONF_TMIN_KETTLES,
@@ -57,13 +63,14 @@ from .const import (
     PROBES,
     RENAMED_MODEL_DICT,
     DOMAIN,
-    SENSOR_TYPES,
+    SENSOR_KEYS_BY_UNIQUE_ID,
     BLEMonitorSensorEntityDescription,
+    sensor_description,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-RESTORE_ATTRIBUTES = [
+RESTORE_ATTRIBUTES = (
     "median",
     "mean",
     "last_median_of",
@@ -87,7 +94,10 @@ RESTORE_ATTRIBUTES = [
     "acceleration_z",
     "light_level",
     ATTR_BATTERY_LEVEL,
-]
+)
+# besides the common attributes, beacons restore the MAC address and other devices the UUID
+RESTORE_ATTRIBUTES_BEACON = RESTORE_ATTRIBUTES + ("mac_address",)
+RESTORE_ATTRIBUTES_MAC = RESTORE_ATTRIBUTES + ("uuid",)
 
 
 async def async_setup_platform(hass, conf, add_entities, discovery_info=None):
@@ -130,11 +140,12 @@ class BLEupdater:
                     if key not in sensors_by_key:
                         sensors_by_key[key] = {}
                     if measurement not in sensors_by_key[key]:
-                        description = [item for item in SENSOR_TYPES if item.key is measurement][0]
+                        description = sensor_description(measurement)
                         sensors[measurement] = globals()[description.sensor_class](
                             self.config, key, device_model, firmware, description, manufacturer
                         )
-                        self.add_entities([sensors[measurement]])
+                        new_entities.append(sensors[measurement])
+                        schedule_flush(key, sensors[measurement])
                         sensors_by_key[key].update(sensors)
                     else:
                         sensors = sensors_by_key[key]
@@ -146,30 +157,95 @@ class BLEupdater:
                     sensors = {}
                     sensors_by_key[key] = {}
                     for measurement in device_sensors:
-                        description = [item for item in SENSOR_TYPES if item.key is measurement][0]
+                        description = sensor_description(measurement)
                         sensors[measurement] = globals()[description.sensor_class](
                             self.config, key, device_model, firmware, description, manufacturer
                         )
-                        self.add_entities([sensors[measurement]])
+                        new_entities.append(sensors[measurement])
+                        schedule_flush(key, sensors[measurement])
                     sensors_by_key[key].update(sensors)
                 else:
                     sensors = sensors_by_key[key]
             return sensors
 
+        def schedule_flush(key, entity):
+            # entities are flushed per device and update period, each group on its own deadline
+            group = (key, entity.update_period)
+            if group not in entities_by_group:
+                entities_by_group[group] = []
+                rssi[group] = []
+                groups_by_key.setdefault(key, []).append(group)
+                flush_scheduler.schedule(group, entity.update_period, loop.time())
+                arm_flush_timer()
+            entities_by_group[group].append(entity)
+
+        def arm_flush_timer():
+            nonlocal flush_timer
+            deadline = flush_scheduler.next_deadline()
+            if deadline is None:
+                return
+            if flush_timer is not None:
+                if flush_timer.when() <= deadline:
+                    return
+                flush_timer.cancel()
+            flush_timer = loop.call_at(deadline, flush_due, deadline)
+
+        def flush_due(deadline):
+            # updating the state of the device groups that reached their flush deadline
+            nonlocal flush_timer, suppressed_cnt
+            flush_timer = None
+            for group in flush_scheduler.pop_due(max(loop.time(), deadline)):
+                for entity in entities_by_group[group]:
+                    if entity.pending_update is True:
+                        if entity.ready_for_update is True:
+                            entity.rssi_values = rssi[group].copy()
+                            if entity.async_flush() is False:
+                                suppressed_cnt += 1
+                rssi[group].clear()
+            arm_flush_timer()
+
+        def period_tick():
+            nonlocal period_timer, period_cnt, ble_adv_cnt, suppressed_cnt
+            period_timer = loop.call_later(self.period, period_tick)
+            period_cnt += 1
+            # restarting scanner
+            self.monitor.restart()
+
+            _LOGGER.debug(
+                "%i BLE advertisements processed for %i sensor device(s), "
+                "%i state writes suppressed by deadband",
+                ble_adv_cnt,
+                len(sensors_by_key),
+                suppressed_cnt,
+            )
+            ble_adv_cnt = 0
+            suppressed_cnt = 0
+
+        def add_new_entities():
+            # register all entities that were created since the last call at once
+            nonlocal new_entities
+            if new_entities:
+                self.add_entities(new_entities)
+                new_entities = []
+
         _LOGGER.debug("Entities updater loop started!")
+        new_entities = []
         sensors_by_key = {}
         sensors = {}
         batt = {}  # batteries
         batt_cgpr1 = []
-        rssi = {}  # rssi
+        rssi = {}  # rssi per flush group
+        entities_by_group = {}
+        groups_by_key = {}
+        flush_scheduler = FlushScheduler()
         ble_adv_cnt = 0
+        suppressed_cnt = 0
 
-        ts_now = dt.now()
-        ts_restart = ts_now
-        ts_last_update = ts_now
+        loop = hass.loop
+        flush_timer = None
+        period_timer = loop.call_later(self.period, period_tick)
         period_cnt = 0
 
-        data = {}
         await asyncio.sleep(0)
 
         # setup sensors of configured devices on startup when device model is available in registry
@@ -196,10 +272,7 @@ class BLEupdater:
                     # find the measurement key for each entity
                     for entity in entity_list:
                         unique_id_prefix = (entity.unique_id).removesuffix(key)
-                        for sensor_type in SENSOR_TYPES:
-                            if sensor_type.unique_id == unique_id_prefix:
-                                sensor_key = sensor_type.key
-                                auto_sensors.add(sensor_key)
+                        auto_sensors.update(SENSOR_KEYS_BY_UNIQUE_ID.get(unique_id_prefix, ()))
 
                     if device_model and firmware and auto_sensors:
                         sensors = await async_add_sensor(
@@ -212,26 +285,32 @@ class BLEupdater:
         else:
             sensors = {}
 
+        add_new_entities()
+
         # Set up new sensors when first BLE advertisement is received
         sensors = {}
         while True:
+            # wait for the first advertisement and take all others that are already queued
+            advevents = [await self.dataqueue.get()]
             try:
-                advevent = await asyncio.wait_for(self.dataqueue.get(), 1)
-                if advevent is None:
+                while True:
+                    advevents.append(self.dataqueue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+            # the log level is checked once per batch of advertisements
+            debug = _LOGGER.isEnabledFor(logging.DEBUG)
+            for data in advevents:
+                self.dataqueue.task_done()
+                if data is None:
+                    period_timer.cancel()
+                    if flush_timer is not None:
+                        flush_timer.cancel()
                     _LOGGER.debug("Entities updater loop stopped")
                     return True
-                data = advevent
-                self.dataqueue.task_done()
-            except asyncio.TimeoutError:
-                pass
-            if data:
-                _LOGGER.debug("Data measuring sensor received: %s", data)
+                if debug:
+                    _LOGGER.debug("Data measuring sensor received: %s", data)
                 ble_adv_cnt += 1
                 key = identifier_clean(dict_get_or(data))
-                # the RSSI value will be averaged for all valuable packets
-                if key not in rssi:
-                    rssi[key] = []
-                rssi[key].append(int(data["rssi"]))
                 batt_attr = None
                 device_model = data["type"]
                 # migrate to new model name if changed
@@ -248,9 +327,11 @@ class BLEupdater:
                     key, device_model, firmware, auto_sensors, manufacturer
                 )
                 device_sensors = sensors.keys()
+                # the RSSI value will be averaged for all valuable packets
+                for group in groups_by_key.get(key, ()):
+                    rssi[group].append(int(data["rssi"]))
 
                 if data["data"] is False:
-                    data = None
                     continue
 
                 # battery attribute
@@ -292,40 +373,17 @@ class BLEupdater:
                         else:
                             instant_sensors = MEASUREMENT_DICT[device_model][1]
                         entity.collect(data, period_cnt, batt_attr)
-                        if (
-                            measurement in instant_sensors
-                            or ts_now - ts_restart < timedelta(seconds=self.period)
-                        ):
+                        if measurement in instant_sensors or period_cnt == 0:
                             # instant measurements and measurements in the first period are updated instantly
                             if entity.pending_update is True:
                                 if entity.ready_for_update is True:
-                                    entity.rssi_values = rssi[key].copy()
-                                    entity.async_schedule_update_ha_state(True)
+                                    entity.rssi_values = rssi[(key, entity.update_period)].copy()
+                                    if entity.async_flush() is False:
+                                        suppressed_cnt += 1
                                     entity.pending_update = False
-                data = None
-            ts_now = dt.now()
-            if ts_now - ts_last_update < timedelta(seconds=self.period):
-                continue
-            ts_last_update = ts_now
-            period_cnt += 1
-            # restarting scanner
-            self.monitor.restart()
-            # updating the state for every updated measuring device
-            for key, edict in sensors_by_key.items():
-                for entity in edict.values():
-                    if entity.pending_update is True:
-                        if entity.ready_for_update is True:
-                            entity.rssi_values = rssi[key].copy()
-                            entity.async_schedule_update_ha_state(True)
-            for key in rssi:
-                rssi[key].clear()
-
-            _LOGGER.debug(
-                "%i BLE advertisements processed for %i sensor device(s)",
-                ble_adv_cnt,
-                len(sensors_by_key),
-            )
-            ble_adv_cnt = 0
+            add_new_entities()
+            # give the timers a chance to run when the queue doesn't get empty
+            await asyncio.sleep(0)
 
 
 class BaseSensor(RestoreEntity, SensorEntity):
@@ -441,7 +499,16 @@ class BaseSensor(RestoreEntity, SensorEntity):
         self.update_behavior = description.update_behavior
         self.pending_update = False
         self.ready_for_update = False
+        self.update_period = self._device_settings["measurement periods"].get(
+            description.key, self._device_settings["period"]
+        )
         self._restore_state = self._device_settings["restore_state"]
+        self._deadband = None
+        if description.key in self._device_settings["deadband"]:
+            self._deadband = parse_deadband(self._device_settings["deadband"][description.key])
+        self._heartbeat = config[CONF_HEARTBEAT]
+        self._written_state = None
+        self._written_at = 0
         self._err = None
 
         self._attr_name = f"{description.name} {self._device_name}"
@@ -499,8 +566,7 @@ class BaseSensor(RestoreEntity, SensorEntity):
             self._state = old_state.state
 
         # Restore the old attributes
-        restore_attr = RESTORE_ATTRIBUTES
-        restore_attr.append('mac_address' if self.is_beacon else 'uuid')
+        restore_attr = RESTORE_ATTRIBUTES_BEACON if self.is_beacon else RESTORE_ATTRIBUTES_MAC
 
         for attr in restore_attr:
             if attr in old_state.attributes:
@@ -536,6 +602,33 @@ class BaseSensor(RestoreEntity, SensorEntity):
         """Return the state of the sensor."""
         return self._state
 
+    def within_deadband(self):
+        """Check if the state is within the deadband of the last written state."""
+        if self._deadband is None:
+            return False
+        if self._heartbeat and time.monotonic() - self._written_at >= self._heartbeat:
+            return False
+        try:
+            state = float(self._state)
+            written_state = float(self._written_state)
+        except (TypeError, ValueError):
+            return False
+        absolute, relative = self._deadband
+        if relative:
+            return abs(state - written_state) <= abs(written_state) * relative
+        return abs(state - written_state) <= absolute
+
+    def async_flush(self):
+        """Send the collected data to Home Assistant, unless it is within the deadband."""
+        if self.within_deadband():
+            self.rssi_values.clear()
+            self.pending_update = False
+            return False
+        self._written_state = self._state
+        self._written_at = time.monotonic()
+        self.async_schedule_update_ha_state(True)
+        return True
+
     def get_device_settings(self):
         """Set device settings."""
         device_settings = {}
@@ -547,6 +640,9 @@ class BaseSensor(RestoreEntity, SensorEntity):
         dev_use_median = self._config[CONF_USE_MEDIAN]
         dev_restore_state = self._config[CONF_RESTORE_STATE]
         dev_reset_timer = DEFAULT_DEVICE_RESET_TIMER
+        dev_period = self._config[CONF_PERIOD]
+        dev_measurement_periods = {}
+        dev_deadband = dict(self._config[CONF_DEADBAND])
 
         # in UI mode device name is equal to mac (but can be overwritten in UI)
         # in YAML mode device name is taken from config
@@ -556,31 +652,37 @@ class BaseSensor(RestoreEntity, SensorEntity):
             id_selector = CONF_NAME
 
         # overrule settings with device setting if available
-        if self._config[CONF_DEVICES]:
-            for device in self._config[CONF_DEVICES]:
-                if self._fkey.upper() == dict_get_or(device).upper():
-                    if id_selector in device:
-                        # get device name (from YAML config)
-                        dev_name = device[id_selector]
-                    if CONF_TEMPERATURE_UNIT in device:
-                        dev_temperature_unit = device[CONF_TEMPERATURE_UNIT]
-                    if CONF_DEVICE_DECIMALS in device:
-                        if isinstance(device[CONF_DEVICE_DECIMALS], int):
-                            dev_decimals = device[CONF_DEVICE_DECIMALS]
-                        else:
-                            dev_decimals = self._config[CONF_DECIMALS]
-                    if CONF_DEVICE_USE_MEDIAN in device:
-                        if isinstance(device[CONF_DEVICE_USE_MEDIAN], bool):
-                            dev_use_median = device[CONF_DEVICE_USE_MEDIAN]
-                        else:
-                            dev_use_median = self._config[CONF_USE_MEDIAN]
-                    if CONF_DEVICE_RESTORE_STATE in device:
-                        if isinstance(device[CONF_DEVICE_RESTORE_STATE], bool):
-                            dev_restore_state = device[CONF_DEVICE_RESTORE_STATE]
-                        else:
-                            dev_restore_state = self._config[CONF_RESTORE_STATE]
-                    if CONF_DEVICE_RESET_TIMER in device:
-                        dev_reset_timer = device[CONF_DEVICE_RESET_TIMER]
+        device = device_config(self._config, self._key)
+        if device:
+            if id_selector in device:
+                # get device name (from YAML config)
+                dev_name = device[id_selector]
+            if CONF_TEMPERATURE_UNIT in device:
+                dev_temperature_unit = device[CONF_TEMPERATURE_UNIT]
+            if CONF_DEVICE_DECIMALS in device:
+                if isinstance(device[CONF_DEVICE_DECIMALS], int):
+                    dev_decimals = device[CONF_DEVICE_DECIMALS]
+                else:
+                    dev_decimals = self._config[CONF_DECIMALS]
+            if CONF_DEVICE_USE_MEDIAN in device:
+                if isinstance(device[CONF_DEVICE_USE_MEDIAN], bool):
+                    dev_use_median = device[CONF_DEVICE_USE_MEDIAN]
+                else:
+                    dev_use_median = self._config[CONF_USE_MEDIAN]
+            if CONF_DEVICE_RESTORE_STATE in device:
+                if isinstance(device[CONF_DEVICE_RESTORE_STATE], bool):
+                    dev_restore_state = device[CONF_DEVICE_RESTORE_STATE]
+                else:
+                    dev_restore_state = self._config[CONF_RESTORE_STATE]
+            if CONF_DEVICE_RESET_TIMER in device:
+                dev_reset_timer = device[CONF_DEVICE_RESET_TIMER]
+            if CONF_DEVICE_PERIOD in device:
+                if isinstance(device[CONF_DEVICE_PERIOD], int):
+                    dev_period = device[CONF_DEVICE_PERIOD]
+            if CONF_DEVICE_MEASUREMENT_PERIODS in device:
+                dev_measurement_periods = device[CONF_DEVICE_MEASUREMENT_PERIODS]
+            if CONF_DEVICE_DEADBAND in device:
+                dev_deadband.update(device[CONF_DEVICE_DEADBAND])
         device_settings = {
             "name": dev_name,
             "temperature unit": dev_temperature_unit,
@@ -588,6 +690,9 @@ class BaseSensor(RestoreEntity, SensorEntity):
             "use median": dev_use_median,
             "restore_state": dev_restore_state,
             "reset_timer": dev_reset_timer,
+            "period": dev_period,
+            "measurement periods": dev_measurement_periods,
+            "deadband": dev_deadband,
         }
         _LOGGER.debug(
             "Sensor device with %s %s has the following settings. "
@@ -596,7 +701,8 @@ class BaseSensor(RestoreEntity, SensorEntity):
             "Decimals: %s. "
             "Use Median: %s. "
             "Restore state: %s. "
-            "Reset Timer: %s",
+            "Reset Timer: %s. "
+            "Period: %s",
             'uuid' if self.is_beacon else 'mac_address',
             self._fkey,
             device_settings["name"],
@@ -605,6 +711,7 @@ class BaseSensor(RestoreEntity, SensorEntity):
             device_settings["use median"],
             device_settings["restore_state"],
             device_settings["reset_timer"],
+            device_settings["period"],
         )
         return device_settings
 
@@ -637,8 +744,22 @@ class MeasuringSensor(BaseSensor):
             self._extra_state_attributes[ATTR_BATTERY_LEVEL] = batt_attr
         self.pending_update = True
 
+    def async_flush(self):
+        """Calculate the state and send it to Home Assistant, unless it is within the deadband."""
+        self.update_state()
+        if self.within_deadband():
+            return False
+        self._written_state = self._state
+        self._written_at = time.monotonic()
+        self.async_write_ha_state()
+        return True
+
     async def async_update(self):
         """Update sensor state and attributes."""
+        self.update_state()
+
+    def update_state(self):
+        """Calculate the state and attributes from the collected measurements."""
         textattr = ""
         # formaldehyde and gravity decimals workaround
         if self.entity_description.key in ["formaldehyde", "gravity"]:
@@ -700,20 +821,14 @@ class TemperatureSensor(MeasuringSensor):
         else:
             self._temp_min = CONF_TMIN
             self._temp_max = CONF_TMAX
-        self._lower_temp_limit = self.temperature_limit(config, self._temp_min)
-        self._upper_temp_limit = self.temperature_limit(config, self._temp_max)
+        self._lower_temp_limit = self.temperature_limit(self._temp_min)
+        self._upper_temp_limit = self.temperature_limit(self._temp_max)
         self._log_spikes = config[CONF_LOG_SPIKES]
 
-    def temperature_limit(self, config, temp):
+    def temperature_limit(self, temp):
         """Set limits for temperature measurement in °C or °F."""
-        if config[CONF_DEVICES]:
-            for device in config[CONF_DEVICES]:
-                if self._fkey in dict_get_or(device).upper():
-                    if CONF_TEMPERATURE_UNIT in device:
-                        if device[CONF_TEMPERATURE_UNIT] == TEMP_FAHRENHEIT:
-                            temp_fahrenheit = convert_temp(temp, TEMP_CELSIUS, TEMP_FAHRENHEIT)
-                            return temp_fahrenheit
-                    break
+        if self._device_settings["temperature unit"] == TEMP_FAHRENHEIT:
+            return convert_temp(temp, TEMP_CELSIUS, TEMP_FAHRENHEIT)
         return temp
 
     def collect(self, data, period_cnt, batt_attr=None):
@@ -818,8 +933,8 @@ class BatterySensor(MeasuringSensor):
         )
         self.pending_update = True
 
-    async def async_update(self):
-        """Update sensor state and attributes."""
+    def update_state(self):
+        """Update sensor attributes."""
         self._extra_state_attributes["rssi"] = round(sts.mean(self.rssi_values))
         self.rssi_values.clear()
         self.pending_update = False
@@ -1044,7 +1159,7 @@ class ButtonSensor(InstantUpdateSensor):
         self._extra_state_attributes["rssi"] = round(sts.mean(self.rssi_values))
         if self._reset_timer > 0:
             _LOGGER.debug("Reset timer is set to: %i seconds", self._reset_timer)
-            async_call_later(self.hass, self._reset_timer, self.reset_state)
+            self.hass.data[DOMAIN]["timer_wheel"].schedule(self, self._reset_timer, self.reset_state)
         self.rssi_values.clear()
         self.pending_update = False
 
@@ -1085,7 +1200,7 @@ class DimmerSensor(InstantUpdateSensor):
         self._extra_state_attributes["rssi"] = round(sts.mean(self.rssi_values))
         if self._reset_timer > 0:
             _LOGGER.debug("Reset timer is set to: %i seconds", self._reset_timer)
-            async_call_later(self.hass, self._reset_timer, self.reset_state)
+            self.hass.data[DOMAIN]["timer_wheel"].schedule(self, self._reset_timer, self.reset_state)
         self.rssi_values.clear()
         self.pending_update = False
 
@@ -1129,7 +1244,7 @@ class SwitchSensor(InstantUpdateSensor):
         self._extra_state_attributes["rssi"] = round(sts.mean(self.rssi_values))
         if self._reset_timer > 0:
             _LOGGER.debug("Reset timer is set to: %i seconds", self._reset_timer)
-            async_call_later(self.hass, self._reset_timer, self.reset_state)
+            self.hass.data[DOMAIN]["timer_wheel"].schedule(self, self._reset_timer, self.reset_state)
         self.rssi_values.clear()
         self.pending_update = False
 
@@ -1170,7 +1285,7 @@ class BaseRemoteSensor(InstantUpdateSensor):
         self._extra_state_attributes["rssi"] = round(sts.mean(self.rssi_values))
         if self._reset_timer > 0:
             _LOGGER.debug("Reset timer is set to: %i seconds", self._reset_timer)
-            async_call_later(self.hass, self._reset_timer, self.reset_state)
+            self.hass.data[DOMAIN]["timer_wheel"].schedule(self, self._reset_timer, self.reset_state)
         self.rssi_values.clear()
         self.pending_update = False
 
@@ -0,0 +1,117 @@
+"""The tests for the btsnoop reader and the exporters."""
+import csv
+import io
+import json
+
+import pytest
+
+from ble_monitor.ble_parser import BleParser
+from ble_monitor.ble_parser.btsnoop import (
+    BTSNOOP_EPOCH_DELTA,
+    BTSNOOP_MAGIC,
+    DATALINK_H1,
+    DATALINK_H4,
+    DATALINK_MONITOR,
+    FILE_HEADER,
+    RECORD_HEADER,
+    BtsnoopFormatError,
+    parse_btsnoop,
+    read_btsnoop,
+)
+from ble_monitor.ble_parser.export import write_csv, write_ndjson
+
+# ATC and Govee H5051 advertisement (HCI events with packet type)
+PACKETS = [
+    bytes.fromhex("043e1d02010000f4830bb7a3cc1110161a18cca3b70b83f400e8296d0b7fe9c2"),
+    bytes.fromhex("043e1902010400aabb615960e30d0cff88ec00ba0af90f63020101b7"),
+]
+# Xiaomi ZNMS16LM lock advertisement, with the time of the lock event
+LOCK_PACKET = bytes.fromhex(
+    "043e2e02010000918aeb441fd722020106030295fe1a1695fe50449e0643918aeb441fd70b000920020001807c442f61a9"
+)
+# HCI command LE Set Scan Enable, and a Command Complete event
+COMMAND = bytes.fromhex("0c20020100")
+COMMAND_COMPLETE = bytes.fromhex("0e0401")
+TIMESTAMP = 1_700_000_000_000_000
+
+
+def btsnoop(datalink, records):
+    """Return a btsnoop file with (flags, packet) records, one millisecond apart."""
+    capture = FILE_HEADER.pack(BTSNOOP_MAGIC, 1, datalink)
+    for index, (flags, packet) in enumerate(records):
+        timestamp = BTSNOOP_EPOCH_DELTA + TIMESTAMP + index * 1000
+        capture += RECORD_HEADER.pack(len(packet), len(packet), flags, 0, timestamp) + packet
+    return capture
+
+
+class TestBtsnoop:
+    """Tests for the btsnoop reader"""
+    def test_monitor(self):
+        """Test a btmon capture, with adapter index and opcode in the flags."""
+        capture = btsnoop(DATALINK_MONITOR, [
+            (0x0002, COMMAND),
+            (0x0003, PACKETS[0][1:]),
+            (0x0004, COMMAND_COMPLETE),
+            (0x10003, PACKETS[1][1:]),
+        ])
+        assert list(read_btsnoop(io.BytesIO(capture))) == [
+            (TIMESTAMP / 1e6 + 0.001, 0, PACKETS[0]),
+            (TIMESTAMP / 1e6 + 0.003, 1, PACKETS[1]),
+        ]
+
+    def test_h1_h4(self):
+        """Test captures with HCI packets without and with packet type."""
+        capture = btsnoop(DATALINK_H1, [(0x02, COMMAND), (0x03, PACKETS[0][1:]), (0x03, COMMAND_COMPLETE)])
+        assert [event for _, _, event in read_btsnoop(io.BytesIO(capture))] == [PACKETS[0]]
+        capture = btsnoop(DATALINK_H4, [(0x02, b"\x01" + COMMAND), (0x03, PACKETS[1])])
+        assert [event for _, _, event in read_btsnoop(io.BytesIO(capture))] == [PACKETS[1]]
+
+    def test_truncated(self):
+        """Test that truncated packets and a truncated last record are skipped."""
+        capture = FILE_HEADER.pack(BTSNOOP_MAGIC, 1, DATALINK_MONITOR)
+        # packet that was truncated by the snap length
+        capture += RECORD_HEADER.pack(len(PACKETS[0]) - 1, 10, 0x03, 0, 0) + PACKETS[0][1:11]
+        capture += RECORD_HEADER.pack(len(PACKETS[0]) - 1, len(PACKETS[0]) - 1, 0x03, 0, 0) + PACKETS[0][1:]
+        capture += RECORD_HEADER.pack(len(PACKETS[1]) - 1, len(PACKETS[1]) - 1, 0x03, 0, 0) + PACKETS[1][1:20]
+        assert [event for _, _, event in read_btsnoop(io.BytesIO(capture))] == [PACKETS[0]]
+
+    def test_invalid_file(self):
+        """Test that other files are refused."""
+        with pytest.raises(BtsnoopFormatError):
+            list(read_btsnoop(io.BytesIO(b"btsnoop")))
+        with pytest.raises(BtsnoopFormatError):
+            list(read_btsnoop(io.BytesIO(FILE_HEADER.pack(b"pcapfile", 1, DATALINK_H4))))
+        with pytest.raises(BtsnoopFormatError):
+            list(read_btsnoop(io.BytesIO(FILE_HEADER.pack(BTSNOOP_MAGIC, 1, 1))))
+
+    def test_export(self):
+        """Test the parsed advertisements as NDJSON and CSV."""
+        capture = btsnoop(DATALINK_MONITOR, [(0x03, PACKETS[0][1:]), (0x03, PACKETS[1][1:])])
+        stream = io.StringIO()
+        assert write_ndjson(parse_btsnoop(io.BytesIO(capture), BleParser()), stream) == 2
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert lines[0]["kind"] == "sensor"
+        assert lines[0]["mac"] == "CCA3B70B83F4"
+        assert lines[0]["temperature"] == 23.2
+        assert lines[1]["type"] == "H5051/H5071"
+        assert lines[1]["timestamp"] == TIMESTAMP / 1e6 + 0.001
+
+        stream = io.StringIO()
+        rows = write_csv(parse_btsnoop(io.BytesIO(capture), BleParser()), stream)
+        table = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        assert len(table) == rows
+        humidity = [row for row in table if row["mac"] == "E3605961BBAA" and row["measurement"] == "humidity"]
+        assert humidity[0]["value"] == "40.89"
+        assert humidity[0]["type"] == "H5051/H5071"
+
+    def test_export_lock_timestamp(self):
+        """Test that the timestamp of a lock event doesn't replace the timestamp of the capture."""
+        capture = btsnoop(DATALINK_MONITOR, [(0x03, LOCK_PACKET[1:])])
+        stream = io.StringIO()
+        assert write_ndjson(parse_btsnoop(io.BytesIO(capture), BleParser()), stream) == 1
+        line = json.loads(stream.getvalue())
+        assert line["timestamp"] == TIMESTAMP / 1e6
+        assert line["adapter"] == 0
+        assert line["kind"] == "sensor"
+        assert line["lock timestamp"] == "2021-09-01T09:14:36"
+        assert line["action"] == "unlock outside the door"
@@ -0,0 +1,103 @@
+"""The tests for the HCI capture files."""
+import pytest
+
+from ble_monitor.ble_parser import capture
+
+from ble_monitor.ble_parser.capture import (
+    CAPTURE_MAGIC,
+    RECORD_HEADER,
+    CaptureFormatError,
+    CaptureWriter,
+    capture_files,
+    read_capture,
+    replay,
+)
+
+PACKETS = [
+    bytes.fromhex("043e1d02010000f4830bb7a3cc1110161a18cca3b70b83f400e8296d0b7fe9c2"),
+    bytes.fromhex("043E2B02010000123456789ABC1F12161A1819416538C1A41B073915810B529F0F0B094154435F363534313139AA"),
+]
+
+
+class TestCapture:
+    """Tests for the HCI capture files"""
+    def test_write_read(self, tmp_path):
+        """Test that the captured events are read back with adapter and timestamp."""
+        path = str(tmp_path / "ble.cap")
+        writer = CaptureWriter(path)
+        writer.write(PACKETS[0], 0, 1000)
+        writer.write(PACKETS[1], 1, 2000)
+        writer.close()
+        # a second capture is appended
+        writer = CaptureWriter(path)
+        writer.write(PACKETS[0], 2, 3000)
+        writer.close()
+
+        assert list(read_capture(path)) == [
+            (1000, 0, PACKETS[0]),
+            (2000, 1, PACKETS[1]),
+            (3000, 2, PACKETS[0]),
+        ]
+
+    def test_truncated_record(self, tmp_path):
+        """Test that a truncated last record is skipped."""
+        path = tmp_path / "ble.cap"
+        writer = CaptureWriter(str(path))
+        writer.write(PACKETS[0], 0, 1000)
+        writer.write(PACKETS[1], 0, 2000)
+        writer.close()
+        path.write_bytes(path.read_bytes()[:-5])
+
+        assert list(read_capture(str(path))) == [(1000, 0, PACKETS[0])]
+
+    def test_invalid_file(self, tmp_path):
+        """Test that a file without capture magic is refused."""
+        path = tmp_path / "ble.cap"
+        path.write_bytes(b"not a capture")
+        with pytest.raises(CaptureFormatError):
+            list(read_capture(str(path)))
+        path.write_bytes(b"")
+        assert not list(read_capture(str(path)))
+
+    def test_rotation(self, tmp_path):
+        """Test that the capture is rotated on size and the backups are read oldest first."""
+        path = str(tmp_path / "ble.cap")
+        # rotate after two events
+        record_size = RECORD_HEADER.size + len(PACKETS[0])
+        writer = CaptureWriter(path, max_size=len(CAPTURE_MAGIC) + 2 * record_size, backup_count=2)
+        for timestamp in range(7):
+            writer.write(PACKETS[0], 0, timestamp)
+        writer.close()
+
+        files = capture_files(path)
+        assert files == [path + ".2", path + ".1", path]
+        timestamps = [record[0] for file in files for record in read_capture(file)]
+        # the oldest events are dropped
+        assert timestamps == [2, 3, 4, 5, 6]
+
+    def test_replay(self, tmp_path):
+        """Test the replay as fast as possible and at speed."""
+        path = str(tmp_path / "ble.cap")
+        writer = CaptureWriter(path)
+        writer.write(PACKETS[0], 0, 0)
+        writer.write(PACKETS[1], 0, 20_000_000)
+        writer.close()
+
+        received = []
+        assert replay([path], received.append) == 2
+        assert received == PACKETS
+        assert replay([path], received.append, speed=10) == 2
+        assert received == PACKETS * 2
+
+    def test_replay_clock_restart(self, tmp_path, monkeypatch):
+        """Test that the replay continues at speed after a restart of the monotonic clock."""
+        path = str(tmp_path / "ble.cap")
+        writer = CaptureWriter(path)
+        for timestamp in (5_000_000_000, 6_000_000_000, 1_000_000, 2_000_000_000):
+            writer.write(PACKETS[0], 0, timestamp)
+        writer.close()
+        delays = []
+        monkeypatch.setattr(capture.time, "monotonic_ns", lambda: 0)
+        monkeypatch.setattr(capture.time, "sleep", delays.append)
+        assert replay([path], lambda data: None, speed=1) == 4
+        assert delays == [1.0, 1.999]
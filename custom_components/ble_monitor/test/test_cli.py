@@ -0,0 +1,108 @@
+"""The tests for the command line interface of the BLE parser."""
+from collections import Counter
+import io
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from ble_monitor.ble_parser import BleParser, __main__ as cli
+from ble_monitor.ble_parser.__main__ import load_config, main, parse_events, read_events, run_workers, shard
+from ble_monitor.ble_parser.capture import CaptureWriter
+
+# ATC, Govee H5051 and an encrypted ATC advertisement
+PACKETS = [
+    "043e1d02010000f4830bb7a3cc1110161a18cca3b70b83f400e8296d0b7fe9c2",
+    "043e1902010400aabb615960e30d0cff88ec00ba0af90f63020101b7",
+    "043e1b02010000b2188d38c1a40f0e161a18bdfbfa3f2a7212b9aab25bbe",
+]
+AESKEY = "b9ea895fac7eea6d30532432a516f3a3"
+# ATC advertisement with a local name that is not valid UTF-8
+MALFORMED = "043e2102010000f4830bb7a3cc1510161a18cca3b70b83f400e8296d0b7fe90309fffec2"
+
+
+class TestCli:
+    """Tests for the command line interface"""
+    def test_load_config(self, tmp_path):
+        """Test the options of the parser in the JSON file."""
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({
+            "aeskeys": {"A4:C1:38:8D:18:B2": AESKEY},
+            "tracker_whitelist": ["A4:C1:38:8D:18:B2"],
+            "discovery": False,
+            "vendors": ["atc"],
+        }))
+        assert load_config(str(path)) == {
+            "aeskeys": {bytes.fromhex("A4C1388D18B2"): bytes.fromhex(AESKEY)},
+            "tracker_whitelist": [bytes.fromhex("A4C1388D18B2")],
+            "discovery": False,
+            "vendors": ["atc"],
+        }
+
+    def test_read_events(self, tmp_path):
+        """Test that hex lines and capture files are detected."""
+        path = tmp_path / "packets.txt"
+        path.write_text("# ATC\n" + PACKETS[0] + "\n\nnot hex\n" + PACKETS[1].upper() + "\n")
+        assert list(read_events(str(path))) == [
+            (None, 0, bytes.fromhex(PACKETS[0])),
+            (None, 0, bytes.fromhex(PACKETS[1])),
+        ]
+        path = str(tmp_path / "ble.cap")
+        writer = CaptureWriter(path)
+        writer.write(bytes.fromhex(PACKETS[0]), 1, 1_500_000_000)
+        writer.close()
+        assert list(read_events(path)) == [(1.5, 1, bytes.fromhex(PACKETS[0]))]
+
+    def test_shard(self):
+        """Test that the events of a MAC address are parsed by the same worker."""
+        data = bytes.fromhex(PACKETS[0])
+        assert shard(data, 4) == shard(data[:-1] + b"\x00", 4)
+        assert shard(b"\x04\x3e", 4) == 0
+
+    def test_main(self, tmp_path, capsys):
+        """Test the readings of a file as NDJSON, with one and with two workers."""
+        packets = tmp_path / "packets.txt"
+        packets.write_text("\n".join(PACKETS * 3))
+        config = tmp_path / "config.json"
+        config.write_text(json.dumps({"aeskeys": {"A4C1388D18B2": AESKEY}}))
+
+        main([str(packets), "--config", str(config)])
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line["type"] for line in lines] == ["ATC", "H5051/H5071", "ATC"] * 3
+        assert lines[2]["mac"] == "A4C1388D18B2"
+
+        output = tmp_path / "readings.ndjson"
+        main([str(packets), "--config", str(config), "--workers", "2", "--output", str(output)])
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert sorted(line["mac"] for line in lines) == sorted(
+            ["CCA3B70B83F4", "E3605961BBAA", "A4C1388D18B2"] * 3
+        )
+
+    def test_parse_events_skips_errors(self):
+        """Test that an event that raises an exception is skipped and counted."""
+        events = [(None, 0, bytes.fromhex(packet)) for packet in (PACKETS[0], MALFORMED, PACKETS[1])]
+        stats = Counter()
+        readings = list(parse_events(events, BleParser(), stats))
+        assert [reading[2]["type"] for reading in readings] == ["ATC", "H5051/H5071"]
+        assert stats["skipped"] == 1
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="the failure is injected in forked workers"
+    )
+    @pytest.mark.parametrize("crash", [False, True])
+    def test_run_workers_failure(self, monkeypatch, crash):
+        """Test that a worker that raises or crashes doesn't stop the other workers."""
+        def write_ndjson(readings, output):
+            if crash:
+                os._exit(3)  # pylint: disable=protected-access
+            raise RuntimeError("worker failure")
+
+        # the worker processes are forked with the patched function, whatever the default start method is
+        # (spawn and forkserver import the module again in the worker)
+        monkeypatch.setattr(cli, "multiprocessing", multiprocessing.get_context("fork"))
+        monkeypatch.setattr(cli, "write_ndjson", write_ndjson)
+        monkeypatch.setattr(cli, "WORKER_TIMEOUT", 0.1)
+        events = [(None, 0, bytes.fromhex(PACKETS[0]))] * 10
+        count, lines, skipped, failed = run_workers(events, {}, io.StringIO(), 2)
+        assert (count, lines, skipped, failed) == (10, 0, 10, 1)
@@ -0,0 +1,33 @@
+"""The tests for the entity descriptions in const."""
+from ble_monitor import const
+from ble_monitor.const import (
+    SENSOR_KEYS_BY_UNIQUE_ID,
+    SENSOR_TYPE_SPECS,
+    binary_sensor_description,
+    sensor_description,
+)
+
+
+class TestEntityDescriptions:
+    """Tests for the lazily created entity descriptions"""
+    def test_description_created_once(self):
+        """Test that a description is created on first use and then reused."""
+        description = sensor_description("temperature")
+        assert description.key == "temperature"
+        assert description.sensor_class == "TemperatureSensor"
+        assert sensor_description("temperature") is description
+
+    def test_all_types(self):
+        """Test that SENSOR_TYPES and BINARY_SENSOR_TYPES still contain all descriptions."""
+        sensor_types = const.SENSOR_TYPES
+        assert [item.key for item in sensor_types] == list(SENSOR_TYPE_SPECS)
+        assert sensor_description("humidity") in sensor_types
+        assert binary_sensor_description("motion") in const.BINARY_SENSOR_TYPES
+
+    def test_keys_by_unique_id(self):
+        """Test the lookup of the keys of a unique id prefix."""
+        assert SENSOR_KEYS_BY_UNIQUE_ID["t_"] == ("temperature",)
+        assert SENSOR_KEYS_BY_UNIQUE_ID["left_switch_"] == (
+            "two btn switch left",
+            "three btn switch left",
+        )
@@ -0,0 +1,58 @@
+"""The tests for the decoder specs of the ble_parser."""
+import pytest
+
+from ble_monitor.ble_parser.decoder_spec import DecoderSpec, compile_specs, find_spec
+
+
+def double(value):
+    """Conversion for the tests."""
+    return value * 2
+
+
+def add_sum(result, values):
+    """Post-processing hook for the tests."""
+    result["sum"] = values[0] + values[1]
+
+
+SPECS = compile_specs((
+    DecoderSpec((6, 1), "A", "<hH", 2, (("temperature", 100), ("humidity", None)), post=add_sum),
+    DecoderSpec((6, None), "B", "<bxB", 3, (("probe", double), (None, None))),
+    DecoderSpec((5, None), (0, {0x10: "C", 0x11: "D"}), "<B", 4, (("battery", None),)),
+))
+
+
+class TestDecoderSpec:
+    """Tests for the decoder specs"""
+    def test_find_spec(self):
+        """Test the lookup of specs on length and discriminator."""
+        assert find_spec(SPECS, 6, 1).decode(b"\x00\x00\x34\x08\x10\x00")[0] == "A"
+        assert find_spec(SPECS, 6, 2).decode(b"\x00\x00\x00\x01\x00\x05")[0] == "B"
+        assert find_spec(SPECS, 6).decode(b"\x00\x00\x00\x01\x00\x05")[0] == "B"
+        assert find_spec(SPECS, 7, 1) is None
+
+    def test_decode(self):
+        """Test the conversions and the post-processing hook."""
+        device_type, result = find_spec(SPECS, 6, 1).decode(b"\x00\x00\x34\x08\x10\x00")
+        assert device_type == "A"
+        assert result == {"temperature": 21.0, "humidity": 16, "sum": 2116}
+        device_type, result = find_spec(SPECS, 6, 2).decode(b"\x00\x00\x00\xfe\x00\x05")
+        assert result == {"probe": -4}
+
+    def test_variant(self):
+        """Test the selection of the device type by a byte of the advertisement."""
+        spec = find_spec(SPECS, 5)
+        assert spec.decode(b"\x10\x00\x00\x00\x64") == ("C", {"battery": 100})
+        assert spec.decode(b"\x11\x00\x00\x00\x64") == ("D", {"battery": 100})
+        assert spec.decode(b"\x12\x00\x00\x00\x64") == (None, None)
+
+    def test_invalid_specs(self):
+        """Test that invalid specs are rejected."""
+        with pytest.raises(ValueError):
+            DecoderSpec((6, None), "A", "<hH", 2, (("temperature", 100),))
+        with pytest.raises(ValueError):
+            compile_specs((DecoderSpec((6, None), "A", "<hH", 3, (("temperature", 100), ("humidity", 100))),))
+        with pytest.raises(ValueError):
+            compile_specs((
+                DecoderSpec((6, None), "A", "<h", 2, (("temperature", 100),)),
+                DecoderSpec((6, None), "B", "<h", 2, (("temperature", 100),)),
+            ))
@@ -0,0 +1,42 @@
+"""The tests for the BLE monitor device tracker."""
+from ble_monitor import device_tracker
+from ble_monitor.const import CONFIG_DEVICE_INDEX
+from ble_monitor.device_tracker import BleScannerEntity
+
+CONFIG = {"devices": [], "restore_state": False, CONFIG_DEVICE_INDEX: {}}
+
+
+class TestBleScannerEntity:
+    """Tests for the device tracker entity"""
+    def test_data_update_attributes(self):
+        """Test that the attributes are copied from the advertisement data."""
+        tracker = BleScannerEntity(CONFIG, "E2C56DB5DFFB48D2B060D0F5A71096E0")
+        data = {
+            "uuid": "e2c56db5dffb48d2b060d0f5a71096e0",
+            "mac": "C2D0AABBCCDD",
+            "rssi": -75,
+            "gateway_id": "ble_monitor",
+            "major": 1,
+            "minor": 2,
+            "measured_power": -59,
+        }
+        tracker.data_update(data)
+        attributes = tracker.extra_state_attributes
+        assert attributes["mac_address"] == "C2:D0:AA:BB:CC:DD"
+        assert attributes["rssi"] == -75
+        assert attributes["major"] == 1
+        assert attributes["minor"] == 2
+        assert "uuid" not in attributes
+
+    def test_data_update_no_growth(self):
+        """Test that repeated updates don't grow the restore attributes."""
+        restore_attributes = device_tracker.RESTORE_ATTRIBUTES
+        tracker = BleScannerEntity(CONFIG, "A4C1382F866C")
+        data = {"mac": "A4C1382F866C", "rssi": -60, "gateway_id": "ble_monitor"}
+        for rssi in range(3):
+            tracker._last_seen = None  # pylint: disable=protected-access
+            data["rssi"] = -60 - rssi
+            tracker.data_update(data)
+        assert device_tracker.RESTORE_ATTRIBUTES is restore_attributes
+        assert len(device_tracker.RESTORE_ATTRIBUTES) == 7
+        assert sorted(tracker.extra_state_attributes) == ["gateway_id", "last_seen", "rssi"]
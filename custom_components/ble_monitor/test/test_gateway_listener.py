@@ -0,0 +1,142 @@
+"""The tests for the gateway listener."""
+import asyncio
+import socket
+
+from ble_monitor.gateway_listener import (
+    MAX_GATEWAYS,
+    GatewayFrameError,
+    GatewayListener,
+    decode_frames,
+    encode_frame,
+)
+
+PACKETS = [
+    bytes.fromhex("043e1d02010000f4830bb7a3cc1110161a18cca3b70b83f400e8296d0b7fe9c2"),
+    bytes.fromhex("043E2B02010000123456789ABC1F12161A1819416538C1A41B073915810B529F0F0B094154435F363534313139AA"),
+]
+
+
+async def replay(send):
+    """Start a listener on free local ports and replay the packets with a socket client."""
+    received = []
+    listener = GatewayListener(
+        lambda data, gateway_id: received.append((gateway_id, data)), "127.0.0.1", 0, 0
+    )
+    await listener.start()
+    try:
+        await send(listener)
+        for _ in range(100):
+            if len(received) == len(PACKETS) * 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await listener.stop()
+    return received, listener.counters
+
+
+class TestGatewayListener:
+    """Tests for the gateway listener"""
+    def test_encode_decode(self):
+        """Test that frames can be decoded in parts."""
+        stream = b"".join(
+            encode_frame("kitchen", 1700000000.5 + index, packet)
+            for index, packet in enumerate(PACKETS)
+        )
+        frames, errors, used = decode_frames(stream[:-5])
+        assert frames == [("kitchen", 1700000000.5, PACKETS[0])]
+        assert errors == []
+        frames, errors, used = decode_frames(stream[used:])
+        assert frames == [("kitchen", 1700000001.5, PACKETS[1])]
+
+    def test_invalid_frame(self):
+        """Test that a frame without timestamp is refused."""
+        frames, errors, used = decode_frames(b"\x00\x03\x01\x41\x00")
+        assert frames == []
+        assert [type(error) for error in errors] == [GatewayFrameError]
+        assert used == 5
+
+    def test_invalid_frames_skipped(self):
+        """Test that invalid frames are skipped and the valid frames around them are processed."""
+        good = encode_frame("kitchen", 1.0, PACKETS[0])
+        invalid = [
+            b"\x00\x00",  # empty frame
+            b"\x00\x03\x01\x41\x00",  # frame without timestamp
+            b"\x00\x0b\x02\xff\xfe" + bytes(8),  # gateway id that isn't utf-8
+        ]
+        frames, errors, used = decode_frames(good + b"".join(invalid) + good)
+        assert frames == [("kitchen", 1.0, PACKETS[0])] * 2
+        assert len(errors) == 3
+        assert used == 2 * len(good) + sum(len(frame) for frame in invalid)
+
+        async def receive():
+            received = []
+            listener = GatewayListener(lambda data, gateway_id: received.append(gateway_id), "127.0.0.1")
+            used = listener.receive(good + invalid[0] + good, None)
+            return received, listener, used
+
+        received, listener, used = asyncio.run(receive())
+        assert received == ["kitchen", "kitchen"]
+        assert used == 2 * len(good) + 2
+        assert listener.invalid == 1
+        assert listener.counters["kitchen"].packets == 2
+        listener.log_counters()
+        assert listener.invalid == 0
+
+    def test_udp(self):
+        """Test that the frames in UDP datagrams are processed."""
+        async def send(listener):
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+                for gateway_id in ["kitchen", "bedroom"]:
+                    # second packet first, the frames are processed in order of the timestamps
+                    client.sendto(
+                        encode_frame(gateway_id, 2.0, PACKETS[1]) + encode_frame(gateway_id, 1.0, PACKETS[0]),
+                        listener.udp_address,
+                    )
+
+        received, counters = asyncio.run(replay(send))
+        assert received == [
+            ("kitchen", PACKETS[0]),
+            ("kitchen", PACKETS[1]),
+            ("bedroom", PACKETS[0]),
+            ("bedroom", PACKETS[1]),
+        ]
+        assert counters["kitchen"].packets == 2
+        assert counters["bedroom"].packets == 2
+
+    def test_tcp(self):
+        """Test that frames split over TCP segments are processed, an invalid frame doesn't close the stream."""
+        async def send(listener):
+            stream = b"\x00\x00".join(
+                encode_frame(gateway_id, 1.0, packet)
+                for gateway_id in ["kitchen", "bedroom"]
+                for packet in PACKETS
+            )
+            _, writer = await asyncio.open_connection(*listener.tcp_address)
+            for index in range(0, len(stream), 7):
+                writer.write(stream[index:index + 7])
+                await writer.drain()
+            await asyncio.sleep(0.05)
+            writer.close()
+            await writer.wait_closed()
+
+        received, counters = asyncio.run(replay(send))
+        assert [gateway_id for gateway_id, _ in received] == ["kitchen", "kitchen", "bedroom", "bedroom"]
+        assert [data for _, data in received] == PACKETS * 2
+        assert sorted(counters) == ["bedroom", "kitchen"]
+
+    def test_counters_limit_and_reset(self):
+        """Test that the counters are limited to MAX_GATEWAYS and reset every period."""
+        async def receive():
+            received = []
+            listener = GatewayListener(lambda data, gateway_id: received.append(gateway_id), "127.0.0.1")
+            stream = b"".join(encode_frame(f"gateway{index}", 1.0, PACKETS[0]) for index in range(MAX_GATEWAYS + 5))
+            listener.receive(stream, None)
+            return received, listener
+
+        received, listener = asyncio.run(receive())
+        assert len(received) == MAX_GATEWAYS + 5
+        assert len(listener.counters) == MAX_GATEWAYS
+        assert listener.uncounted == 5
+        listener.log_counters()
+        assert listener.counters == {}
+        assert listener.uncounted == 0
@@ -132,6 +132,16 @@ class TestGovee:
         assert sensor_msg["battery"] == 100
         assert sensor_msg["rssi"] == -65
 
+    def test_Govee_H5178_unknown_sensor(self):
+        """Test Govee H5178 parser with an unknown sensor id."""
+        data_string = "043E2B0201000045C5DF38C1A41F0A09423531373843353435030388EC0201050CFF010001010202FC87640002BF"
+        data = bytes(bytearray.fromhex(data_string))
+        # pylint: disable=unused-variable
+        ble_parser = BleParser()
+        sensor_msg, tracker_msg = ble_parser.parse_raw_data(data)
+
+        assert sensor_msg is None
+
     def test_Govee_H5179(self):
         """Test Govee H5179 parser."""
         data_string = "043E19020104006F18128132E30D0CFF0188EC000101A00AA2175BB6"
@@ -21,6 +21,20 @@ class TestHaBle:
         assert sensor_msg["battery"] == 97
         assert sensor_msg["rssi"] == -52
 
+    def test_ha_ble_half_float(self):
+        """Test HA BLE parser for a temperature measurement as 2 byte float"""
+        data_string = "043E1702010000A5808FE648540B02010607161C1843023368CC"
+        data = bytes(bytearray.fromhex(data_string))
+
+        # pylint: disable=unused-variable
+        ble_parser = BleParser()
+        sensor_msg, tracker_msg = ble_parser.parse_raw_data(data)
+
+        assert sensor_msg["firmware"] == "HA BLE"
+        assert sensor_msg["mac"] == "5448E68F80A5"
+        assert sensor_msg["temperature"] == 21.5
+        assert sensor_msg["rssi"] == -52
+
     def test_ha_ble_temperature_and_humidity(self):
         """Test HA BLE parser for temperature and humidity measurement"""
         data_string = "043E1B02010000A5808FE648540F0201060B161C182302CA090303BF13CC"
@@ -0,0 +1,89 @@
+"""The tests for the BLE monitor helpers."""
+import pytest
+import voluptuous as vol
+
+from ble_monitor.ble_parser.helpers import to_mac, to_unformatted_mac, to_unformatted_uuid, to_uuid
+from ble_monitor.const import CONFIG_DEVICE_INDEX
+from ble_monitor.helper import (
+    config_validation_deadband,
+    device_config,
+    device_index,
+    identifier_clean,
+    identifier_normalize,
+    parse_deadband,
+)
+
+
+class TestDeadband:
+    """Tests for the deadband helpers"""
+    def test_absolute_deadband(self):
+        """Test an absolute deadband."""
+        assert config_validation_deadband(0.2) == 0.2
+        assert config_validation_deadband("1") == 1.0
+        assert parse_deadband(config_validation_deadband(0.2)) == (0.2, 0.0)
+
+    def test_relative_deadband(self):
+        """Test a percentage deadband."""
+        assert config_validation_deadband(" 5% ") == "5%"
+        assert parse_deadband(config_validation_deadband("5%")) == (0.0, 0.05)
+
+    def test_invalid_deadband(self):
+        """Test that invalid deadbands are rejected."""
+        for value in ["abc", "x%", "-1%", -1, None]:
+            with pytest.raises(vol.Invalid):
+                config_validation_deadband(value)
+
+
+class TestDeviceConfig:
+    """Tests for the device configuration index"""
+    def test_device_config(self):
+        """Test lookup of devices by MAC address and UUID."""
+        config = {
+            "devices": [
+                {"mac": "A4:C1:38:2F:86:6C", "name": "living room"},
+                {"uuid": "e2c56db5-dffb-48d2-b060-d0f5a71096e0", "name": "beacon"},
+            ]
+        }
+        config[CONFIG_DEVICE_INDEX] = device_index(config)
+        assert device_config(config, "A4C1382F866C")["name"] == "living room"
+        assert device_config(config, "a4:c1:38:2f:86:6c")["name"] == "living room"
+        assert device_config(config, "E2C56DB5DFFB48D2B060D0F5A71096E0")["name"] == "beacon"
+        assert device_config(config, "A4C1382F866D") is None
+
+    def test_device_config_per_entry(self):
+        """Test that every config entry uses its own index."""
+        first = {"devices": [{"mac": "A4:C1:38:2F:86:6C"}]}
+        first[CONFIG_DEVICE_INDEX] = device_index(first)
+        second = {"devices": []}
+        second[CONFIG_DEVICE_INDEX] = device_index(second)
+        assert device_config(first, "A4C1382F866C")
+        assert device_config(second, "A4C1382F866C") is None
+        assert device_config(first, "A4C1382F866C")
+
+
+class TestIdentifiers:
+    """Tests for the formatting of MAC addresses and UUIDs"""
+    def test_format_mac(self):
+        """Test formatting of a MAC address."""
+        mac = bytes.fromhex("a4c1382f866c")
+        assert to_mac(mac) == "A4:C1:38:2F:86:6C"
+        assert to_unformatted_mac(mac) == "A4C1382F866C"
+        assert identifier_normalize(to_unformatted_mac(mac)) == "A4:C1:38:2F:86:6C"
+        assert identifier_clean(to_mac(mac)) == "A4C1382F866C"
+
+    def test_format_uuid(self):
+        """Test formatting of a UUID."""
+        uuid = bytes.fromhex("e2c56db5dffb48d2b060d0f5a71096e0")
+        assert to_uuid(uuid) == "e2c56db5-dffb-48d2-b060-d0f5a71096e0"
+        assert to_unformatted_uuid(uuid) == "e2c56db5dffb48d2b060d0f5a71096e0"
+        assert identifier_normalize(to_unformatted_uuid(uuid)) == "e2c56db5-dffb-48d2-b060-d0f5a71096e0"
+        assert identifier_clean(to_uuid(uuid)) == "E2C56DB5DFFB48D2B060D0F5A71096E0"
+
+    def test_formatted_once(self):
+        """Test that the formatted string of a device identity is reused."""
+        to_unformatted_mac.cache_clear()
+        mac = bytes.fromhex("a4c1382f866c")
+        first = to_unformatted_mac(mac)
+        assert to_unformatted_mac(bytes.fromhex("a4c1382f866c")) is first
+        info = to_unformatted_mac.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
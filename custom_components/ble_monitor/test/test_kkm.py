@@ -21,9 +21,9 @@ class TestKKM:
         assert sensor_msg["temperature"] == 25.42
         assert sensor_msg["humidity"] == 34.79
         assert sensor_msg["acceleration"] == 1003.2
-        assert sensor_msg["acceleration_x"] == -4
-        assert sensor_msg["acceleration_y"] == -20
-        assert sensor_msg["acceleration_z"] == 1003
+        assert sensor_msg["acceleration x"] == -4
+        assert sensor_msg["acceleration y"] == -20
+        assert sensor_msg["acceleration z"] == 1003
         assert sensor_msg["voltage"] == 3.591
         assert sensor_msg["battery"] == 100
         assert sensor_msg["rssi"] == -45
@@ -0,0 +1,60 @@
+"""The tests for the logging of the ble_parser."""
+import ast
+from pathlib import Path
+
+from ble_monitor import ble_parser
+from ble_monitor.ble_parser.helpers import HexDump
+from ble_monitor.ble_parser.xiaomi import mibeacon_info
+
+LOG_METHODS = {"debug", "info", "warning", "error", "exception"}
+# calls that format their arguments eagerly, also when the message is not emitted
+EAGER_METHODS = {"hex", "format", "join"}
+EAGER_FUNCTIONS = {"str", "hex", "repr"}
+
+
+def eager_log_arguments(path):
+    """Return the lines of log calls that format their arguments eagerly."""
+    lines = []
+    for node in ast.walk(ast.parse(path.read_text())):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "_LOGGER"
+            and node.func.attr in LOG_METHODS
+        ):
+            continue
+        if node.args and not isinstance(node.args[0], ast.Constant):
+            lines.append(node.lineno)
+            continue
+        for arg in node.args[1:]:
+            for child in ast.walk(arg):
+                if isinstance(child, ast.JoinedStr) or (
+                    isinstance(child, ast.Call)
+                    and (
+                        (isinstance(child.func, ast.Attribute) and child.func.attr in EAGER_METHODS)
+                        or (isinstance(child.func, ast.Name) and child.func.id in EAGER_FUNCTIONS)
+                    )
+                ):
+                    lines.append(node.lineno)
+    return lines
+
+
+class TestLogging:
+    """Tests for the logging of the parsers"""
+    def test_no_eager_log_arguments(self):
+        """Test that the parsers only format log arguments when the message is emitted."""
+        for path in sorted(Path(ble_parser.__file__).parent.glob("*.py")):
+            assert eager_log_arguments(path) == [], path.name
+
+    def test_hex_dump(self):
+        """Test that the hex dump is formatted by the log message."""
+        assert "data: %s" % HexDump(b"\x01\xab") == "data: 01ab"
+
+    def test_mibeacon_info(self):
+        """Test the description of a MiBeacon frame."""
+        data = bytes.fromhex("151695fe5020aa01da219335342d580d1004fe004802")
+        assert mibeacon_info(data, "LYWSDCGQ", data[15:]) == (
+            "MiVer: 2, DevID: 0x1aa : LYWSDCGQ, FnCnt: 218, Not bound, "
+            "Old version certification, No encryption, Object data: 0d1004fe004802"
+        )
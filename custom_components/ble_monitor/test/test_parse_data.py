@@ -0,0 +1,119 @@
+"""The tests for the parse_data services."""
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import janus
+
+import ble_monitor
+from ble_monitor import SERVICE_PARSE_DATA_BULK_SCHEMA, HCIdump
+
+CONFIG = {
+    "hci_interface": [0],
+    "active_scan": False,
+    "report_unknown": False,
+    "discovery": True,
+    "devices": [],
+    "vendors": None,
+}
+# ATC advertisement of A4:C1:38:B4:94:4C
+PACKET = "043e1d02010000f4830bb7a3cc1110161a18cca3b70b83f400e8296d0b7fe9c2"
+
+
+def create_hcidump():
+    """Create a HCIdump thread that is not started."""
+    queues = {"binary": janus.Queue(), "measuring": janus.Queue(), "tracker": janus.Queue()}
+    return HCIdump(CONFIG, queues), queues
+
+
+class TestParseDataBulk:
+    """Tests for the parse_data_bulk service"""
+    def test_schema_defaults(self):
+        """Test the default encoding and gateway id."""
+        data = SERVICE_PARSE_DATA_BULK_SCHEMA({"packets": [PACKET]})
+        assert data == {"packets": [PACKET], "encoding": "hex", "gateway_id": "ble_monitor"}
+
+    def test_process_hex_and_base64(self):
+        """Test that hex and base64 packets are parsed, invalid packets are skipped."""
+        hcidump, queues = create_hcidump()
+        assert hcidump.process_hci_events_bulk([PACKET, "not hex"]) == 1
+        packet_b64 = base64.b64encode(bytes.fromhex(PACKET)).decode()
+        assert hcidump.process_hci_events_bulk([packet_b64, "@@@"], "base64") == 1
+        assert hcidump.evt_cnt == 2
+        # the second packet is a duplicate of the first packet
+        assert queues["measuring"].sync_q.qsize() == 1
+
+    def test_order_by_timestamp(self):
+        """Test that packets are parsed in order of their timestamps."""
+        hcidump, _ = create_hcidump()
+        parsed = []
+        hcidump.process_hci_events = lambda data, gateway_id: parsed.append(gateway_id)
+        packets = [
+            {"packet": PACKET, "gateway_id": "kitchen", "timestamp": 3},
+            {"packet": PACKET, "timestamp": 1},
+            {"packet": PACKET, "gateway_id": "bedroom", "timestamp": 1},
+        ]
+        hcidump.process_hci_events_bulk(packets, gateway_id="hallway")
+        assert parsed == ["hallway", "bedroom", "kitchen"]
+
+    def test_submit_without_thread(self):
+        """Test that submitting to a HCIdump thread that is not running doesn't raise."""
+        hcidump, queues = create_hcidump()
+        hcidump.submit_bulk([PACKET])
+        assert queues["measuring"].sync_q.qsize() == 0
+
+
+class TestIngest:
+    """Tests for the ingest queue of the HCIdump thread"""
+    def test_ingest_from_other_thread(self):
+        """Test that events of other threads are only parsed by the event loop of the HCIdump thread."""
+        hcidump, queues = create_hcidump()
+        loop = asyncio.new_event_loop()
+        hcidump._event_loop = loop  # pylint: disable=protected-access
+        try:
+            hcidump.ingest(bytes.fromhex(PACKET), "kitchen")
+            hcidump.submit_bulk([PACKET], "hex", "bedroom")
+            assert hcidump.evt_cnt == 0
+            loop.run_until_complete(asyncio.sleep(0))
+        finally:
+            loop.close()
+        assert hcidump.evt_cnt == 2
+        assert queues["measuring"].sync_q.qsize() == 1
+
+    def test_ingest_before_start(self):
+        """Test that events that are ingested before the thread is started are kept."""
+        hcidump, _ = create_hcidump()
+        parsed = []
+        hcidump.process_hci_events = lambda data, gateway_id: parsed.append(gateway_id)
+        hcidump.ingest(bytes.fromhex(PACKET), "kitchen")
+        hcidump.ingest(bytes.fromhex(PACKET), "bedroom")
+        assert not parsed
+        hcidump._drain_ingest_queue()  # pylint: disable=protected-access
+        assert parsed == ["kitchen", "bedroom"]
+
+    def test_ingest_queue_full(self, monkeypatch):
+        """Test that packets are dropped and counted when the HCIdump thread doesn't drain the queue."""
+        monkeypatch.setattr(ble_monitor, "INGEST_QUEUE_SIZE", 2)
+        hcidump, queues = create_hcidump()
+        for _ in range(3):
+            hcidump.ingest(bytes.fromhex(PACKET))
+        hcidump.submit_bulk([PACKET, PACKET])
+        assert hcidump.dropped_cnt == 3
+        hcidump._drain_ingest_queue()  # pylint: disable=protected-access
+        assert hcidump.evt_cnt == 2
+        assert queues["measuring"].sync_q.qsize() == 1
+
+    def test_capture_write_error(self):
+        """Test that an error of the capture file stops the capture, but not the parsing."""
+        hcidump, queues = create_hcidump()
+        closed = []
+
+        def write(data, adapter):
+            raise OSError(28, "No space left on device")
+
+        hcidump.capture = SimpleNamespace(write=write, close=lambda: closed.append(True))
+        hcidump.ingest_adapter(0, bytes.fromhex(PACKET))
+        hcidump._drain_ingest_queue()  # pylint: disable=protected-access
+        assert hcidump.capture is None
+        assert closed == [True]
+        assert queues["measuring"].sync_q.qsize() == 1
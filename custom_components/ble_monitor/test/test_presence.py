@@ -0,0 +1,91 @@
+"""The tests for the device tracker presence engine."""
+from ble_monitor.presence import GatewayWindow, PresenceEngine
+
+MAX_AGE = 180
+
+
+class TestPresenceEngine:
+    """Tests for the presence engine"""
+    def test_window_running_mean(self):
+        """Test that the window keeps a running mean of the last values."""
+        window = GatewayWindow(3)
+        for rssi in [-90, -80, -70, -60]:
+            window.add(rssi, 0)
+        assert window.mean == -70
+        assert window.total == sum(window.values)
+
+    def test_first_gateway_is_nearest(self):
+        """Test that the first gateway becomes the nearest gateway."""
+        engine = PresenceEngine()
+        assert engine.nearest("A4C1382F866C") == (None, None)
+        assert engine.update("A4C1382F866C", "kitchen", -70, 0, MAX_AGE) is True
+        assert engine.nearest("A4C1382F866C") == ("kitchen", -70)
+        assert engine.update("A4C1382F866C", "kitchen", -72, 1, MAX_AGE) is False
+
+    def test_move_to_stronger_gateway(self):
+        """Test that a clearly stronger gateway takes over, a slightly stronger one doesn't."""
+        engine = PresenceEngine(window=5, hysteresis=3)
+        key = "A4C1382F866C"
+        engine.update(key, "kitchen", -70, 0, MAX_AGE)
+        assert engine.update(key, "hallway", -68, 1, MAX_AGE) is False
+        assert engine.nearest(key)[0] == "kitchen"
+        assert engine.update(key, "bedroom", -60, 2, MAX_AGE) is True
+        assert engine.nearest(key) == ("bedroom", -60)
+
+    def test_nearest_gets_weaker(self):
+        """Test that another gateway takes over when the nearest gateway gets weaker."""
+        engine = PresenceEngine(window=2, hysteresis=3)
+        key = "A4C1382F866C"
+        engine.update(key, "kitchen", -60, 0, MAX_AGE)
+        engine.update(key, "bedroom", -70, 1, MAX_AGE)
+        assert engine.update(key, "kitchen", -80, 2, MAX_AGE) is False
+        assert engine.update(key, "kitchen", -80, 3, MAX_AGE) is True
+        assert engine.nearest(key) == ("bedroom", -70)
+
+    def test_stale_gateway_is_dropped(self):
+        """Test that a gateway that didn't see the tracker for max_age is not the nearest anymore."""
+        engine = PresenceEngine(window=5, hysteresis=3)
+        key = "A4C1382F866C"
+        engine.update(key, "kitchen", -50, 0, MAX_AGE)
+        assert engine.update(key, "garage", -90, 100, MAX_AGE) is False
+        assert engine.update(key, "garage", -90, 200, MAX_AGE) is True
+        assert engine.nearest(key)[0] == "garage"
+        assert list(engine.gateways(key)) == ["garage"]
+
+    def test_remove(self):
+        """Test that a removed tracker is forgotten."""
+        engine = PresenceEngine()
+        engine.update("A4C1382F866C", "kitchen", -70, 0, MAX_AGE)
+        engine.remove("A4C1382F866C")
+        assert engine.nearest("A4C1382F866C") == (None, None)
+        assert engine.gateways("A4C1382F866C") == {}
+
+    def test_no_search_when_no_gateway_can_take_over(self):
+        """Test that the gateways are only searched when another gateway can be nearer."""
+        engine = PresenceEngine(window=1, hysteresis=3)
+        key = "A4C1382F866C"
+        engine.update(key, "kitchen", -50, 0, MAX_AGE)
+        engine.update(key, "bedroom", -70, 1, MAX_AGE)
+        searches = []
+        select = engine._select  # pylint: disable=protected-access
+
+        def counting_select(*args):
+            searches.append(args)
+            return select(*args)
+
+        engine._select = counting_select  # pylint: disable=protected-access
+        assert engine.update(key, "kitchen", -60, 2, MAX_AGE) is False
+        assert engine.update(key, "kitchen", -66, 3, MAX_AGE) is False
+        assert not searches
+        assert engine.update(key, "kitchen", -74, 4, MAX_AGE) is True
+        assert len(searches) == 1
+        assert engine.nearest(key) == ("bedroom", -70)
+
+    def test_expire(self):
+        """Test that trackers that were not seen for their max age are forgotten."""
+        engine = PresenceEngine()
+        engine.update("A4C1382F866C", "kitchen", -70, 0, MAX_AGE)
+        engine.update("E3605961BBAA", "kitchen", -70, 150, MAX_AGE)
+        engine.expire(200, lambda key: MAX_AGE)
+        assert engine.nearest("A4C1382F866C") == (None, None)
+        assert engine.nearest("E3605961BBAA") == ("kitchen", -70)
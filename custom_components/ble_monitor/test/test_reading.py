@@ -0,0 +1,46 @@
+"""The tests for the Reading record of the BLE parser."""
+import pytest
+
+from ble_monitor.ble_parser import BleParser
+from ble_monitor.ble_parser.reading import Reading
+
+
+class TestReading:
+    """Tests for the Reading record"""
+    def test_dict_view(self):
+        """Test that a reading can be used as dict."""
+        reading = Reading(-60, "582D34359321", "LYWSDCGQ", 218, "Xiaomi (MiBeacon V2)", measurements={
+            "temperature": 25.4,
+        })
+        assert reading["type"] == "LYWSDCGQ"
+        assert reading["temperature"] == 25.4
+        assert "temperature" in reading
+        assert "humidity" not in reading
+        assert reading.get("humidity") is None
+        assert reading == {
+            "rssi": -60,
+            "mac": "582D34359321",
+            "type": "LYWSDCGQ",
+            "packet": 218,
+            "firmware": "Xiaomi (MiBeacon V2)",
+            "data": True,
+            "temperature": 25.4,
+        }
+        with pytest.raises(KeyError):
+            reading["humidity"]  # pylint: disable=pointless-statement
+
+    def test_update_and_pop(self):
+        """Test that fields and measurements can be changed."""
+        reading = Reading(-60, "582D34359321", "LYWSDCGQ", 218, "Xiaomi (MiBeacon V2)", data=False)
+        reading.update({"data": True, "battery": 100})
+        assert reading.data is True
+        assert reading.measurements == {"battery": 100}
+        assert reading.pop("battery") == 100
+        assert len(reading) == 6
+
+    def test_parser_returns_reading(self):
+        """Test that the Xiaomi parser returns a reading."""
+        data_string = "043e2502010000219335342d5819020106151695fe5020aa01da219335342d580d1004fe004802c4"
+        sensor_msg, _ = BleParser().parse_raw_data(bytes.fromhex(data_string))
+        assert isinstance(sensor_msg, Reading)
+        assert sensor_msg.measurements == {"temperature": 25.4, "humidity": 58.4}
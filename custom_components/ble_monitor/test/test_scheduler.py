@@ -0,0 +1,54 @@
+"""The tests for the flush scheduler."""
+from ble_monitor.scheduler import FlushScheduler, flush_phase
+
+
+class TestFlushScheduler:
+    """Tests for the flush scheduler"""
+    def test_phase_is_deterministic(self):
+        """Test that the jitter of a key is stable and within the period."""
+        key = ("A4C138AABBCC", 60)
+        assert flush_phase(key, 60) == flush_phase(key, 60)
+        assert 0 <= flush_phase(key, 60) < 60
+
+    def test_keys_are_spread_over_period(self):
+        """Test that many keys are spread over the period instead of flushing at once."""
+        scheduler = FlushScheduler()
+        for i in range(600):
+            scheduler.schedule((f"A4C138{i:06X}", 60), 60, 0)
+        buckets = [0] * 6
+        for second in range(60):
+            buckets[second // 10] += len(scheduler.pop_due(second + 0.999))
+        assert sum(buckets) == 600
+        assert min(buckets) > 60
+        assert max(buckets) < 140
+
+    def test_each_key_has_own_period(self):
+        """Test that keys are re-armed with their own period."""
+        scheduler = FlushScheduler()
+        scheduler.schedule("fast", 10, 0)
+        scheduler.schedule("slow", 100, 0)
+        due = []
+        for second in range(1, 201):
+            due.extend(scheduler.pop_due(second))
+        assert due.count("fast") == 20
+        assert due.count("slow") == 2
+
+    def test_missed_periods_are_skipped(self):
+        """Test that a late poll returns a key only once."""
+        scheduler = FlushScheduler()
+        scheduler.schedule("key", 5, 0)
+        assert scheduler.pop_due(1000) == ["key"]
+        assert scheduler.next_deadline() > 1000
+        assert scheduler.pop_due(1000) == []
+
+    def test_remove(self):
+        """Test that removed and rescheduled keys leave no stale deadlines."""
+        scheduler = FlushScheduler()
+        scheduler.schedule("key", 5, 0)
+        scheduler.schedule("key", 50, 100)
+        assert len(scheduler) == 1
+        assert scheduler.pop_due(99) == []
+        scheduler.remove("key")
+        assert "key" not in scheduler
+        assert scheduler.next_deadline() is None
+        assert scheduler.pop_due(1000) == []
@@ -0,0 +1,144 @@
+"""The tests for the BLE monitor sensor deadband and heartbeat."""
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import janus
+
+from ble_monitor import CONFIG_SCHEMA, sensor
+from ble_monitor.const import CONFIG_DEVICE_INDEX, DOMAIN, sensor_description
+from ble_monitor.helper import device_index
+from ble_monitor.sensor import BLEupdater, InstantUpdateSensor, TemperatureSensor
+
+MAC = "A4C1382F866C"
+
+
+def create_config(**options):
+    """Return a validated configuration with a deadband for temperature and consumable."""
+    options.setdefault("deadband", {"temperature": 0.2, "consumable": "5%"})
+    config = CONFIG_SCHEMA({DOMAIN: options})[DOMAIN]
+    config[CONFIG_DEVICE_INDEX] = device_index(config)
+    return config
+
+
+def reading(**measurements):
+    """Return the data of a LYWSDCGQ advertisement."""
+    data = {
+        "rssi": -60,
+        "mac": MAC,
+        "type": "LYWSDCGQ",
+        "packet": 1,
+        "firmware": "Xiaomi (MiBeacon V2)",
+        "data": True,
+    }
+    data.update(measurements)
+    return data
+
+
+def create_sensor(sensor_class, key, config):
+    """Return a sensor that records its state writes."""
+    entity = sensor_class(config, MAC, "LYWSDCGQ", "Xiaomi (MiBeacon V2)", sensor_description(key))
+    entity.writes = []
+    entity.async_write_ha_state = lambda: entity.writes.append(entity.native_value)
+    entity.async_schedule_update_ha_state = lambda force_refresh=False: entity.writes.append(entity.native_value)
+    return entity
+
+
+def flush(entity, **measurements):
+    """Collect the measurements of an advertisement in a new period and flush the sensor."""
+    entity.collect(reading(**measurements), 1)
+    entity.rssi_values = [-60]
+    return entity.async_flush()
+
+
+class TestDeadband:
+    """Tests for the deadband of the sensors"""
+    def test_within_deadband(self):
+        """Test the deadband check against the last written state."""
+        entity = create_sensor(TemperatureSensor, "temperature", create_config())
+        assert entity.within_deadband() is False
+        assert flush(entity, temperature=20.0) is True
+        entity._state = 20.2  # pylint: disable=protected-access
+        assert entity.within_deadband() is True
+        entity._state = 19.7  # pylint: disable=protected-access
+        assert entity.within_deadband() is False
+        entity._state = "unknown"  # pylint: disable=protected-access
+        assert entity.within_deadband() is False
+
+    def test_no_deadband(self):
+        """Test that a sensor without deadband writes every state."""
+        entity = create_sensor(TemperatureSensor, "temperature", create_config(deadband={}))
+        assert flush(entity, temperature=20.0) is True
+        assert flush(entity, temperature=20.0) is True
+        assert entity.writes == [20.0, 20.0]
+
+    def test_flush_skips_write(self):
+        """Test that a flush inside the deadband doesn't write the state."""
+        entity = create_sensor(TemperatureSensor, "temperature", create_config())
+        assert flush(entity, temperature=20.0) is True
+        assert flush(entity, temperature=20.1) is False
+        assert flush(entity, temperature=19.9) is False
+        assert flush(entity, temperature=20.3) is True
+        assert entity.writes == [20.0, 20.3]
+
+    def test_flush_skips_write_relative(self):
+        """Test a percentage deadband of an instant update sensor."""
+        entity = create_sensor(InstantUpdateSensor, "consumable", create_config())
+        assert flush(entity, consumable=80) is True
+        assert flush(entity, consumable=83) is False
+        assert entity.pending_update is False
+        assert entity.rssi_values == []
+        assert flush(entity, consumable=85) is True
+        assert entity.writes == [80, 85]
+
+    def test_heartbeat(self, monkeypatch):
+        """Test that the heartbeat writes the state after heartbeat seconds inside the deadband."""
+        now = [1000.0]
+        monkeypatch.setattr(sensor, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        entity = create_sensor(TemperatureSensor, "temperature", create_config(heartbeat=60))
+        assert flush(entity, temperature=20.0) is True
+        now[0] += 59
+        assert flush(entity, temperature=20.1) is False
+        now[0] += 1
+        assert flush(entity, temperature=20.1) is True
+        now[0] += 1
+        assert flush(entity, temperature=20.1) is False
+        assert entity.writes == [20.0, 20.1]
+
+    def test_suppressed_counter(self, caplog):
+        """Test that the updater counts and logs the suppressed state writes per period."""
+        async def run_updater(config, readings):
+            data_queue = janus.Queue()
+            writes = {}
+
+            def add_entities(entities):
+                for entity in entities:
+                    entity.ready_for_update = True
+                    entity.async_write_ha_state = lambda entity=entity: writes.setdefault(
+                        entity.entity_description.key, []
+                    ).append(entity.native_value)
+
+            monitor = SimpleNamespace(config=config, dataqueue={"measuring": data_queue}, restart=lambda: None)
+            hass = SimpleNamespace(loop=asyncio.get_running_loop(), data={DOMAIN: {}})
+            task = asyncio.create_task(BLEupdater(monitor, add_entities).async_run(hass))
+            for data in readings:
+                # one advertisement per batch, the entities are added after the first batch
+                data_queue.async_q.put_nowait(data)
+                await data_queue.async_q.join()
+            await asyncio.sleep(config["period"] * 2.5)
+            data_queue.async_q.put_nowait(None)
+            await task
+            return writes
+
+        caplog.set_level(logging.DEBUG, logger=sensor.__name__)
+        config = create_config()
+        # a period of a fraction of a second, the schema only allows whole seconds
+        config["period"] = 0.1
+        readings = [reading(temperature=temperature) for temperature in (20.0, 20.0, 20.0, 20.1)]
+        writes = asyncio.run(run_updater(config, readings))
+        # the measurements of the first period are written instantly (the state is the mean),
+        # once the entities are added after the first advertisement
+        assert writes["temperature"] == [20.0]
+        assert writes["rssi"] == [-60, -60, -60]
+        assert "4 BLE advertisements processed for 1 sensor device(s), 2 state writes suppressed" in caplog.text
+        assert "0 BLE advertisements processed for 1 sensor device(s), 0 state writes suppressed" in caplog.text
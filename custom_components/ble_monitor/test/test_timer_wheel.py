@@ -0,0 +1,123 @@
+"""The tests for the timer wheel."""
+from ble_monitor.timer_wheel import TimerWheel
+
+
+class FakeLoop:
+    """Event loop with a manual clock and a list of timer handles."""
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.handles = []
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback):
+        handle = FakeHandle(when, callback)
+        self.handles.append(handle)
+        return handle
+
+    def run_until(self, until):
+        """Advance the clock and run the timer handles that are due."""
+        while True:
+            due = [h for h in self.handles if not h.cancelled and h.when <= until]
+            if not due:
+                break
+            handle = min(due, key=lambda h: h.when)
+            self.handles.remove(handle)
+            self.now = max(self.now, handle.when)
+            handle.callback()
+        self.now = until
+
+
+class FakeHandle:
+    """Timer handle of the fake event loop."""
+    def __init__(self, when, callback):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestTimerWheel:
+    """Tests for the timer wheel"""
+    def test_fire_after_delay(self):
+        """Test that timers fire at their deadline, also beyond the first wheel."""
+        loop = FakeLoop()
+        wheel = TimerWheel(loop)
+        fired = []
+        for delay in [1, 35, 180, 300, 3600, 20000]:
+            wheel.schedule(delay, delay, fired.append, (delay, loop.now))
+        loop.run_until(1000.0 + 30000)
+        assert [delay for delay, _ in fired] == [1, 35, 180, 300, 3600, 20000]
+        assert len(wheel) == 0
+
+    def test_deadline_precision(self):
+        """Test that a timer doesn't fire early and at most one tick late."""
+        loop = FakeLoop(now=1000.5)
+        wheel = TimerWheel(loop)
+        fired = []
+        wheel.schedule("key", 3600, lambda: fired.append(loop.now))
+        loop.run_until(1000.5 + 3599.9)
+        assert not fired
+        loop.run_until(1000.5 + 3601)
+        assert 1000.5 + 3600 <= fired[0] <= 1000.5 + 3601
+
+    def test_reschedule_replaces_timer(self):
+        """Test that scheduling a key again replaces the pending timer."""
+        loop = FakeLoop()
+        wheel = TimerWheel(loop)
+        fired = []
+        for second in range(100):
+            loop.run_until(1000.0 + second)
+            wheel.schedule("tracker", 180, fired.append, "tracker")
+        assert len(wheel) == 1
+        loop.run_until(1000.0 + 99 + 179)
+        assert not fired
+        loop.run_until(1000.0 + 99 + 181)
+        assert fired == ["tracker"]
+
+    def test_single_loop_handle(self):
+        """Test that the number of pending loop handles stays constant."""
+        loop = FakeLoop()
+        wheel = TimerWheel(loop)
+        for key in range(1000):
+            wheel.schedule(key, 1 + key % 300, lambda: None)
+        assert len([h for h in loop.handles if not h.cancelled]) == 1
+        loop.run_until(1000.0 + 150)
+        assert len([h for h in loop.handles if not h.cancelled]) == 1
+        loop.run_until(1000.0 + 400)
+        assert len(wheel) == 0
+        assert not [h for h in loop.handles if not h.cancelled]
+
+    def test_cancel_and_stop(self):
+        """Test that cancelled timers don't fire."""
+        loop = FakeLoop()
+        wheel = TimerWheel(loop)
+        fired = []
+        wheel.schedule("a", 10, fired.append, "a")
+        wheel.schedule("b", 10, fired.append, "b")
+        wheel.cancel("a")
+        loop.run_until(1000.0 + 20)
+        assert fired == ["b"]
+        wheel.schedule("c", 10, fired.append, "c")
+        wheel.stop()
+        loop.run_until(1000.0 + 40)
+        assert fired == ["b"]
+        assert "c" not in wheel
+
+    def test_callback_reschedules_itself(self):
+        """Test that a callback can schedule its own key again."""
+        loop = FakeLoop()
+        wheel = TimerWheel(loop)
+        fired = []
+
+        def callback():
+            fired.append(loop.now)
+            if len(fired) < 3:
+                wheel.schedule("key", 5, callback)
+
+        wheel.schedule("key", 5, callback)
+        loop.run_until(1000.0 + 60)
+        assert len(fired) == 3
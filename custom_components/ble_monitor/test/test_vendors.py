@@ -0,0 +1,61 @@
+"""The tests for the vendor selection of the BLE parser."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ble_monitor.ble_parser import BleParser
+
+ATC = "043e1d02010000f4830bb7a3cc1110161a18cca3b70b83f400e8296d0b7fe9c2"
+# iBeacon advertisement of a Tilt Red
+TILT = "043E27020100008B5C6ED1BCC81B1AFF4C000215A495BB10C5B14B44B5121370F02D74DE004403F8C5C7"
+
+
+class TestVendors:
+    """Tests for the enabled vendors of the BLE parser"""
+    def test_enabled_vendor(self):
+        """Test that advertisements of enabled vendors are parsed."""
+        ble_parser = BleParser(vendors=["atc", "xiaomi"])
+        sensor_msg, _ = ble_parser.parse_raw_data(bytes.fromhex(ATC))
+        assert sensor_msg["firmware"] == "ATC (Atc1441)"
+
+    def test_disabled_vendor(self):
+        """Test that advertisements of disabled vendors are not parsed."""
+        ble_parser = BleParser(vendors=["xiaomi"])
+        assert ble_parser.parse_raw_data(bytes.fromhex(ATC)) == (None, None)
+
+    def test_tilt_disabled(self):
+        """Test that a Tilt is parsed as iBeacon when Tilt is disabled."""
+        sensor_msg, _ = BleParser().parse_raw_data(bytes.fromhex(TILT))
+        assert sensor_msg["firmware"] == "Tilt"
+        sensor_msg, _ = BleParser(vendors=["ibeacon"]).parse_raw_data(bytes.fromhex(TILT))
+        assert sensor_msg["firmware"] == "iBeacon"
+
+    def test_unknown_vendor(self):
+        """Test that an unknown vendor is refused."""
+        with pytest.raises(ValueError):
+            BleParser(vendors=["xiaomi", "acme"])
+
+    def test_disabled_vendor_not_imported(self):
+        """Test that vendor modules are imported on the first advertisement of the vendor."""
+        code = (
+            "import sys\n"
+            "from ble_monitor.ble_parser import BleParser\n"
+            "ble_parser = BleParser(vendors=['atc', 'xiaomi'])\n"
+            "print(sorted(m for m in sys.modules if m.startswith('ble_monitor.ble_parser.')))\n"
+            f"ble_parser.parse_raw_data(bytes.fromhex({ATC!r}))\n"
+            "print(sorted(m for m in sys.modules if m.startswith('ble_monitor.ble_parser.')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parents[2],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        before, after = result.stdout.splitlines()
+        assert "ble_monitor.ble_parser.atc" not in before
+        assert "ble_monitor.ble_parser.atc" in after
+        assert "ble_monitor.ble_parser.xiaomi" not in after
+        assert "ble_monitor.ble_parser.govee" not in after
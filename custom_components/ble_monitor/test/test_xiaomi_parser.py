@@ -1,5 +1,6 @@
 """The tests for the Xiaomi ble_parser."""
 from ble_monitor.ble_parser import BleParser
+from ble_monitor.ble_parser.xiaomi import XIAOMI_DATA_OBJECTS, obj1001
 
 
 class TestXiaomi:
@@ -533,3 +534,28 @@ class TestXiaomi:
 
     def test_Xiaomi_DSL_C08(self):
         """Test Xiaomi parser for DSL-C08."""
+
+    def test_Xiaomi_data_object_table(self):
+        """Test decoding of data objects with the data object table."""
+        converter, with_device_type = XIAOMI_DATA_OBJECTS[0x100D]
+        assert with_device_type is False
+        assert converter(bytes.fromhex("fe004802")) == {"temperature": 25.4, "humidity": 58.4}
+        # wrong length
+        assert converter(bytes.fromhex("fe0048")) is None
+        # moisture is kept as integer
+        assert XIAOMI_DATA_OBJECTS[0x1008][0](bytes([45])) == {"moisture": 45}
+
+    def test_Xiaomi_button_table(self):
+        """Test the button lookup tables."""
+        assert obj1001(bytes([6, 0, 0]), "K9B-3BTN") == {
+            "button switch": "single press",
+            "three btn switch left": "toggle",
+            "three btn switch middle": "toggle",
+            "three btn switch right": "toggle",
+        }
+        assert obj1001(bytes([1, 0, 2]), "YLYB01YL-BHFRC") == {
+            "bathroom heater remote": "air exchange",
+            "button": "long press",
+        }
+        assert obj1001(bytes([0, 200, 4]), "YLKG07YL/YLKG08YL") == {"dimmer": 56, "button": "rotate left"}
+        assert obj1001(bytes([0, 0, 0]), "LYWSD03MMC") is None
@@ -0,0 +1,120 @@
+"""Shared timer wheel for the BLE monitor entity timeouts."""
+import logging
+import math
+
+_LOGGER = logging.getLogger(__name__)
+
+# level 0 has a slot per tick, level 1 a slot per LEVEL0_SLOTS ticks
+LEVEL0_SLOTS = 256
+LEVEL1_SLOTS = 64
+
+
+class TimerWheel:
+    """Hierarchical timer wheel with a single deadline per key.
+
+    Timers are kept in slots of two wheels, timers further in the future than
+    both wheels can hold are kept in an overflow set. Scheduling a key again
+    replaces its previous deadline, so there is at most one timer per key.
+    The wheel uses a single loop timer handle, which ticks while timers are
+    pending and fires all timers of a tick in one batch.
+    """
+
+    def __init__(self, loop, resolution=1.0):
+        """Initialize the timer wheel."""
+        self._loop = loop
+        self._resolution = resolution
+        self._timers = {}
+        self._slots = {}
+        self._level0 = [set() for _ in range(LEVEL0_SLOTS)]
+        self._level1 = [set() for _ in range(LEVEL1_SLOTS)]
+        self._overflow = set()
+        self._current = int(loop.time() / resolution)
+        self._handle = None
+        self._handle_tick = None
+
+    def __len__(self):
+        """Return the number of pending timers."""
+        return len(self._timers)
+
+    def __contains__(self, key):
+        """Return True if a timer is pending for the key."""
+        return key in self._timers
+
+    def schedule(self, key, delay, callback, *args):
+        """Call callback(*args) after delay seconds, replacing a pending timer of the key."""
+        self.cancel(key)
+        now = self._loop.time()
+        if not self._timers:
+            # an empty wheel doesn't tick, catch up without walking the idle ticks
+            self._current = max(self._current, int(now / self._resolution))
+        tick = max(math.ceil((now + delay) / self._resolution), self._current + 1)
+        self._timers[key] = (tick, callback, args)
+        self._insert(key, tick)
+        self._arm()
+
+    def cancel(self, key):
+        """Cancel the pending timer of a key."""
+        if self._timers.pop(key, None) is not None:
+            self._slots.pop(key).discard(key)
+
+    def stop(self):
+        """Cancel all timers."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for key in list(self._timers):
+            self.cancel(key)
+
+    def _insert(self, key, tick):
+        """Put a key in the slot that matches its deadline."""
+        ticks = tick - self._current
+        if ticks < LEVEL0_SLOTS:
+            slot = self._level0[tick % LEVEL0_SLOTS]
+        elif ticks < LEVEL0_SLOTS * LEVEL1_SLOTS:
+            slot = self._level1[(tick // LEVEL0_SLOTS) % LEVEL1_SLOTS]
+        else:
+            slot = self._overflow
+        slot.add(key)
+        self._slots[key] = slot
+
+    def _cascade(self, slot):
+        """Move the keys of a slot to the slots that match their deadline."""
+        keys = list(slot)
+        slot.clear()
+        for key in keys:
+            self._insert(key, self._timers[key][0])
+
+    def _arm(self):
+        """Make sure the loop timer handle is set while timers are pending."""
+        if self._handle is not None or not self._timers:
+            return
+        self._handle_tick = self._current + 1
+        self._handle = self._loop.call_at(self._handle_tick * self._resolution, self._tick)
+
+    def _tick(self):
+        """Advance the wheel to the current time and fire the expired timers."""
+        self._handle = None
+        target = max(int(self._loop.time() / self._resolution), self._handle_tick)
+        expired = []
+        while self._current < target:
+            self._current += 1
+            current = self._current
+            if current % LEVEL0_SLOTS == 0:
+                if (current // LEVEL0_SLOTS) % LEVEL1_SLOTS == 0:
+                    self._cascade(self._overflow)
+                self._cascade(self._level1[(current // LEVEL0_SLOTS) % LEVEL1_SLOTS])
+            slot = self._level0[current % LEVEL0_SLOTS]
+            if slot:
+                expired.extend(slot)
+                slot.clear()
+        # take the expired timers out first, callbacks may schedule their key again
+        fired = []
+        for key in expired:
+            del self._slots[key]
+            fired.append(self._timers.pop(key))
+        for _, callback, args in fired:
+            try:
+                callback(*args)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in timer callback %s", callback)
+        self._arm()